@@ -0,0 +1,175 @@
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+logger = logging.getLogger(__name__)
+
+# Requests doing work at once; the rest wait in a queue, served round-robin across clients
+MAX_IN_FLIGHT = int(os.getenv('ADMISSION_MAX_IN_FLIGHT', '16'))
+MAX_QUEUED = int(os.getenv('ADMISSION_MAX_QUEUED', '64'))
+MAX_QUEUED_PER_CLIENT = int(os.getenv('ADMISSION_MAX_QUEUED_PER_CLIENT', '8'))
+# Longest a request may wait for a slot before it is turned away
+QUEUE_TIMEOUT = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', '10'))
+
+
+class Rejected(Exception):
+    """Not admitted: status is 429 (this client has too much queued) or 503 (server full or deadline)"""
+
+    def __init__(self, status, retry_after, client, reason):
+        super().__init__(reason)
+        self.status = status
+        self.retry_after = retry_after
+        self.client = client
+        self.reason = reason
+
+
+class SingleFlight:
+    """Identical concurrent calls share one execution: the first runs, the rest wait for its result"""
+
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.leaders += 1
+            else:
+                self.followers += 1
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            # Only in-flight work is shared; finished results belong to the caches
+            with self._lock:
+                self._inflight.pop(key, None)
+        return future.result()
+
+    def stats(self):
+        with self._lock:
+            return {'leaders': self.leaders, 'followers': self.followers, 'in_flight': len(self._inflight)}
+
+
+class _Ticket:
+    __slots__ = ('event', 'granted')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class AdmissionController:
+    """Bounded concurrency with a bounded, per-client fair wait queue
+
+    Up to max_in_flight requests run at once. Beyond that a request waits for
+    a slot, and freed slots go to waiting clients in turn, so one client with
+    many queued requests can't starve the others. Work that can't start in
+    time is rejected up front rather than accepted and abandoned.
+    """
+
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT, max_queued=MAX_QUEUED,
+                 max_queued_per_client=MAX_QUEUED_PER_CLIENT, queue_timeout=QUEUE_TIMEOUT):
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.max_queued = max(0, int(max_queued))
+        self.max_queued_per_client = max(1, int(max_queued_per_client))
+        self.queue_timeout = queue_timeout
+        self._in_flight = 0
+        self._queued = 0
+        self._waiting = OrderedDict()  # client -> deque of tickets, in round-robin order
+        self._durations = deque(maxlen=200)
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_client = 0
+        self.timed_out = 0
+
+    def _retry_after(self):
+        """Seconds until a slot is likely free: queue length times recent service time, spread over the slots"""
+        service = sum(self._durations) / len(self._durations) if self._durations else 1.0
+        return max(1, math.ceil((self._queued + 1) * service / self.max_in_flight))
+
+    def acquire(self, client, timeout=None):
+        """Block until client may start; raises Rejected instead of waiting past timeout"""
+        timeout = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        with self._lock:
+            if self._in_flight < self.max_in_flight and not self._queued:
+                self._in_flight += 1
+                self.admitted += 1
+                return
+            if len(self._waiting.get(client, ())) >= self.max_queued_per_client:
+                self.rejected_client += 1
+                raise Rejected(429, self._retry_after(), client, "Too many requests queued for this client")
+            if self._queued >= self.max_queued:
+                self.rejected_full += 1
+                raise Rejected(503, self._retry_after(), client, "Server at capacity")
+            ticket = _Ticket()
+            self._waiting.setdefault(client, deque()).append(ticket)
+            self._queued += 1
+
+        if ticket.event.wait(max(0.0, timeout)):
+            return
+        with self._lock:
+            if ticket.granted:  # handed a slot just as the wait ran out
+                return
+            tickets = self._waiting[client]
+            tickets.remove(ticket)
+            if not tickets:
+                del self._waiting[client]
+            self._queued -= 1
+            self.timed_out += 1
+            raise Rejected(503, self._retry_after(), client, "Timed out waiting for capacity")
+
+    def release(self, seconds=None):
+        with self._lock:
+            if seconds is not None:
+                self._durations.append(seconds)
+            if not self._queued:
+                self._in_flight -= 1
+                return
+            # The slot passes straight to the next client in turn
+            client, tickets = next(iter(self._waiting.items()))
+            ticket = tickets.popleft()
+            if tickets:
+                self._waiting.move_to_end(client)
+            else:
+                del self._waiting[client]
+            self._queued -= 1
+            self.admitted += 1
+            ticket.granted = True
+            ticket.event.set()
+
+    @contextmanager
+    def slot(self, client, timeout=None):
+        self.acquire(client, timeout)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': self._in_flight,
+                'queued': self._queued,
+                'waiting_clients': len(self._waiting),
+                'admitted': self.admitted,
+                'rejected_full': self.rejected_full,
+                'rejected_client': self.rejected_client,
+                'timed_out': self.timed_out,
+            }
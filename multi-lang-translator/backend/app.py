@@ -1,145 +1,132 @@
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, copy_current_request_context, send_file, stream_with_context, url_for
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
-from gtts import gTTS
 import io
-import base64
-import torch
-import gc
-import asyncio
-import edge_tts
-import openai
 import os
+import json
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+# torch, gtts, edge_tts, openai and googletrans are
+# imported where they are first used, so the server starts in well under a second.
 
-# Install: pip install googletrans==4.0.0rc1
-from googletrans import Translator
-from indic_transliteration import sanscript
-from indic_transliteration.sanscript import transliterate
+from admission import AdmissionController, Rejected, SingleFlight
+from async_worker import AsyncWorker
+from audio_cache import AudioCache, audio_key, is_fallback_key
+from chat_fanout import ChatFanout, RoomMembers, language_channel
+from chunking import chunk_text, sentence_chunks
+from cluster import CLUSTER_URL, Cluster, SharedRoomMembers, open_store, socketio_manager
+from gender_rules import apply_gender_rules
+from governor import BufferBudget, MemoryGovernor
+from google_pool import TranslatorPool
+from inference_backends import create_backend
+from live_translate import LiveTranslator
+from log_config import configure_logging
+from metrics import ADMISSION_REJECTIONS, REGISTRY, TRANSLATIONS, TTS_REQUESTS, timed
+from model_batcher import TranslationBatcher
+from phrasebook import load_phrasebook
+from pipeline import Stage, StagePipeline
+from romanization import Romanizer
+from router import FunctionBackend, Router
+from translation_cache import TranslationCache
+from worker_pool import WorkerPool
+
+configure_logging()
+logger = logging.getLogger('translator')
 
 app = Flask(__name__)
-CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*")
+# Browsers hide response headers from scripts unless listed; clients need Retry-After to back off on 429/503
+CORS(app, expose_headers=["Retry-After"])
+# With CLUSTER_URL set, several server processes (behind a sticky-session load balancer) share chat
+# rooms: emits reach sockets on every node and chat translation is split across nodes by language pair
+cluster_store = open_store(CLUSTER_URL) if CLUSTER_URL else None
+if cluster_store is None:
+    socketio = SocketIO(app, cors_allowed_origins="*")
+elif CLUSTER_URL.startswith('local://'):
+    socketio = SocketIO(app, cors_allowed_origins="*", client_manager=socketio_manager(cluster_store))
+else:
+    socketio = SocketIO(app, cors_allowed_origins="*", message_queue=CLUSTER_URL)
 
-# Set OpenAI API key (you need to set this environment variable)
-openai.api_key = os.getenv('OPENAI_API_KEY')
+def get_openai():
+    import openai
+    # Set OpenAI API key (you need to set this environment variable)
+    openai.api_key = os.getenv('OPENAI_API_KEY')
+    return openai
 
-# Load translation model lazily (this will download ~2GB on first run)
-model = None
-tokenizer = None
+# Load translation model lazily (this will download ~2GB on first run).
+# INFERENCE_BACKEND picks torch (fp32), torch-int8 (dynamic quantization) or onnx.
+inference = create_backend(os.getenv('INFERENCE_BACKEND', 'torch'))
 
 def load_translation_model():
-    global model, tokenizer
-    if model is None:
-        print("Loading M2M100 model...")
-        from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
-        model_name = "facebook/m2m100_418M"
-        model = M2M100ForConditionalGeneration.from_pretrained(model_name)
-        tokenizer = M2M100Tokenizer.from_pretrained(model_name)
-
-        if torch.cuda.is_available():
-            print("CUDA available - using GPU")
-            model = model.to('cuda')
+    inference.load()
+
+# SERVING_MODE=prefork runs generate in TRANSLATION_WORKERS forked processes sharing
+# the parent's weights (TORCH_THREADS_PER_WORKER each); "threads" keeps it in-process
+SERVING_MODE = os.getenv('SERVING_MODE', 'threads')
+worker_pool = WorkerPool(inference) if SERVING_MODE == 'prefork' else None
+
+def start_workers():
+    """Fork the model workers; must run on the main thread before any request is served"""
+    if worker_pool is not None:
+        worker_pool.start()
+        load_translation_model()
+
+# Model warm-up at boot, so the first user after a deploy doesn't wait for from_pretrained
+PRELOAD_MODEL = os.getenv('PRELOAD_MODEL', '1') == '1'
+warmup = {'started_at': None, 'ready_at': None, 'error': None}
+warmup_lock = threading.Lock()
+
+def warm_up_model():
+    try:
+        if worker_pool is not None:
+            # Each worker runs its own dummy generate after the fork
+            worker_pool.wait_ready()
         else:
-            print("Using CPU - consider using smaller text chunks")
+            load_translation_model()
+            # The first generate also pays for kernel selection / lazy init; do it now
+            generate_batch(["Hello"], 'en', 'hi')
+        warmup['ready_at'] = time.time()
+        logger.info("Model warm in %.1fs", warmup['ready_at'] - warmup['started_at'])
+    except Exception as e:
+        warmup['error'] = str(e)
+        logger.exception("Model warm-up failed")
+
+def start_warmup():
+    """Load and exercise the model in a background thread (once)"""
+    with warmup_lock:
+        if warmup['started_at'] is not None:
+            return
+        warmup['started_at'] = time.time()
+    threading.Thread(target=warm_up_model, name='model-warmup', daemon=True).start()
 
-def cleanup_memory():
-    """Clean up GPU/CPU memory"""
-    if torch.cuda.is_available():
-        torch.cuda.empty_cache()
-    gc.collect()
+# gc and cache trimming happen in a background thread when RSS crosses a watermark, not per request;
+# with MODEL_IDLE_UNLOAD_SECONDS set, the in-process model is unloaded when idle and reloaded on the next generate
+governor = MemoryGovernor()
+if worker_pool is None:
+    # Prefork workers hold their own copies of the weights, so unloading the parent's frees nothing
+    governor.manage_model(inference)
 
 def adjust_grammatical_gender(text, target_lang, speaker_gender):
     """Adjust translation based on speaker's gender for languages that need it"""
     
-    print(f"Adjusting grammar: {speaker_gender} speaker for {target_lang}")
+    logger.debug("Adjusting grammar: %s speaker for %s", speaker_gender, target_lang)
     
     # Languages that have grammatical gender differences
     gender_sensitive_langs = ['hi', 'ur', 'ne', 'bn', 'gu', 'mr', 'pa']
     
     if target_lang not in gender_sensitive_langs:
-        print(f"INFO: {target_lang} doesn't need gender adjustment")
+        logger.debug("%s doesn't need gender adjustment", target_lang)
         return text
     
-    # Enhanced gender-based replacements for Hindi/Urdu
-    if target_lang in ['hi', 'ur']:
-        if speaker_gender == 'male':
-            replacements = {
-                # Present continuous (रहा/रही)
-                'रही': 'रहा', 'रहीं': 'रहे',
-                # Verb endings
-                'करती': 'करता', 'जाती': 'जाता', 'आती': 'आता', 'खाती': 'खाता',
-                'पीती': 'पीता', 'सोती': 'सोता', 'बोलती': 'बोलता', 'देती': 'देता',
-                'लेती': 'लेता', 'चलती': 'चलता', 'पढ़ती': 'पढ़ता', 'लिखती': 'लिखता',
-                'होती': 'होता', 'कहती': 'कहता', 'सुनती': 'सुनता', 'देखती': 'देखता',
-                # Past tense
-                'गई': 'गया', 'आई': 'आया', 'की': 'किया'
-            }
-            print(f"SUCCESS: Applied {len(replacements)} male grammar rules")
-        else:  # female
-            replacements = {
-                # Present continuous (रहा/रही)
-                'रहा': 'रही', 'रहे': 'रहीं',
-                # Verb endings
-                'करता': 'करती', 'जाता': 'जाती', 'आता': 'आती', 'खाता': 'खाती',
-                'पीता': 'पीती', 'सोता': 'सोती', 'बोलता': 'बोलती', 'देता': 'देती',
-                'लेता': 'लेती', 'चलता': 'चलती', 'पढ़ता': 'पढ़ती', 'लिखता': 'लिखती',
-                'होता': 'होती', 'कहता': 'कहती', 'सुनता': 'सुनती', 'देखता': 'देखती',
-                # Past tense
-                'गया': 'गई', 'आया': 'आई', 'किया': 'की'
-            }
-            print(f"SUCCESS: Applied {len(replacements)} female grammar rules")
-        
-        original_text = text
-        for old, new in replacements.items():
-            text = text.replace(old, new)
-        
-        if text != original_text:
-            print(f"INFO: Grammar changed: '{original_text}' -> '{text}'")
-    
-    # Enhanced Punjabi gender rules
-    elif target_lang == 'pa':
-        if speaker_gender == 'male':
-            replacements = {
-                'ਕਰਦੀ': 'ਕਰਦਾ', 'ਜਾਂਦੀ': 'ਜਾਂਦਾ', 'ਆਉਂਦੀ': 'ਆਉਂਦਾ',
-                'ਰਹੀ': 'ਰਿਹਾ', 'ਹੈ': 'ਹੈ'
-            }
-        else:  # female
-            replacements = {
-                'ਕਰਦਾ': 'ਕਰਦੀ', 'ਜਾਂਦਾ': 'ਜਾਂਦੀ', 'ਆਉਂਦਾ': 'ਆਉਂਦੀ',
-                'ਰਿਹਾ': 'ਰਹੀ'
-            }
-        
-        for old, new in replacements.items():
-            text = text.replace(old, new)
+    original_text = text
+    with timed('gender'):
+        text = apply_gender_rules(text, target_lang, speaker_gender)
     
-    # Enhanced Nepali gender rules
-    elif target_lang == 'ne':
-        if speaker_gender == 'male':
-            replacements = {
-                'छिन्': 'छु', 'छिन्न्': 'छु', 'छी': 'छु',
-                'गर्छिन्': 'गर्छु', 'हुन्छिन्': 'हुन्छु'
-            }
-        else:  # female
-            replacements = {
-                'छु': 'छिन्', 'छ': 'छिन्', 'गर्छु': 'गर्छिन्',
-                'हुन्छु': 'हुन्छिन्'
-            }
-        
-        for old, new in replacements.items():
-            text = text.replace(old, new)
-    
-    # Bengali gender rules
-    elif target_lang == 'bn':
-        if speaker_gender == 'male':
-            replacements = {
-                'করছি': 'করছি', 'যাচ্ছি': 'যাচ্ছি'  # Bengali has less gender distinction
-            }
-        else:
-            replacements = {}
-        
-        for old, new in replacements.items():
-            text = text.replace(old, new)
+    if text != original_text:
+        logger.debug("Grammar changed: %r -> %r", original_text, text)
     
     return text
 
@@ -159,7 +146,7 @@ def get_ai_explanation(message, skill_topic, user_role):
         Keep your response concise (2-3 sentences) and supportive.
         """
 
-        response = openai.ChatCompletion.create(
+        response = get_openai().ChatCompletion.create(
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=150,
@@ -167,42 +154,70 @@ def get_ai_explanation(message, skill_topic, user_role):
         )
         return response.choices[0].message.content.strip()
     except Exception as e:
-        print(f"AI explanation error: {e}")
+        logger.error("AI explanation error: %s", e)
         return None
 
+# Chat rooms: each member reads in their own language; messages are translated in the background
+cluster = Cluster(cluster_store) if cluster_store is not None else None
+room_members = SharedRoomMembers(cluster_store, cluster) if cluster is not None else RoomMembers()
+chat_fanout = ChatFanout(
+    lambda message, source_lang, target_lang: translate_text(message, source_lang, target_lang),
+    socketio.emit,
+    room_members,
+    cluster=cluster,
+)
+
+def set_member_language(room, lang):
+    previous = room_members.join(room, request.sid, lang)
+    if previous is not None and previous != lang:
+        leave_room(language_channel(room, previous))
+    join_room(language_channel(room, lang))
+
 @socketio.on('join_room')
 def handle_join_room(data):
     room = data['room']
     username = data['username']
     join_room(room)
+    set_member_language(room, data.get('lang', 'en'))
     emit('user_joined', {'username': username}, room=room)
 
+@socketio.on('set_language')
+def handle_set_language(data):
+    lang = data.get('lang', 'en')
+    rooms = [data['room']] if data.get('room') else [room for room, _ in room_members.rooms_of(request.sid)]
+    for room in rooms:
+        set_member_language(room, lang)
+
+@socketio.on('leave_room')
+def handle_leave_room(data):
+    room = data['room']
+    lang = room_members.leave(room, request.sid)
+    if lang is not None:
+        leave_room(language_channel(room, lang))
+    leave_room(room)
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    # Flask-SocketIO drops the socket from its rooms; only our own bookkeeping needs updating
+    room_members.leave_all(request.sid)
+    live_translator.close_all(request.sid)
+
 @socketio.on('send_message')
 def handle_send_message(data):
     room = data['room']
     message = data['message']
     username = data['username']
     user_lang = data.get('user_lang', 'en')
-    target_lang = data.get('target_lang', 'en')
     skill_topic = data.get('skill_topic', 'general')
     user_role = data.get('user_role', 'learner')
 
-    # Translate message if languages are different
-    translated_message = message
-    if user_lang != target_lang:
-        try:
-            translated_message = translate_text(message, user_lang, target_lang)
-        except Exception as e:
-            print(f"Translation failed for chat: {e}")
-
-    emit('receive_message', {
+    # Returns straight away; each language channel gets its copy when its translation lands
+    chat_fanout.publish(room, message, user_lang, {
         'username': username,
         'message': message,
-        'translated_message': translated_message,
         'original_lang': user_lang,
-        'target_lang': target_lang,
         'timestamp': data.get('timestamp')
-    }, room=room)
+    })
 
     # Get AI explanation (disabled due to quota limits)
     # try:
@@ -213,7 +228,7 @@ def handle_send_message(data):
     #             'type': 'explanation'
     #         }, room=room)
     # except Exception as e:
-    #     print(f"AI explanation skipped: {e}")
+    #     logger.info("AI explanation skipped: %s", e)
     pass  # AI explanations disabled due to quota
 
 @socketio.on('request_explanation')
@@ -225,7 +240,7 @@ def handle_request_explanation(data):
     prompt = f"Explain {topic} in simple terms. Context: {context}"
 
     try:
-        response = openai.ChatCompletion.create(
+        response = get_openai().ChatCompletion.create(
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=200
@@ -236,52 +251,55 @@ def handle_request_explanation(data):
             'type': 'explanation'
         }, room=room)
     except Exception as e:
-        print(f"AI explanation error: {e}")
+        logger.error("AI explanation error: %s", e)
+
+# Per-script transliteration tables, compiled once here rather than per call
+romanizer = Romanizer()
 
 def romanize_text(text, target_lang):
     """Romanize text for pronunciation help"""
     try:
-        # Languages that support romanization
-        romanizable_langs = {
-            'hi': 'devanagari',
-            'bn': 'bengali',
-            'te': 'telugu',
-            'ta': 'tamil',
-            'ml': 'malayalam',
-            'gu': 'gujarati',
-            'kn': 'kannada',
-            'mr': 'devanagari',
-            'pa': 'gurmukhi',
-            'ur': 'urdu',
-            'ne': 'devanagari',
-            'or': 'oriya',
-            'as': 'assamese',
-            'mai': 'devanagari',
-            'bho': 'devanagari',
-            'awa': 'devanagari',
-            'mag': 'devanagari',
-            'hne': 'devanagari',
-            'doi': 'devanagari'
-        }
+        with timed('romanize'):
+            return romanizer.romanize(text, target_lang)
+    except Exception as e:
+        logger.error("Romanization failed for %s: %s", target_lang, e)
+        return None
 
-        if target_lang not in romanizable_langs:
-            return None
+# Common phrases in every lang_codes language, answered from a memory-mapped index
+# (built from data/phrasebook.tsv; `python phrasebook.py` rebuilds it)
+phrasebook = load_phrasebook()
 
-        script = romanizable_langs[target_lang]
-        romanized = transliterate(text, script, sanscript.ITRANS)
-        return romanized
+# Raw (pre gender adjustment) translations shared by every translation path
+translation_cache = TranslationCache()
+governor.register_cache('translation', translation_cache.shrink)
 
-    except Exception as e:
-        print(f"ERROR: Romanization failed for {target_lang}: {e}")
-        return None
+# Warm googletrans clients shared across requests; the breaker sends us to M2M100 when Google is down
+def new_google_client():
+    # Install: pip install googletrans==4.0.0rc1
+    from googletrans import Translator
+    return Translator()
+
+google_pool = TranslatorPool(new_google_client)
+
+def google_translate(text, source_lang, target_lang):
+    """One timed call to Google Translate through the client pool"""
+    with timed('google'):
+        return google_pool.translate(text, source_lang, target_lang)
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        "translation": translation_cache.stats(),
+        "audio": audio_cache.stats(),
+        "romanization": romanizer.stats(),
+        "phrasebook": phrasebook.stats() if phrasebook is not None else None,
+    })
 
 def translate_text(text, source_lang, target_lang, speaker_gender='female'):
     """Translate text with gender context"""
     try:
-        # Try Google Translate first (BEST OPTION)
-        translator = Translator()
-        result = translator.translate(text, src=source_lang, dest=target_lang)
-        translated = result.text
+        translated, backend = translation_router.translate(text, source_lang, target_lang)
+        count_translation(backend, source_lang, target_lang)
 
         # Apply gender adjustments only for specific languages
         if target_lang in ['hi', 'ur', 'ne', 'pa']:
@@ -290,184 +308,354 @@ def translate_text(text, source_lang, target_lang, speaker_gender='female'):
         return translated
 
     except Exception as e:
-        print(f"ERROR: Google Translate failed: {e}")
-        # Try a simple fallback translation using basic mappings for common cases
-        if source_lang == 'en' and target_lang == 'hi':
-            # Very basic English to Hindi fallback
-            basic_translations = {
-                'hello': 'नमस्ते',
-                'thank you': 'धन्यवाद',
-                'please': 'कृपया',
-                'yes': 'हाँ',
-                'no': 'नहीं',
-                'good': 'अच्छा',
-                'bad': 'खराब',
-                'how are you': 'आप कैसे हैं',
-                'i am fine': 'मैं ठीक हूँ',
-                'what': 'क्या',
-                'where': 'कहाँ',
-                'when': 'कब',
-                'why': 'क्यों',
-                'how': 'कैसे'
-            }
-            lower_text = text.lower().strip()
-            if lower_text in basic_translations:
-                return basic_translations[lower_text]
-            else:
-                # Return original text marked as untranslated
-                return f"[Translation unavailable] {text}"
-
-        # For other language pairs, return original text
+        logger.error("All translation backends failed: %s", e)
+        # Last resort: a phrasebook entry one typo away from the text, never ahead of a real translator
+        translated = phrasebook.closest(text, source_lang, target_lang) if phrasebook is not None else None
+        if translated is not None:
+            count_translation('phrasebook_fuzzy', source_lang, target_lang)
+            if target_lang in ['hi', 'ur', 'ne', 'pa']:
+                translated = adjust_grammatical_gender(translated, target_lang, speaker_gender)
+            return translated
+        # Return original text marked as untranslated
+        count_translation('unavailable', source_lang, target_lang)
         return f"[Translation unavailable] {text}"
 
+# M2M100 language codes for the languages the UI offers
+lang_codes = {
+    'en': 'en', 'es': 'es', 'fr': 'fr', 'de': 'de', 'it': 'it', 'pt': 'pt',
+    'ru': 'ru', 'ja': 'ja', 'ko': 'ko', 'zh': 'zh', 'ar': 'ar', 'tr': 'tr',
+    'hi': 'hi', 'bn': 'bn', 'te': 'te', 'ta': 'ta', 'ml': 'ml', 'gu': 'gu',
+    'kn': 'kn', 'mr': 'mr', 'ur': 'ur', 'ne': 'ne', 'pa': 'pa',
+    'pl': 'pl', 'nl': 'nl', 'sv': 'sv'
+}
+
+def count_translation(backend, source_lang, target_lang, amount=1):
+    # Language labels come from clients; anything outside lang_codes is 'other' so they can't mint new series
+    TRANSLATIONS.inc(amount, backend=backend,
+                     source_lang=source_lang if source_lang in lang_codes else 'other',
+                     target_lang=target_lang if target_lang in lang_codes else 'other')
+
+def generate_batch(texts, source_code, target_code):
+    """Run one padded model.generate over texts that share a language pair"""
+    if worker_pool is not None:
+        return worker_pool.generate(texts, source_code, target_code)
+    with governor.model_session():
+        load_translation_model()
+        return inference.generate(texts, source_code, target_code)
+
+def generate_targets_batch(texts, source_code, target_lists):
+    """Texts sharing a source language, each into its own languages: one encoder pass, one batched decode"""
+    if worker_pool is not None:
+        return worker_pool.generate_targets_batch(texts, source_code, target_lists)
+    with governor.model_session():
+        load_translation_model()
+        return inference.generate_targets_batch(texts, source_code, target_lists)
+
+# Concurrent translate_single_chunk callers share forward passes through this batcher;
+# in prefork mode it keeps one batch in flight per worker
+batcher = TranslationBatcher(generate_batch, max_concurrent_batches=worker_pool.workers if worker_pool else 1,
+                             generate_targets_batch=generate_targets_batch)
+
+def translate_with_model(text, source_lang, target_lang):
+    # Through the chunker: a single generate would truncate anything past the tokenizer's 128 tokens.
+    # No gender rules here; translate_text applies them to whichever backend answered.
+    return translate_document(text, source_lang, target_lang, speaker_gender=None)
+
+# Every way translate_text can get an answer. Cache, the exact phrasebook and then its shorthand matcher
+# ("thank u") are tried first; Google and M2M100 are then ordered per language pair by measured latency
+# and error rate.
+translation_router = Router([
+    FunctionBackend('cache', translation_cache.get, lookup=True, remember=translation_cache.put),
+    *([FunctionBackend('phrasebook', phrasebook.lookup, lookup=True, supports=phrasebook.supports),
+       FunctionBackend('phrasebook_similar', phrasebook.similar, lookup=True, supports=phrasebook.supports)]
+      if phrasebook is not None else []),
+    FunctionBackend('google', google_translate),
+    FunctionBackend('m2m100', translate_with_model,
+                    supports=lambda source_lang, target_lang: source_lang in lang_codes and target_lang in lang_codes),
+])
+REGISTRY.register_collector(translation_router.collect)
+
 def translate_single_chunk(text, source_lang, target_lang, speaker_gender='female'):
     """Translate a single chunk of text with optimized speed"""
     try:
-        # Load model if not loaded
-        load_translation_model()
-
-        lang_codes = {
-            'en': 'en', 'es': 'es', 'fr': 'fr', 'de': 'de', 'it': 'it', 'pt': 'pt',
-            'ru': 'ru', 'ja': 'ja', 'ko': 'ko', 'zh': 'zh', 'ar': 'ar', 'tr': 'tr',
-            'hi': 'hi', 'bn': 'bn', 'te': 'te', 'ta': 'ta', 'ml': 'ml', 'gu': 'gu',
-            'kn': 'kn', 'mr': 'mr', 'ur': 'ur', 'ne': 'ne', 'pa': 'pa',
-            'pl': 'pl', 'nl': 'nl', 'sv': 'sv'
-        }
-        
         source_code = lang_codes.get(source_lang, 'en')
         target_code = lang_codes.get(target_lang, 'hi')
         
-        print(f"Translating: '{text[:30]}...' {source_code}->{target_code}")
-        
-        # OPTIMIZED: Faster tokenization and generation
-        tokenizer.src_lang = source_code
-        encoded = tokenizer(text, return_tensors="pt", max_length=128, truncation=True, padding=False)
+        logger.debug("Translating: %r %s->%s", text[:30], source_code, target_code)
         
-        # Move to GPU if available
-        if torch.cuda.is_available():
-            encoded = {k: v.to('cuda') for k, v in encoded.items()}
-        
-        # MUCH FASTER generation parameters
-        with torch.no_grad():  # Disable gradient computation for speed
-            generated_tokens = model.generate(
-                **encoded, 
-                forced_bos_token_id=tokenizer.get_lang_id(target_code),
-                max_length=150,      # Reduced from 300
-                num_beams=1,         # Reduced from 3 (greedy search - fastest)
-                do_sample=False,     # No sampling for speed
-                early_stopping=True,
-                pad_token_id=tokenizer.pad_token_id,
-                use_cache=True       # Enable caching
-            )
-        
-        translated = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)[0]
+        backend = 'cache'
+        translated = translation_cache.get(text, source_lang, target_lang)
+        if translated is None:
+            backend = 'm2m100'
+            translated = batcher.translate(text, source_code, target_code)
+            translation_cache.put(text, source_lang, target_lang, translated)
+        count_translation(backend, source_lang, target_lang)
         translated = adjust_grammatical_gender(translated, target_lang, speaker_gender)
         
-        print(f"SUCCESS: Translated: '{translated[:30]}...'")
+        logger.debug("Translated: %r", translated[:30])
         return translated
         
     except Exception as e:
-        print(f"Translation error: {e}")
+        logger.error("Translation error: %s", e)
         return f"[Error: {str(e)}]"
 
+# Leave headroom under the tokenizer's max_length=128 truncation
+MAX_CHUNK_TOKENS = int(os.getenv('TRANSLATION_MAX_CHUNK_TOKENS', '100'))
+
+def count_model_tokens(text):
+    """Token count as the M2M100 tokenizer sees it"""
+    # The tokenizer outlives an idle unload, so counting tokens doesn't bring the weights back
+    if inference.tokenizer is None:
+        load_translation_model()
+    return len(inference.tokenizer.tokenize(text))
+
+def translate_document_stream(text, source_lang, target_lang, speaker_gender='female'):
+    """Translate long text chunk by chunk, yielding each piece (with its whitespace) in order
+
+    speaker_gender=None yields the model's output without the gender rules.
+    """
+    source_code = lang_codes.get(source_lang, 'en')
+    target_code = lang_codes.get(target_lang, 'hi')
+    chunks = chunk_text(text, source_code, MAX_CHUNK_TOKENS, count_model_tokens)
+    logger.debug("Document split into %d chunks %s->%s", len(chunks), source_code, target_code)
+
+    # Submit everything up front so the batcher can run the chunks together
+    futures = [batcher.submit(chunk.text, source_code, target_code) if chunk.text else None
+               for chunk in chunks]
+
+    for chunk, future in zip(chunks, futures):
+        translated = ''
+        if future is not None:
+            translated = future.result()
+            if speaker_gender is not None:
+                translated = adjust_grammatical_gender(translated, target_lang, speaker_gender)
+        yield translated + chunk.separator
+
+def translate_document(text, source_lang, target_lang, speaker_gender='female'):
+    """Translate text of any length through the chunking pipeline"""
+    return ''.join(translate_document_stream(text, source_lang, target_lang, speaker_gender))
+
+@socketio.on('translate_document')
+def handle_translate_document(data):
+    text = data.get('text', '')
+    source_lang = data.get('source_lang', 'en')
+    target_lang = data.get('target_lang', 'hi')
+    speaker_gender = data.get('speaker_gender', 'female')
+
+    try:
+        for index, piece in enumerate(translate_document_stream(text, source_lang, target_lang, speaker_gender)):
+            emit('translation_chunk', {'index': index, 'text': piece})
+        emit('translation_done', {'source_lang': source_lang, 'target_lang': target_lang})
+    except Exception as e:
+        logger.error("Document translation failed: %s", e)
+        emit('translation_error', {'error': 'Translation service temporarily unavailable'})
+
+def translate_live_sentence(text, source_lang, target_lang, speaker_gender, revision):
+    """One sentence for a live session: cache, then Google, then the model; stops once superseded"""
+    translated = translation_cache.get(text, source_lang, target_lang)
+    backend = 'cache'
+    if translated is None:
+        revision.check()
+        try:
+            translated = google_translate(text, source_lang, target_lang)
+            backend = 'google'
+        except Exception as e:
+            revision.check()
+            if source_lang not in lang_codes or target_lang not in lang_codes:
+                raise
+            logger.warning("Google Translate failed for live sentence, using local model: %s", e)
+            # Tracked so a newer revision pulls it out of the batcher before it reaches the model
+            future = revision.track(batcher.submit(text, lang_codes[source_lang], lang_codes[target_lang]))
+            translated = future.result()
+            backend = 'm2m100'
+        translation_cache.put(text, source_lang, target_lang, translated)
+    count_translation(backend, source_lang, target_lang)
+    return adjust_grammatical_gender(translated, target_lang, speaker_gender)
+
+# Translate-as-you-type works per sentence, so an edit only re-translates its own sentence.
+# The cheap token estimate keeps Google-only sessions from loading the model's tokenizer.
+live_translator = LiveTranslator(
+    translate_live_sentence,
+    lambda text, source_lang: sentence_chunks(text, lang_codes.get(source_lang, source_lang), MAX_CHUNK_TOKENS),
+)
+
+@socketio.on('live_update')
+def handle_live_update(data):
+    """Client sends the whole text with an increasing revision number on every edit"""
+    sid = request.sid
+    session_id = data.get('session_id', 'default')
+    try:
+        revision = int(data.get('revision', 0))
+    except (TypeError, ValueError):
+        emit('live_error', {'session_id': session_id, 'error': 'revision must be an integer'})
+        return
+    live_translator.update(
+        (sid, session_id),
+        revision,
+        data.get('text', ''),
+        data.get('source_lang', 'en'),
+        data.get('target_lang', 'hi'),
+        data.get('speaker_gender', 'female'),
+        lambda event, payload: socketio.emit(event, payload, to=sid),
+    )
+
+@socketio.on('live_close')
+def handle_live_close(data):
+    live_translator.close((request.sid, data.get('session_id', 'default')))
+
+# COMPREHENSIVE Voice mapping for ALL languages
+edge_voices = {
+    'en': {'male': 'en-US-BrianNeural', 'female': 'en-US-JennyNeural'},
+    'hi': {'male': 'hi-IN-MadhurNeural', 'female': 'hi-IN-SwaraNeural'},
+    'bn': {'male': 'bn-BD-PradeepNeural', 'female': 'bn-BD-NabanitaNeural'},
+    'es': {'male': 'es-ES-AlvaroNeural', 'female': 'es-ES-ElviraNeural'},
+    'fr': {'male': 'fr-FR-HenriNeural', 'female': 'fr-FR-DeniseNeural'},
+    'de': {'male': 'de-DE-ConradNeural', 'female': 'de-DE-KatjaNeural'},
+    'it': {'male': 'it-IT-DiegoNeural', 'female': 'it-IT-ElsaNeural'},
+    'pt': {'male': 'pt-BR-AntonioNeural', 'female': 'pt-BR-FranciscaNeural'},
+    'ru': {'male': 'ru-RU-DmitryNeural', 'female': 'ru-RU-SvetlanaNeural'},
+    'ja': {'male': 'ja-JP-KeitaNeural', 'female': 'ja-JP-NanamiNeural'},
+    'ko': {'male': 'ko-KR-InJoonNeural', 'female': 'ko-KR-SunHiNeural'},
+    'zh': {'male': 'zh-CN-YunxiNeural', 'female': 'zh-CN-XiaoxiaoNeural'},
+    'ar': {'male': 'ar-SA-HamedNeural', 'female': 'ar-SA-ZariyahNeural'},
+    'tr': {'male': 'tr-TR-AhmetNeural', 'female': 'tr-TR-EmelNeural'},
+    'ur': {'male': 'ur-PK-AsadNeural', 'female': 'ur-PK-UzmaNeural'},
+    'ne': {'male': 'ne-NP-SagarNeural', 'female': 'ne-NP-HemkalaNeural'},
+    'pa': {'male': 'pa-IN-GaganNeural', 'female': 'pa-IN-HarpreetNeural'},
+    'gu': {'male': 'gu-IN-NiranjanNeural', 'female': 'gu-IN-DhwaniNeural'},
+    'mr': {'male': 'mr-IN-ManoharNeural', 'female': 'mr-IN-AarohiNeural'},
+    'ta': {'male': 'ta-IN-ValluvarNeural', 'female': 'ta-IN-PallaviNeural'},
+    'te': {'male': 'te-IN-MohanNeural', 'female': 'te-IN-ShrutiNeural'},
+    'ml': {'male': 'ml-IN-MidhunNeural', 'female': 'ml-IN-SobhanaNeural'},
+    'kn': {'male': 'kn-IN-GaganNeural', 'female': 'kn-IN-SapnaNeural'},
+    'pl': {'male': 'pl-PL-MarekNeural', 'female': 'pl-PL-ZofiaNeural'},
+    'nl': {'male': 'nl-NL-MaartenNeural', 'female': 'nl-NL-ColetteNeural'},
+    'sv': {'male': 'sv-SE-MattiasNeural', 'female': 'sv-SE-SofieNeural'}
+}
+
+# Every edge_tts session runs on this loop instead of one event loop per request
+tts_worker = AsyncWorker(name='tts-worker')
+
+# Edge TTS speaking rate; part of the audio cache key
+TTS_SPEED = '+0%'
+
+# Synthesized clips, content-addressed by (engine, voice, speed, text)
+audio_cache = AudioCache()
+# Browser cache lifetime for gTTS fallback clips; Edge clips are immutable for a year
+FALLBACK_AUDIO_MAX_AGE = int(os.getenv('TTS_FALLBACK_MAX_AGE', '86400'))
+# Streaming TTS keeps each clip in memory until it can be cached; this caps all of those buffers together
+audio_buffers = BufferBudget()
+
+def edge_voice_for(target_lang, gender):
+    return edge_voices.get(target_lang, {}).get(gender, 'en-US-JennyNeural')
+
+def edge_audio_key(text, target_lang, gender):
+    return audio_key(text, edge_voice_for(target_lang, gender), TTS_SPEED)
+
+def gtts_audio_key(text, target_lang, gender):
+    # generate_gtts_audio picks its accent and pace from the language and gender
+    return audio_key(text, f"{target_lang}:{gender}", TTS_SPEED, engine='gtts')
+
+def audio_url_for(key):
+    """Public URL for a cached clip returned by generate_tts_stream"""
+    return url_for('serve_audio', key=key, _external=True)
+
+@app.route('/audio/<key>.mp3', methods=['GET'])
+def serve_audio(key):
+    path = audio_cache.get(key)
+    if path is None:
+        return jsonify({"error": "Audio not found"}), 404
+
+    # conditional=True gives us If-None-Match/304 and Range/206 handling
+    fallback = is_fallback_key(key)
+    response = send_file(path, mimetype='audio/mpeg', conditional=True, etag=key,
+                         max_age=FALLBACK_AUDIO_MAX_AGE if fallback else 31536000)
+    response.cache_control.public = True
+    if not fallback:
+        response.cache_control.immutable = True
+    return response
+
 async def generate_edge_tts(text, target_lang, gender):
     """Generate TTS using Microsoft Edge TTS with proper male/female voices"""
     try:
-        print(f"INFO: Edge TTS called: lang={target_lang}, gender={gender}")
-        
-        # COMPREHENSIVE Voice mapping for ALL languages
-        voice_map = {
-            'en': {'male': 'en-US-BrianNeural', 'female': 'en-US-JennyNeural'},
-            'hi': {'male': 'hi-IN-MadhurNeural', 'female': 'hi-IN-SwaraNeural'},
-            'bn': {'male': 'bn-BD-PradeepNeural', 'female': 'bn-BD-NabanitaNeural'},
-            'es': {'male': 'es-ES-AlvaroNeural', 'female': 'es-ES-ElviraNeural'},
-            'fr': {'male': 'fr-FR-HenriNeural', 'female': 'fr-FR-DeniseNeural'},
-            'de': {'male': 'de-DE-ConradNeural', 'female': 'de-DE-KatjaNeural'},
-            'it': {'male': 'it-IT-DiegoNeural', 'female': 'it-IT-ElsaNeural'},
-            'pt': {'male': 'pt-BR-AntonioNeural', 'female': 'pt-BR-FranciscaNeural'},
-            'ru': {'male': 'ru-RU-DmitryNeural', 'female': 'ru-RU-SvetlanaNeural'},
-            'ja': {'male': 'ja-JP-KeitaNeural', 'female': 'ja-JP-NanamiNeural'},
-            'ko': {'male': 'ko-KR-InJoonNeural', 'female': 'ko-KR-SunHiNeural'},
-            'zh': {'male': 'zh-CN-YunxiNeural', 'female': 'zh-CN-XiaoxiaoNeural'},
-            'ar': {'male': 'ar-SA-HamedNeural', 'female': 'ar-SA-ZariyahNeural'},
-            'tr': {'male': 'tr-TR-AhmetNeural', 'female': 'tr-TR-EmelNeural'},
-            'ur': {'male': 'ur-PK-AsadNeural', 'female': 'ur-PK-UzmaNeural'},
-            'ne': {'male': 'ne-NP-SagarNeural', 'female': 'ne-NP-HemkalaNeural'},
-            'pa': {'male': 'pa-IN-GaganNeural', 'female': 'pa-IN-HarpreetNeural'},
-            'gu': {'male': 'gu-IN-NiranjanNeural', 'female': 'gu-IN-DhwaniNeural'},
-            'mr': {'male': 'mr-IN-ManoharNeural', 'female': 'mr-IN-AarohiNeural'},
-            'ta': {'male': 'ta-IN-ValluvarNeural', 'female': 'ta-IN-PallaviNeural'},
-            'te': {'male': 'te-IN-MohanNeural', 'female': 'te-IN-ShrutiNeural'},
-            'ml': {'male': 'ml-IN-MidhunNeural', 'female': 'ml-IN-SobhanaNeural'},
-            'kn': {'male': 'kn-IN-GaganNeural', 'female': 'kn-IN-SapnaNeural'},
-            'pl': {'male': 'pl-PL-MarekNeural', 'female': 'pl-PL-ZofiaNeural'},
-            'nl': {'male': 'nl-NL-MaartenNeural', 'female': 'nl-NL-ColetteNeural'},
-            'sv': {'male': 'sv-SE-MattiasNeural', 'female': 'sv-SE-SofieNeural'}
-        }
+        logger.debug("Edge TTS called: lang=%s gender=%s", target_lang, gender)
         
         # Get voice for language and gender
-        voice = voice_map.get(target_lang, {}).get(gender, 'en-US-JennyNeural')
+        voice = edge_voice_for(target_lang, gender)
         
-        print(f"INFO: Using Edge TTS voice for {target_lang}-{gender}")
+        logger.debug("Using Edge TTS voice %s", voice)
         
         # Generate speech
+        import edge_tts
         communicate = edge_tts.Communicate(text, voice)
         
-        # Save to memory
-        audio_data = b""
-        async for chunk in communicate.stream():
-            if chunk["type"] == "audio":
-                audio_data += chunk["data"]
+        # Save to memory (bytearray keeps appends linear)
+        audio_data = bytearray()
+        with timed('edge_tts'):
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    audio_data.extend(chunk["data"])
         
         if not audio_data:
-            print("ERROR: No audio data received from Edge TTS")
+            logger.error("No audio data received from Edge TTS")
             return None
         
-        print(f"SUCCESS: Edge TTS generated {len(audio_data)} bytes")
-        
-        # Convert to base64
-        audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-        return f"data:audio/mp3;base64,{audio_base64}"
+        logger.debug("Edge TTS generated %d bytes", len(audio_data))
+        return bytes(audio_data)
         
     except Exception as e:
-        print(f"ERROR: Edge TTS error for {target_lang}: {e}")
+        logger.error("Edge TTS error for %s: %s", target_lang, e)
         return None
 
 def generate_tts_stream(text, target_lang, gender='female'):
-    """Generate TTS with proper error handling"""
+    """Generate TTS with proper error handling, returning an audio cache key"""
+    if not text or not text.strip():
+        return None
     try:
-        print(f"INFO: TTS Request: lang={target_lang}, gender={gender}")
+        logger.debug("TTS request: lang=%s gender=%s", target_lang, gender)
+
+        # Identical phrase + voice is synthesized once and served from disk afterwards
+        key = edge_audio_key(text, target_lang, gender)
+        if audio_cache.get(key):
+            logger.debug("TTS cache hit %s", key)
+            TTS_REQUESTS.inc(engine='cache', outcome='ok')
+            return key
         
-        # Try Edge TTS first
+        # Try Edge TTS first, on the shared TTS loop
         try:
-            # Fix event loop issue
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
-            result = loop.run_until_complete(generate_edge_tts(text, target_lang, gender))
+            result = tts_worker.run(generate_edge_tts(text, target_lang, gender))
             
             if result:
-                print(f"SUCCESS: Edge TTS SUCCESS")
-                return result
+                logger.debug("Edge TTS succeeded")
+                TTS_REQUESTS.inc(engine='edge', outcome='ok')
+                audio_cache.put(key, result)
+                return key
                 
         except Exception as e:
-            print(f"WARNING: Edge TTS failed: {e}")
+            logger.warning("Edge TTS failed: %s", e)
         
-        # Always fallback to gTTS
-        print(f"INFO: Using gTTS fallback for {target_lang}")
-        return generate_gtts_audio(text, target_lang, gender)
+        # Always fallback to gTTS, cached under its own key so it never stands in for the Edge clip
+        key = gtts_audio_key(text, target_lang, gender)
+        if audio_cache.get(key):
+            TTS_REQUESTS.inc(engine='cache', outcome='ok')
+            return key
+        logger.info("Using gTTS fallback for %s", target_lang)
+        result = generate_gtts_audio(text, target_lang, gender)
+        if result:
+            TTS_REQUESTS.inc(engine='gtts', outcome='ok')
+            audio_cache.put(key, result)
+            return key
+        TTS_REQUESTS.inc(engine='gtts', outcome='failed')
+        return None
             
     except Exception as e:
-        print(f"ERROR: All TTS failed for {target_lang}: {e}")
+        logger.error("All TTS failed for %s: %s", target_lang, e)
         return None
 
 def generate_gtts_audio(text, target_lang, gender):
     """Generate TTS audio with gTTS - FIXED for all languages"""
     try:
-        print(f"INFO: gTTS generating for {target_lang}: '{text[:30]}...'")
+        logger.debug("gTTS generating for %s: %r", target_lang, text[:30])
         
         # Enhanced TLD mapping for better voices
         tld_map = {
@@ -502,8 +690,10 @@ def generate_gtts_audio(text, target_lang, gender):
         # Get appropriate TLD for gender
         tld = tld_map.get(target_lang, {}).get(gender, 'com')
         
-        print(f"INFO: gTTS: {target_lang} with {gender} voice")
+        logger.debug("gTTS: %s with %s voice", target_lang, gender)
         
+        from gtts import gTTS
+
         # Create TTS with gender-specific settings
         if gender == 'male':
             tts = gTTS(text=text, lang=target_lang, slow=True, tld=tld)
@@ -512,30 +702,138 @@ def generate_gtts_audio(text, target_lang, gender):
         
         # Save to memory buffer
         audio_buffer = io.BytesIO()
-        tts.write_to_fp(audio_buffer)
-        audio_buffer.seek(0)
+        with timed('gtts'):
+            tts.write_to_fp(audio_buffer)
         
-        # Convert to base64
-        audio_base64 = base64.b64encode(audio_buffer.read()).decode('utf-8')
-        
-        print(f"SUCCESS: gTTS SUCCESS for {target_lang}")
-        return f"data:audio/mp3;base64,{audio_base64}"
+        logger.debug("gTTS succeeded for %s", target_lang)
+        return audio_buffer.getvalue()
         
     except Exception as e:
-        print(f"ERROR: gTTS error for {target_lang}: {e}")
+        logger.error("gTTS error for %s: %s", target_lang, e)
         return None
 
+# Longest gap between Edge TTS stream events before we give up on it
+EDGE_TTS_CHUNK_TIMEOUT = float(os.getenv('EDGE_TTS_CHUNK_TIMEOUT', '10'))
+
+async def edge_tts_events(text, target_lang, gender):
+    import edge_tts
+    communicate = edge_tts.Communicate(text, edge_voice_for(target_lang, gender))
+    async for chunk in communicate.stream():
+        yield chunk
+
+def iter_edge_tts(text, target_lang, gender):
+    """Yield Edge TTS stream events in the calling thread as the TTS loop receives them"""
+    return tts_worker.stream(edge_tts_events(text, target_lang, gender), item_timeout=EDGE_TTS_CHUNK_TIMEOUT)
+
+def stream_tts_audio(text, target_lang, gender='female'):
+    """Yield MP3 bytes as soon as Edge TTS produces them, finishing with gTTS if Edge fails"""
+    if not text or not text.strip():
+        return
+    key = edge_audio_key(text, target_lang, gender)
+    path = audio_cache.get(key)
+    if path:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(16384), b''):
+                yield block
+        return
+
+    audio_data = bytearray()
+    received = 0
+    # Once audio_buffers is spent the clip still streams, it just isn't kept for the cache
+    caching = True
+
+    def keep(block):
+        nonlocal caching
+        if caching and audio_buffers.reserve(len(block)):
+            audio_data.extend(block)
+        elif caching:
+            caching = False
+            audio_buffers.release(len(audio_data))
+            audio_data.clear()
+
+    spoken = 0  # end of the text Edge has confirmed speaking, from boundary events
+    keep_clip = True
+    try:
+        try:
+            for chunk in iter_edge_tts(text, target_lang, gender):
+                if chunk["type"] == "audio":
+                    received += len(chunk["data"])
+                    keep(chunk["data"])
+                    yield chunk["data"]
+                elif chunk["type"] in ("WordBoundary", "SentenceBoundary"):
+                    found = text.find(chunk["text"], spoken)
+                    if found != -1:
+                        spoken = found + len(chunk["text"])
+            if not received:
+                raise RuntimeError("No audio data received from Edge TTS")
+        except Exception as e:
+            logger.warning("Edge TTS stream failed after %d bytes: %s", received, e)
+            # Keep the stream going: speak whatever Edge hadn't reached yet with gTTS
+            remainder = text[spoken:].strip() if received else text
+            if remainder:
+                fallback = generate_gtts_audio(remainder, target_lang, gender)
+                if not fallback:
+                    return
+                keep(fallback)
+                yield fallback
+            # Only a clip one engine spoke from start to finish is worth caching;
+            # gTTS output goes under its own key so it never stands in for Edge
+            if received:
+                keep_clip = False
+            key = gtts_audio_key(text, target_lang, gender)
+
+        if caching and keep_clip:
+            audio_cache.put(key, bytes(audio_data))
+    finally:
+        if caching:
+            audio_buffers.release(len(audio_data))
+
+@app.route('/tts/stream', methods=['GET', 'POST'])
+def tts_stream():
+    data = request.get_json(silent=True) or request.args
+    text = (data.get('text') or '').strip()
+    if not text:
+        return jsonify({"error": "No text provided"}), 400
+    target_lang = data.get('target_lang', 'hi')
+    voice_gender = data.get('voice_gender', 'female')
+
+    # No Content-Length, so the body goes out with chunked transfer encoding
+    return Response(
+        stream_with_context(stream_tts_audio(text, target_lang, voice_gender)),
+        mimetype='audio/mpeg',
+        headers={'Cache-Control': 'no-store'}
+    )
+
+@socketio.on('tts_stream')
+def handle_tts_stream(data):
+    text = (data.get('text') or '').strip()
+    target_lang = data.get('target_lang', 'hi')
+    voice_gender = data.get('voice_gender', 'female')
+    request_id = data.get('request_id')
+    if not text:
+        emit('tts_error', {'request_id': request_id, 'error': 'No text provided'})
+        return
+
+    seq = 0
+    try:
+        for block in stream_tts_audio(text, target_lang, voice_gender):
+            # bytes payloads go out as binary socket frames
+            emit('tts_chunk', {'request_id': request_id, 'seq': seq, 'audio': block})
+            seq += 1
+    except Exception as e:
+        logger.error("TTS stream failed for %s: %s", target_lang, e)
+    emit('tts_end', {'request_id': request_id, 'chunks': seq})
+
 def translate_with_google_gender(text, source_lang, target_lang, speaker_gender):
     """Use Google Translate with gender context - FREE"""
     try:
-        print(f"INFO: Google Translate: '{text[:30]}...' {source_lang} -> {target_lang}")
-        translator = Translator()
-        
-        # Simple translation without complex context for reliability
-        result = translator.translate(text, src=source_lang, dest=target_lang)
-        
-        translated = result.text
-        print(f"SUCCESS: Google Translate result: '{translated[:50]}...'")
+        logger.debug("Google Translate: %r %s -> %s", text[:30], source_lang, target_lang)
+        translated = translation_cache.get(text, source_lang, target_lang)
+        if translated is None:
+            # Simple translation without complex context for reliability
+            translated = google_translate(text, source_lang, target_lang)
+            translation_cache.put(text, source_lang, target_lang, translated)
+        logger.debug("Google Translate result: %r", translated[:50])
         
         # Apply gender adjustments only for specific languages
         if target_lang in ['hi', 'ur', 'ne', 'pa']:
@@ -544,14 +842,90 @@ def translate_with_google_gender(text, source_lang, target_lang, speaker_gender)
         return translated
         
     except Exception as e:
-        print(f"ERROR: Google Translate error: {e}")
+        logger.error("Google Translate error: %s", e)
         raise e  # Re-raise to trigger fallback
 
+def romanize_stage(translated, context):
+    return romanize_text(translated, context['target_lang'])
+
+def tts_stage(translated, context):
+    """Audio cache key for the clip (URLs need a request context, so the handler builds those)"""
+    logger.debug("Generating TTS for text in %s with %s voice", context['target_lang'], context['voice_gender'])
+    return generate_tts_stream(translated, context['target_lang'], context['voice_gender'])
+
+# Everything after translation only needs the translated text, so it runs concurrently
+ROMANIZE_TIMEOUT = float(os.getenv('PIPELINE_ROMANIZE_TIMEOUT', '1'))
+TTS_STAGE_TIMEOUT = float(os.getenv('PIPELINE_TTS_TIMEOUT', '10'))
+# Threads per stage: romanization is quick CPU work, TTS mostly waits on the engine
+ROMANIZE_WORKERS = int(os.getenv('PIPELINE_ROMANIZE_WORKERS', '8'))
+TTS_WORKERS = int(os.getenv('PIPELINE_TTS_WORKERS', '24'))
+translate_pipeline = StagePipeline([
+    Stage('romanize', romanize_stage, ROMANIZE_TIMEOUT, workers=ROMANIZE_WORKERS),
+    Stage('tts', tts_stage, TTS_STAGE_TIMEOUT, workers=TTS_WORKERS),
+])
+OPTIONAL_STAGES = ('romanize', 'tts')
+
+def translation_response(text, source_lang, target_lang, stages, speaker_gender, voice_gender):
+    """Body of a /translate response: the translation plus whichever of OPTIONAL_STAGES were asked for"""
+    translated_text = translate_text(text, source_lang, target_lang, speaker_gender)
+
+    if not translated_text:
+        return None
+
+    results, timed_out = translate_pipeline.run(
+        translated_text, {'target_lang': target_lang, 'voice_gender': voice_gender}, stages)
+    audio_id = results.get('tts')
+    if 'tts' in stages and not audio_id:
+        logger.warning("TTS returned None")
+
+    response = {
+        "translated_text": translated_text,
+        "romanized_text": results.get('romanize'),
+        "audio_url": audio_url_for(audio_id) if audio_id else None,
+        "source_lang": source_lang,
+        "target_lang": target_lang
+    }
+    if timed_out:
+        response["timed_out"] = timed_out
+    return response
+
+def send_audio_later(sid, request_id, translated_text, target_lang, voice_gender):
+    """Progressive mode: synthesize after the response has gone, then push the URL over Socket.IO"""
+    future = translate_pipeline.submit_background(
+        'tts', translated_text, {'target_lang': target_lang, 'voice_gender': voice_gender})
+
+    @copy_current_request_context
+    def deliver(future):
+        try:
+            audio_id = future.result() if future is not None else None
+        except Exception as e:
+            logger.error("Progressive TTS failed: %s", e)
+            audio_id = None
+        socketio.emit('translation_audio', {
+            'request_id': request_id,
+            'audio_url': audio_url_for(audio_id) if audio_id else None,
+        }, to=sid)
+
+    if future is None:
+        # TTS backlog full: the client still gets its event, just without audio
+        deliver(None)
+    else:
+        future.add_done_callback(deliver)
+
+# Identical /translate requests in flight at the same time are computed once
+translate_flights = SingleFlight()
+# Caps /translate work in progress; excess requests queue per client, or get 429/503 + Retry-After
+admission = AdmissionController()
+
+def client_id():
+    """Who a request counts against for fair queueing: X-Client-Id, else the caller's address"""
+    forwarded = request.headers.get('X-Forwarded-For', '')
+    return request.headers.get('X-Client-Id') or forwarded.split(',')[0].strip() or request.remote_addr
+
 @app.route('/translate', methods=['POST'])
 def translate():
     try:
         data = request.get_json()
-        print(f"INFO: Received request: {data}")
         
         if not data or 'text' not in data:
             return jsonify({"error": "No text provided"}), 400
@@ -562,60 +936,503 @@ def translate():
             
         source_lang = data.get('source_lang', 'en')
         target_lang = data.get('target_lang', 'hi')
-        tts_required = data.get('tts', False)
+        tts_required = bool(data.get('tts', False))
         speaker_gender = data.get('speaker_gender', 'female')
         voice_gender = data.get('voice_gender', 'female')
+        # Stages the client doesn't need ("skip": ["romanize"]); TTS also needs "tts": true
+        skip = set(data.get('skip') or ())
+        stages = tuple(stage for stage in OPTIONAL_STAGES
+                       if stage not in skip and (stage != 'tts' or tts_required))
+        # Progressive: answer with the text now, send the audio as a translation_audio event to socket_id
+        progressive = bool(data.get('progressive')) and 'tts' in stages and bool(data.get('socket_id'))
+        inline_stages = tuple(stage for stage in stages if not (progressive and stage == 'tts'))
+        # Optional client deadline: don't queue longer than the caller is willing to wait
+        deadline_ms = data.get('deadline_ms')
+        wait_timeout = float(deadline_ms) / 1000 if isinstance(deadline_ms, (int, float)) else None
+        client = client_id()
 
-        print(f"INFO: Processing: '{text}' | {source_lang} -> {target_lang} | TTS: {tts_required}")
-        
-        # Translate text
-        translated_text = translate_text(text, source_lang, target_lang, speaker_gender)
+        logger.debug("Processing: %d chars | %s -> %s | stages: %s", len(text), source_lang, target_lang, stages)
 
-        if not translated_text:
+        def compute():
+            with admission.slot(client, wait_timeout):
+                return translation_response(text, source_lang, target_lang, inline_stages, speaker_gender, voice_gender)
+
+        try:
+            response = translate_flights.do(
+                (text, source_lang, target_lang, speaker_gender, voice_gender, inline_stages), compute)
+        except Rejected as e:
+            # A request that shared another client's flight isn't the one over its quota
+            status = e.status if e.client == client else 503
+            ADMISSION_REJECTIONS.inc(status=status)
+            return jsonify({"error": e.reason if status == e.status else "Server at capacity"}), status, {
+                'Retry-After': str(e.retry_after)}
+
+        if response is None:
             return jsonify({"error": "Translation failed"}), 500
 
-        cleanup_memory()
+        if progressive:
+            send_audio_later(data['socket_id'], data.get('request_id'), response["translated_text"],
+                             target_lang, voice_gender)
+            response = dict(response, audio_pending=True)
 
-        # Generate romanized text for pronunciation help
-        romanized_text = None
+        logger.debug("Response ready (translated_text length: %d)", len(response["translated_text"]))
+        return jsonify(response)
+        
+    except Exception:
+        logger.exception("API error occurred")
+        return jsonify({"error": "Translation service temporarily unavailable"}), 500
+
+# Largest JSON batch we accept; bigger jobs should stream NDJSON instead
+MAX_BATCH_ITEMS = int(os.getenv('TRANSLATE_BATCH_MAX_ITEMS', '1000'))
+# NDJSON input is processed (and answered) in windows of this many lines
+BATCH_WINDOW = int(os.getenv('TRANSLATE_BATCH_WINDOW', '256'))
+
+# Fans Google requests out up to the pool's in-flight cap
+upstream_executor = ThreadPoolExecutor(max_workers=google_pool.size, thread_name_prefix='upstream')
+
+def translate_many(texts, source_lang, target_lang):
+    """Raw translations for texts sharing one language pair: cache, then Google, then one model batch
+
+    Returns a list aligned with texts holding either a string or the Exception for that text.
+    """
+    results = [translation_cache.get(text, source_lang, target_lang) for text in texts]
+    missing = [i for i, translated in enumerate(results) if translated is None]
+    if len(missing) < len(texts):
+        count_translation('cache', source_lang, target_lang, len(texts) - len(missing))
+
+    google_futures = {i: upstream_executor.submit(google_translate, texts[i], source_lang, target_lang)
+                      for i in missing}
+    local = []
+    for i, future in google_futures.items():
         try:
-            romanized_text = romanize_text(translated_text, target_lang)
+            results[i] = future.result()
+            translation_cache.put(texts[i], source_lang, target_lang, results[i])
+            count_translation('google', source_lang, target_lang)
         except Exception as e:
-            print(f"WARNING: Romanization failed: {e}")
+            results[i] = e
+            local.append(i)
 
-        # Generate TTS for target language
-        audio_url = None
-        if tts_required:
+    # Whatever Google couldn't do goes to the local model as one batch
+    if local and source_lang in lang_codes and target_lang in lang_codes:
+        logger.info("%d batch items falling back to M2M100 %s->%s", len(local), source_lang, target_lang)
+        model_futures = {i: batcher.submit(texts[i], lang_codes[source_lang], lang_codes[target_lang])
+                         for i in local}
+        for i, future in model_futures.items():
             try:
-                print(f"INFO: Generating TTS for text in {target_lang} with {voice_gender} voice")
-                audio_url = generate_tts_stream(translated_text, target_lang, voice_gender)
-                if audio_url:
-                    print(f"SUCCESS: TTS generated, URL length: {len(audio_url)}")
-                else:
-                    print(f"WARNING: TTS returned None")
+                results[i] = future.result()
+                count_translation('m2m100', source_lang, target_lang)
             except Exception as e:
-                print(f"ERROR: TTS generation failed: {e}")
-                import traceback
-                traceback.print_exc()
+                results[i] = e
+    return results
 
-        response = {
-            "translated_text": translated_text,
-            "romanized_text": romanized_text,
-            "audio_url": audio_url,
-            "source_lang": source_lang,
-            "target_lang": target_lang
-        }
-        
-        print(f"SUCCESS: Response ready (translated_text length: {len(response.get('translated_text', ''))})")
-        return jsonify(response)
-        
+def parse_batch_item(raw):
+    """Validate one batch item, filling in the same defaults /translate uses"""
+    if not isinstance(raw, dict) or not isinstance(raw.get('text'), str) or not raw['text'].strip():
+        raise ValueError("Each item needs a non-empty 'text'")
+    return {
+        'id': raw.get('id'),
+        'text': raw['text'].strip(),
+        'source_lang': raw.get('source_lang', 'en'),
+        'target_lang': raw.get('target_lang', 'hi'),
+        'speaker_gender': raw.get('speaker_gender', 'female'),
+        'tts': bool(raw.get('tts', False)),
+        'voice_gender': raw.get('voice_gender', 'female'),
+    }
+
+def process_batch(raw_items):
+    """Translate a list of raw items, returning one result dict per item in input order"""
+    results = [None] * len(raw_items)
+    unique = {}  # identical requests are computed once
+    for index, raw in enumerate(raw_items):
+        try:
+            item = parse_batch_item(raw)
+        except ValueError as e:
+            results[index] = {'id': raw.get('id') if isinstance(raw, dict) else None, 'error': str(e)}
+            continue
+        key = (item['text'], item['source_lang'], item['target_lang'], item['speaker_gender'],
+               item['tts'], item['voice_gender'])
+        unique.setdefault(key, (item, []))[1].append(index)
+
+    by_pair = {}
+    for key, (item, _) in unique.items():
+        by_pair.setdefault((item['source_lang'], item['target_lang']), set()).add(item['text'])
+
+    raw_translations = {}
+    for (source_lang, target_lang), texts in by_pair.items():
+        texts = list(texts)
+        for text, translated in zip(texts, translate_many(texts, source_lang, target_lang)):
+            raw_translations[(text, source_lang, target_lang)] = translated
+
+    adjusted = {}
+    for key, (item, _) in unique.items():
+        translated = raw_translations[(item['text'], item['source_lang'], item['target_lang'])]
+        if not isinstance(translated, Exception):
+            adjusted[key] = adjust_grammatical_gender(translated, item['target_lang'], item['speaker_gender'])
+
+    # One romanization pass per target language
+    romanized = {}
+    by_target = {}
+    for key, translated in adjusted.items():
+        by_target.setdefault(unique[key][0]['target_lang'], []).append(key)
+    with timed('romanize'):
+        for target_lang, keys in by_target.items():
+            outputs = romanizer.romanize_batch([adjusted[key] for key in keys], target_lang)
+            romanized.update(zip(keys, outputs))
+
+    # Every clip in the window is synthesized side by side on the pipeline's TTS threads
+    tts_keys = [key for key, (item, _) in unique.items() if item['tts'] and key in adjusted]
+    audio_ids, late = translate_pipeline.map('tts', [
+        (adjusted[key], {'target_lang': unique[key][0]['target_lang'], 'voice_gender': unique[key][0]['voice_gender']})
+        for key in tts_keys])
+    audio_ids = dict(zip(tts_keys, audio_ids))
+    late = {tts_keys[index] for index in late}
+
+    for key, (item, indexes) in unique.items():
+        source_lang, target_lang = item['source_lang'], item['target_lang']
+        if key not in adjusted:
+            result = {'error': "Translation failed"}
+        else:
+            translated = adjusted[key]
+            result = {
+                'translated_text': translated,
+                'romanized_text': romanized[key],
+                'audio_url': None,
+                'source_lang': source_lang,
+                'target_lang': target_lang,
+            }
+            if audio_ids.get(key):
+                result['audio_url'] = audio_url_for(audio_ids[key])
+            if key in late:
+                result['timed_out'] = ['tts']
+        for index in indexes:
+            results[index] = dict(result, id=raw_items[index].get('id'))
+    return results
+
+def ndjson_window_results(window):
+    """Output lines for one window of (item, parse error) pairs; a failing window fails only its own items"""
+    items = [item for item, error in window if error is None]
+    try:
+        results = iter(process_batch(items))
+    except Exception as e:
+        logger.exception("Batch window of %d items failed: %s", len(items), e)
+        results = iter([{'id': item.get('id') if isinstance(item, dict) else None,
+                         'error': "Translation service temporarily unavailable"} for item in items])
+    for item, error in window:
+        result = {'id': None, 'error': error} if error is not None else next(results)
+        yield json.dumps(result, ensure_ascii=False) + '\n'
+
+def iter_ndjson_results(lines):
+    """Translate NDJSON input window by window, yielding NDJSON output lines in input order"""
+    window = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            window.append((json.loads(line), None))
+        except ValueError as e:
+            window.append((None, f"Invalid JSON line: {e}"))
+        if len(window) >= BATCH_WINDOW:
+            yield from ndjson_window_results(window)
+            window = []
+    if window:
+        yield from ndjson_window_results(window)
+
+@app.route('/translate/batch', methods=['POST'])
+def translate_batch():
+    if request.mimetype == 'application/x-ndjson':
+        # Streamed in both directions, so huge jobs never sit in memory as one document
+        lines = (line.decode('utf-8') for line in request.stream)
+        return Response(stream_with_context(iter_ndjson_results(lines)), mimetype='application/x-ndjson')
+
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "No items provided"}), 400
+    if len(items) > MAX_BATCH_ITEMS:
+        return jsonify({"error": f"Too many items (max {MAX_BATCH_ITEMS}); send application/x-ndjson instead"}), 413
+
+    try:
+        return jsonify({"results": process_batch(items)})
+    except Exception as e:
+        logger.exception("Batch translation failed: %s", e)
+        return jsonify({"error": "Translation service temporarily unavailable"}), 500
+
+# Most target languages one /translate/multi request may ask for
+MAX_MULTI_TARGETS = int(os.getenv('TRANSLATE_MULTI_MAX_TARGETS', '16'))
+
+def translate_to_many(text, source_lang, target_langs):
+    """Raw translations of one text into several languages, as {lang: str or Exception}
+
+    Cache and phrasebook answer what they can. Languages the router would send to M2M100
+    anyway share one encoder pass; anything else (or everything, if that fails) goes
+    through the router, so Google keeps the pairs it ranks first on.
+    """
+    results = {}
+    for target_lang in target_langs:
+        backend = 'cache'
+        translated = translation_cache.get(text, source_lang, target_lang)
+        if translated is None and phrasebook is not None:
+            backend = 'phrasebook'
+            translated = phrasebook.lookup(text, source_lang, target_lang)
+            if translated is None:
+                backend = 'phrasebook_similar'
+                translated = phrasebook.similar(text, source_lang, target_lang)
+        if translated is not None:
+            results[target_lang] = translated
+            count_translation(backend, source_lang, target_lang)
+
+    missing = [lang for lang in target_langs if lang not in results]
+    model_langs = [lang for lang in missing
+                   if [backend.name for backend, _ in translation_router.rank(source_lang, lang)][:1] == ['m2m100']]
+    # A single target gains nothing from sharing the encoder, so it takes the router like /translate
+    if len(model_langs) > 1:
+        try:
+            outputs = batcher.submit_targets(text, lang_codes[source_lang], [lang_codes[lang] for lang in model_langs]).result()
+            for target_lang, translated in zip(model_langs, outputs):
+                results[target_lang] = translated
+                translation_cache.put(text, source_lang, target_lang, translated)
+                count_translation('m2m100', source_lang, target_lang)
+        except Exception as e:
+            logger.warning("Multi-target generate failed, translating %d targets one by one: %s", len(model_langs), e)
+
+    routed = {lang: upstream_executor.submit(translation_router.translate, text, source_lang, lang)
+              for lang in missing if lang not in results}
+    for target_lang, future in routed.items():
+        try:
+            results[target_lang], backend = future.result()
+            count_translation(backend, source_lang, target_lang)
+        except Exception as e:
+            results[target_lang] = e
+    return results
+
+@app.route('/translate/multi', methods=['POST'])
+def translate_multi():
+    """One text into several target languages, each with its own gender adjustment and romanization"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('text'), str) or not data['text'].strip():
+        return jsonify({"error": "No text provided"}), 400
+    target_langs = data.get('target_langs')
+    if not isinstance(target_langs, list) or not target_langs or not all(isinstance(lang, str) for lang in target_langs):
+        return jsonify({"error": "No target_langs provided"}), 400
+    target_langs = list(dict.fromkeys(target_langs))
+    if len(target_langs) > MAX_MULTI_TARGETS:
+        return jsonify({"error": f"Too many target languages (max {MAX_MULTI_TARGETS})"}), 413
+
+    text = data['text'].strip()
+    source_lang = data.get('source_lang', 'en')
+    tts_required = data.get('tts', False)
+    speaker_gender = data.get('speaker_gender', 'female')
+    voice_gender = data.get('voice_gender', 'female')
+
+    try:
+        raw = translate_to_many(text, source_lang, target_langs)
     except Exception as e:
-        print(f"ERROR: API error occurred")
-        cleanup_memory()
+        logger.exception("Multi-target translation failed: %s", e)
         return jsonify({"error": "Translation service temporarily unavailable"}), 500
 
+    translations = []
+    for target_lang in target_langs:
+        if isinstance(raw[target_lang], Exception):
+            translations.append({"target_lang": target_lang, "error": "Translation failed"})
+            continue
+        translated = adjust_grammatical_gender(raw[target_lang], target_lang, speaker_gender)
+        audio_url = None
+        if tts_required:
+            audio_id = generate_tts_stream(translated, target_lang, voice_gender)
+            if audio_id:
+                audio_url = audio_url_for(audio_id)
+        translations.append({
+            "target_lang": target_lang,
+            "translated_text": translated,
+            "romanized_text": romanize_text(translated, target_lang),
+            "audio_url": audio_url,
+        })
+
+    return jsonify({"source_lang": source_lang, "translations": translations})
+
+def collect_component_stats():
+    """Cache and upstream-pool counters as Prometheus samples"""
+    translation = translation_cache.stats()
+    audio = audio_cache.stats()
+    google = google_pool.stats()
+    yield ('translator_cache_hit_ratio', 'Share of cache lookups served from the cache', 'gauge', [
+        ({'cache': 'translation'}, translation['hit_ratio']),
+        ({'cache': 'audio'}, audio['hits'] / max(1, audio['hits'] + audio['misses'])),
+    ])
+    yield ('translator_cache_events_total', 'Cache hits, misses and evictions', 'counter', [
+        ({'cache': 'translation', 'event': 'hit'}, translation['hits']),
+        ({'cache': 'translation', 'event': 'disk_hit'}, translation['disk_hits']),
+        ({'cache': 'translation', 'event': 'miss'}, translation['misses']),
+        ({'cache': 'translation', 'event': 'eviction'}, translation['evictions']),
+        ({'cache': 'audio', 'event': 'hit'}, audio['hits']),
+        ({'cache': 'audio', 'event': 'miss'}, audio['misses']),
+        ({'cache': 'audio', 'event': 'eviction'}, audio['evictions']),
+    ])
+    yield ('translator_audio_cache_bytes', 'Bytes of MP3 held in the TTS disk cache', 'gauge', [({}, audio['bytes'])])
+    yield ('translator_google_in_flight', 'Google Translate requests currently in flight', 'gauge', [({}, google['in_flight'])])
+    yield ('translator_google_circuit_open', '1 while the Google Translate circuit breaker is not closed', 'gauge', [
+        ({}, 0 if google['state'] == 'closed' else 1),
+    ])
+    backend_stats = inference.stats()
+    yield ('translator_model_loaded', '1 once the translation model is in memory', 'gauge', [
+        ({'backend': backend_stats['backend']}, 1 if backend_stats['loaded'] else 0),
+    ])
+    yield ('translator_model_load_events_total', 'Model loads and idle/pressure unloads', 'counter', [
+        ({'backend': backend_stats['backend'], 'event': 'load'}, backend_stats['loads']),
+        ({'backend': backend_stats['backend'], 'event': 'unload'}, backend_stats['unloads']),
+    ])
+    memory = governor.stats()
+    yield ('translator_process_rss_bytes', 'Resident set size at the last memory governor check', 'gauge', [
+        ({}, memory['rss_bytes']),
+    ])
+    yield ('translator_memory_watermark_bytes', 'RSS levels at which the memory governor collects (soft) or sheds (hard)', 'gauge', [
+        ({'level': 'soft'}, memory['soft_limit_bytes']),
+        ({'level': 'hard'}, memory['hard_limit_bytes']),
+    ])
+    yield ('translator_model_idle_seconds', 'Seconds since the in-process model was last used', 'gauge', [
+        ({}, memory['model_idle_seconds']),
+    ])
+    if memory['allocator']:
+        yield ('translator_cuda_memory_bytes', 'CUDA caching allocator memory', 'gauge', [
+            ({'kind': kind}, value) for kind, value in memory['allocator'].items()
+        ])
+    yield ('translator_translation_cache_bytes', 'Approximate bytes held by the in-memory translation cache', 'gauge', [
+        ({}, translation['memory_bytes']),
+    ])
+    yield ('translator_audio_buffer_bytes', 'MP3 bytes buffered in memory by streaming TTS', 'gauge', [
+        ({}, audio_buffers.used),
+    ])
+    yield ('translator_audio_buffer_refusals_total', 'Streamed clips not cached because the audio buffer budget was spent', 'counter', [
+        ({}, audio_buffers.refused),
+    ])
+    if backend_stats['tokens_per_sec'] is not None:
+        yield ('translator_model_tokens_per_second', 'Generated tokens per second of model.generate time', 'gauge', [
+            ({'backend': backend_stats['backend']}, backend_stats['tokens_per_sec']),
+        ])
+    yield ('translator_google_events_total', 'Google Translate pool events', 'counter', [
+        ({'event': event}, google[event]) for event in ('requests', 'failures', 'retries', 'short_circuited')
+    ])
+    live = live_translator.stats()
+    yield ('translator_live_sessions', 'Open translate-as-you-type sessions', 'gauge', [({}, live['sessions'])])
+    yield ('translator_live_events_total', 'Translate-as-you-type sentence and revision events', 'counter', [
+        ({'event': event}, live[event]) for event in ('sentences_translated', 'sentences_reused', 'revisions_cancelled')
+    ])
+    chat = chat_fanout.stats()
+    yield ('translator_chat_rooms', 'Chat rooms with at least one member', 'gauge', [({}, chat['rooms'])])
+    yield ('translator_chat_events_total', 'Chat fan-out events', 'counter', [
+        ({'event': event}, chat[event]) for event in ('translations', 'shared', 'deliveries', 'forwarded')
+    ])
+    if cluster is not None:
+        nodes = cluster.stats()
+        yield ('translator_cluster_nodes', 'Live nodes sharing chat rooms, as seen by this node', 'gauge', [
+            ({'node': nodes['node']}, nodes['nodes']),
+        ])
+        yield ('translator_cluster_jobs_total', 'Chat translations handed to (sent), taken from (received) or not taken by (unrouted) other nodes', 'counter', [
+            ({'direction': 'sent'}, nodes['sent']),
+            ({'direction': 'unrouted'}, nodes['unrouted']),
+            ({'direction': 'received'}, nodes['received']),
+        ])
+    admitted = admission.stats()
+    yield ('translator_admission_in_flight', '/translate requests running', 'gauge', [({}, admitted['in_flight'])])
+    yield ('translator_admission_queued', '/translate requests waiting for a slot', 'gauge', [({}, admitted['queued'])])
+    yield ('translator_admission_events_total', '/translate admission decisions', 'counter', [
+        ({'event': event}, admitted[event]) for event in ('admitted', 'rejected_full', 'rejected_client', 'timed_out')
+    ])
+    flights = translate_flights.stats()
+    yield ('translator_singleflight_total', '/translate requests that computed (leader) or shared (follower) a result', 'counter', [
+        ({'role': 'leader'}, flights['leaders']),
+        ({'role': 'follower'}, flights['followers']),
+    ])
+    if phrasebook is not None:
+        phrases = phrasebook.stats()
+        yield ('translator_phrasebook_lookups_total', 'Phrasebook lookups by outcome', 'counter', [
+            ({'outcome': 'exact'}, phrases['exact_hits']),
+            ({'outcome': 'similar'}, phrases['similar_hits']),
+            ({'outcome': 'fuzzy'}, phrases['fuzzy_hits']),
+            ({'outcome': 'miss'}, phrases['misses']),
+        ])
+
+REGISTRY.register_collector(collect_component_stats)
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+# Readiness also wants the translation upstream reachable; probed at most every UPSTREAM_CHECK_TTL s
+READY_REQUIRE_UPSTREAM = os.getenv('READY_REQUIRE_UPSTREAM', '1') == '1'
+UPSTREAM_HOST = os.getenv('GOOGLE_TRANSLATE_HOST', 'translate.googleapis.com')
+UPSTREAM_CHECK_TTL = float(os.getenv('UPSTREAM_CHECK_TTL', '30'))
+upstream_check = {'checked_at': None, 'reachable': False}
+
+def google_reachable():
+    if google_pool.breaker.state == 'open':
+        return False
+    now = time.monotonic()
+    if upstream_check['checked_at'] is None or now - upstream_check['checked_at'] > UPSTREAM_CHECK_TTL:
+        try:
+            socket.create_connection((UPSTREAM_HOST, 443), timeout=1).close()
+            upstream_check['reachable'] = True
+        except OSError:
+            upstream_check['reachable'] = False
+        upstream_check['checked_at'] = now
+    return upstream_check['reachable']
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({"status": "ok"})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: model warmed, translation upstream reachable; 'loaded' is false after an idle unload
+
+    With PRELOAD_MODEL=0 nothing warms the model up, so it counts as ready
+    and the first model request loads it.
+    """
+    model_ready = warmup['ready_at'] is not None or (
+        warmup['started_at'] is None and (inference.loaded or not PRELOAD_MODEL))
+    upstream_ok = google_reachable()
+    ready = model_ready and (upstream_ok or not READY_REQUIRE_UPSTREAM)
+    body = {
+        "ready": ready,
+        # An unloaded model still serves (the next generate reloads it), just with one slow request
+        "model": {"ready": model_ready, "loaded": worker_pool is not None or inference.loaded,
+                  "preload": PRELOAD_MODEL, "backend": inference.name, "error": warmup['error']},
+        "google": {"reachable": upstream_ok, "circuit": google_pool.breaker.state},
+    }
+    return jsonify(body), 200 if ready else 503
+
+@app.route('/model/stats', methods=['GET'])
+def model_stats():
+    stats = inference.stats()
+    if worker_pool is not None:
+        stats['workers'] = worker_pool.workers
+        stats['workers_ready'] = worker_pool.ready_workers
+        stats['worker_restarts'] = worker_pool.restarts
+        stats['threads_per_worker'] = worker_pool.threads_per_worker
+    stats['memory'] = governor.stats()
+    return jsonify(stats)
+
+# Under a WSGI server the module is imported, not run, so warm up on import
+if __name__ != '__main__':
+    start_workers()
+    governor.start()
+    if cluster is not None:
+        cluster.start()
+    if PRELOAD_MODEL or worker_pool is not None:
+        start_warmup()
+
 if __name__ == '__main__':
-    print("Flask-SocketIO server starting on http://localhost:5000")
+    # debug=True re-runs this file in a reloader child; only that process serves, so only it warms up
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_workers()
+        governor.start()
+        if cluster is not None:
+            cluster.start()
+        if PRELOAD_MODEL or worker_pool is not None:
+            start_warmup()
+    logger.info("Flask-SocketIO server starting on http://localhost:5000")
     socketio.run(app, debug=True, host='0.0.0.0', port=5000)
 
 
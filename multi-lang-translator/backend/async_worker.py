@@ -0,0 +1,93 @@
+import asyncio
+import os
+import queue
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+
+
+# How many async jobs (e.g. Edge TTS sessions) may run at once, and how long each may take
+MAX_CONCURRENCY = int(os.getenv('TTS_MAX_CONCURRENCY', '16'))
+JOB_TIMEOUT = float(os.getenv('TTS_TIMEOUT', '30'))
+
+
+class AsyncWorker:
+    """One long-lived asyncio loop in a background thread, fed from any request thread"""
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, timeout=JOB_TIMEOUT, name='async-worker'):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.timeout = timeout
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(self._loop)
+                self._loop.call_soon(ready.set)
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    async def _guarded(self, coro, timeout):
+        # Created on the loop thread so it binds to the right loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def limited():
+            try:
+                async with self._semaphore:
+                    return await coro
+            finally:
+                coro.close()  # no-op once it ran; avoids a never-awaited warning if the wait timed out
+
+        # The deadline covers waiting for a slot as well as the job itself
+        return await asyncio.wait_for(limited(), timeout)
+
+    def submit(self, coro, timeout=None):
+        """Schedule a coroutine on the worker loop; returns a concurrent.futures.Future"""
+        self.start()
+        timeout = self.timeout if timeout is None else timeout
+        return asyncio.run_coroutine_threadsafe(self._guarded(coro, timeout), self._loop)
+
+    def run(self, coro, timeout=None):
+        """Submit and block the calling thread until the result is ready, or the timeout passes"""
+        timeout = self.timeout if timeout is None else timeout
+        future = self.submit(coro, timeout)
+        try:
+            # A little slack so the loop's own TimeoutError normally wins; this covers a wedged loop
+            return future.result(timeout=timeout + 1)
+        except FutureTimeout:
+            future.cancel()
+            raise
+
+    def stream(self, agen, timeout=None, item_timeout=None):
+        """Drive an async generator on the loop and yield its items in the calling thread"""
+        items = queue.Queue()
+        done = object()
+
+        async def pump():
+            async for item in agen:
+                items.put(item)
+
+        future = self.submit(pump(), timeout)
+        future.add_done_callback(lambda _: items.put(done))
+        try:
+            while True:
+                item = items.get(timeout=item_timeout)
+                if item is done:
+                    future.result()  # re-raise errors and timeouts from the loop
+                    return
+                yield item
+        finally:
+            # Consumer stopped early (client went away, or an error): end the session too
+            future.cancel()
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+AUDIO_DIR = os.getenv('TTS_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'audio'))
+AUDIO_MAX_BYTES = int(os.getenv('TTS_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+
+# Edge clips are bare digests; any other engine's clips carry its name, e.g. 'gtts-<digest>'
+_KEY_RE = re.compile(r'^(?:[a-z]+-)?[0-9a-f]{40}$')
+
+
+def audio_key(text, voice, speed, engine='edge'):
+    """Content address for one clip from one engine; voice is whatever picks the sound (voice name, lang)"""
+    digest = hashlib.sha1(f"{engine}\x00{voice}\x00{speed}\x00{text}".encode('utf-8')).hexdigest()
+    return digest if engine == 'edge' else f"{engine}-{digest}"
+
+
+def is_fallback_key(key):
+    """True for clips a fallback engine made; Edge may produce a better clip for the same text later"""
+    return '-' in key
+
+
+class AudioCache:
+    """Size-bounded directory of MP3 files named by their audio_key, evicted LRU"""
+
+    def __init__(self, directory=AUDIO_DIR, max_bytes=AUDIO_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+        # Rebuild LRU order from last access times left by a previous run
+        files = []
+        for name in os.listdir(directory):
+            key, ext = os.path.splitext(name)
+            if ext == '.mp3' and _KEY_RE.match(key):
+                stat = os.stat(os.path.join(directory, name))
+                files.append((stat.st_mtime, key, stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self.total_bytes += size
+
+    def path_for(self, key):
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def get(self, key):
+        """Return the file path for a cached clip (marking it recently used) or None"""
+        if not _KEY_RE.match(key):
+            return None
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._forget(key)
+            return None
+        return path
+
+    def put(self, key, audio_data):
+        """Store clip bytes under key and evict old clips past the size limit; empty clips are ignored"""
+        if not audio_data:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(audio_data)
+        os.replace(tmp_path, self.path_for(key))
+
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = len(audio_data)
+            self.total_bytes += len(audio_data)
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, _ = next(iter(self._entries.items()))
+                self._forget(old_key)
+                self.evictions += 1
+                try:
+                    os.remove(self.path_for(old_key))
+                except OSError:
+                    pass
+        return self.path_for(key)
+
+    def _forget(self, key):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self.total_bytes -= size
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+            }
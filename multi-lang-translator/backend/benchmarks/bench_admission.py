@@ -0,0 +1,136 @@
+"""Traffic spike against /translate's request path: unbounded vs single-flight + admission control.
+
+Simulates a burst from many clients, a share of them sending the same popular
+phrase, against a backend that slows down as concurrent work piles up (the
+memory thrash the admission limit exists to prevent). Each request has a
+client deadline; an answer after it is as good as a timeout. Reports
+answered-in-time goodput, latency of answered requests, rejections by status
+and how evenly the answered requests are spread over clients.
+Run from the backend directory:  python benchmarks/bench_admission.py
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from admission import AdmissionController, Rejected, SingleFlight  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class ThrashingBackend:
+    """Work whose latency grows with the square of concurrency past a knee"""
+
+    def __init__(self, base, knee):
+        self.base = base
+        self.knee = knee
+        self.running = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text):
+        with self._lock:
+            self.running += 1
+            self.calls += 1
+            load = self.running
+        try:
+            time.sleep(self.base * max(1.0, load / self.knee) ** 2)
+            return f"[hi] {text}"
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def build_requests(count, clients, popular_ratio, seed):
+    rng = random.Random(seed)
+    # A few heavy clients send most of the traffic, as in a real spike
+    weights = [1 / (i + 1) for i in range(clients)]
+    requests = []
+    for i in range(count):
+        text = "Happy new year!" if rng.random() < popular_ratio else f"Sentence number {i}"
+        requests.append((f'client-{rng.choices(range(clients), weights)[0]}', text))
+    return requests
+
+
+def run(requests, handler, deadline, concurrency):
+    outcomes = {}
+    latencies = []
+    per_client = {}
+    lock = threading.Lock()
+
+    def one(request):
+        client, text = request
+        start = time.perf_counter()
+        try:
+            handler(client, text)
+            elapsed = time.perf_counter() - start
+            outcome = 'ok' if elapsed <= deadline else 'late'
+        except Rejected as e:
+            elapsed, outcome = time.perf_counter() - start, str(e.status)
+        with lock:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if outcome == 'ok':
+                latencies.append(elapsed)
+                per_client[client] = per_client.get(client, 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, requests))
+    return time.perf_counter() - start, outcomes, latencies, per_client
+
+
+def report(label, elapsed, outcomes, latencies, per_client, clients, calls):
+    served = [per_client.get(f'client-{i}', 0) for i in range(clients)]
+    print(f"{label:>12}: {outcomes.get('ok', 0) / elapsed:7.1f} ok/s  p50 {percentile(latencies, 50) * 1000:7.1f}ms  "
+          f"p95 {percentile(latencies, 95) * 1000:7.1f}ms  backend calls {calls:5d}  "
+          f"clients served {sum(1 for n in served if n)}/{clients} (stdev {statistics.pstdev(served):.1f})  "
+          f"outcomes {dict(sorted(outcomes.items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=1500)
+    parser.add_argument('--clients', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=200, help="request threads (the spike)")
+    parser.add_argument('--popular-ratio', type=float, default=0.3)
+    parser.add_argument('--latency', type=float, default=0.05, help="backend seconds per call when not overloaded")
+    parser.add_argument('--knee', type=int, default=16, help="concurrent calls before the backend slows down")
+    parser.add_argument('--deadline', type=float, default=2.0, help="client deadline in seconds")
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    requests = build_requests(args.requests, args.clients, args.popular_ratio, args.seed)
+
+    backend = ThrashingBackend(args.latency, args.knee)
+    result = run(requests, lambda client, text: backend.translate(text), args.deadline, args.concurrency)
+    report('unbounded', *result, args.clients, backend.calls)
+
+    backend = ThrashingBackend(args.latency, args.knee)
+    flights = SingleFlight()
+    admission = AdmissionController(max_in_flight=args.knee, max_queued=args.knee * 8,
+                                    max_queued_per_client=args.knee, queue_timeout=args.deadline)
+
+    def admitted(client, text):
+        def compute():
+            with admission.slot(client):
+                return backend.translate(text)
+        return flights.do(text, compute)
+
+    result = run(requests, admitted, args.deadline, args.concurrency)
+    report('admission', *result, args.clients, backend.calls)
+    print(f"admission: {admission.stats()}  single-flight: {flights.stats()}")
+
+
+if __name__ == '__main__':
+    main()
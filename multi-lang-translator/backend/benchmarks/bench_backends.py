@@ -0,0 +1,89 @@
+"""Compare the M2M100 inference backends: load time, memory, speed and output parity.
+
+Each backend runs in its own subprocess so RSS numbers don't overlap.
+Output parity is measured against the fp32 torch backend on a fixed
+sentence set (exact-match rate and mean character similarity).
+Run from the backend directory:  python benchmarks/bench_backends.py
+"""
+import argparse
+import difflib
+import json
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+PARITY_SENTENCES = [
+    ("en", "hi", "Hello, how are you today?"),
+    ("en", "hi", "I am learning to play the guitar with my friend."),
+    ("en", "bn", "Where is the nearest railway station?"),
+    ("en", "ur", "Thank you very much for your help."),
+    ("en", "fr", "The weather is very pleasant this evening."),
+    ("en", "de", "Can you teach me how to cook rice?"),
+    ("en", "ja", "We will meet again tomorrow morning."),
+    ("hi", "en", "मैं हर दिन किताब पढ़ता हूँ।"),
+    ("es", "en", "¿Dónde está la biblioteca?"),
+    ("en", "ta", "This book is about the history of music."),
+]
+
+
+def run_backend(name, repeats):
+    """Child process: load one backend, translate the parity set, print a JSON report"""
+    from inference_backends import create_backend
+
+    backend = create_backend(name)
+    backend.load()
+    outputs = [backend.generate([text], src, tgt)[0] for src, tgt, text in PARITY_SENTENCES]
+
+    # Throughput on a warm model, grouped the way the batcher would send it
+    backend.generated_tokens = 0
+    backend.generate_seconds = 0.0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for src, tgt, text in PARITY_SENTENCES:
+            backend.generate([text], src, tgt)
+    elapsed = time.perf_counter() - start
+
+    report = backend.stats()
+    report.update({'outputs': outputs, 'sentences_per_sec': repeats * len(PARITY_SENTENCES) / elapsed})
+    print(json.dumps(report, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--backends', default='torch,torch-int8,onnx')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_backend(args.child, args.repeats)
+        return
+
+    reports = {}
+    for name in args.backends.split(','):
+        proc = subprocess.run([sys.executable, __file__, '--child', name, '--repeats', str(args.repeats)],
+                              capture_output=True, text=True, cwd=BACKEND_DIR)
+        if proc.returncode != 0:
+            print(f"{name}: failed\n{proc.stderr.strip().splitlines()[-1] if proc.stderr else ''}")
+            continue
+        reports[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    baseline = reports.get('torch')
+    print(f"{'backend':>11} {'load s':>7} {'load MB':>8} {'RSS MB':>7} {'tok/s':>7} {'sent/s':>7} {'exact':>6} {'similar':>8}")
+    for name, report in reports.items():
+        exact = similar = float('nan')
+        if baseline:
+            pairs = list(zip(baseline['outputs'], report['outputs']))
+            exact = sum(a == b for a, b in pairs) / len(pairs)
+            similar = sum(difflib.SequenceMatcher(None, a, b).ratio() for a, b in pairs) / len(pairs)
+        print(f"{name:>11} {report['load_seconds']:>7.1f} {report['load_rss_bytes'] / 1e6:>8.0f} "
+              f"{report['rss_bytes'] / 1e6:>7.0f} {report['tokens_per_sec']:>7.1f} "
+              f"{report['sentences_per_sec']:>7.2f} {exact:>6.0%} {similar:>8.1%}")
+
+
+if __name__ == '__main__':
+    main()
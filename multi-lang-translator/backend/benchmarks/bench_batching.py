@@ -0,0 +1,66 @@
+"""Compare requests/sec of batched vs one-at-a-time M2M100 translation.
+
+Run from the backend directory:  python benchmarks/bench_batching.py
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from model_batcher import TranslationBatcher  # noqa: E402
+
+SENTENCES = [
+    "Hello, how are you today?",
+    "I am learning to play the guitar.",
+    "Where is the nearest railway station?",
+    "Thank you very much for your help.",
+    "The weather is very pleasant this evening.",
+    "Can you teach me how to cook rice?",
+    "We will meet again tomorrow morning.",
+    "This book is about the history of music.",
+]
+
+
+def run(translate_one, concurrency, requests):
+    texts = [SENTENCES[i % len(SENTENCES)] for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(translate_one, texts))
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=64)
+    parser.add_argument('--source', default='en')
+    parser.add_argument('--target', default='hi')
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=8)
+    args = parser.parse_args()
+
+    app.load_translation_model()
+    batcher = TranslationBatcher(app.generate_batch, args.max_batch_size, args.max_wait_ms)
+
+    def sequential(text):
+        return app.generate_batch([text], args.source, args.target)[0]
+
+    def batched(text):
+        return batcher.translate(text, args.source, args.target)
+
+    # Warm up both paths so the first measured run doesn't pay for lazy setup
+    sequential(SENTENCES[0])
+    batched(SENTENCES[0])
+
+    print(f"{'callers':>8} {'sequential req/s':>18} {'batched req/s':>15} {'speedup':>8}")
+    for concurrency in (1, 8, 32):
+        seq_rps = run(sequential, concurrency, args.requests)
+        bat_rps = run(batched, concurrency, args.requests)
+        print(f"{concurrency:>8} {seq_rps:>18.2f} {bat_rps:>15.2f} {bat_rps / seq_rps:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Load-test chat fan-out: hundreds of rooms with mixed-language members.
+
+Compares the old pattern (the socket handler translates inline, one language
+after another, on a handful of handler threads) against ChatFanout, which
+translates each message once per distinct language in the background and
+shares identical (message, language) work across rooms. Latency is measured
+from send to the moment each language channel receives its copy.
+Run from the backend directory:  python benchmarks/bench_chat_fanout.py
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_upstreams import FakeGoogleTranslator, FakeUpstream  # noqa: E402
+from chat_fanout import ChatFanout, RoomMembers  # noqa: E402
+
+LANGUAGES = ['en', 'hi', 'bn', 'es', 'fr', 'ta', 'ur', 'de']
+# Greetings and short replies recur across rooms, which is what sharing pays off on
+COMMON_MESSAGES = ["Hello everyone!", "Thank you", "Good morning", "Can you repeat that?", "See you tomorrow"]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def build_rooms(rooms, members_per_room, seed):
+    rng = random.Random(seed)
+    members = RoomMembers()
+    for room in range(rooms):
+        for member in range(members_per_room):
+            members.join(f'room-{room}', f'sid-{room}-{member}', rng.choice(LANGUAGES))
+    return members
+
+
+def build_messages(rooms, messages, common_ratio, seed):
+    rng = random.Random(seed + 1)
+    out = []
+    for i in range(messages):
+        text = rng.choice(COMMON_MESSAGES) if rng.random() < common_ratio else f"Message number {i} about the lesson"
+        out.append((f'room-{rng.randrange(rooms)}', text, rng.choice(LANGUAGES)))
+    return out
+
+
+class Deliveries:
+    """emit() stand-in recording the latency of every delivery"""
+
+    def __init__(self):
+        self.latencies = []
+        self.sent_at = {}
+        self._lock = threading.Lock()
+
+    def emit(self, event, data, to=None):
+        latency = time.perf_counter() - self.sent_at[data['id']]
+        with self._lock:
+            self.latencies.append(latency)
+
+
+def run_inline(members, messages, translator, handler_threads, rate):
+    """The pre-fan-out handler: translate for every language in turn, then emit"""
+    deliveries = Deliveries()
+
+    def handle(index, room, text, source_lang):
+        for lang in members.languages(room):
+            if lang != source_lang:
+                translator.translate(text, src=source_lang, dest=lang)
+            deliveries.emit('receive_message', {'id': index}, to=room)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=handler_threads) as handlers:
+        for index, (room, text, source_lang) in enumerate(messages):
+            deliveries.sent_at[index] = time.perf_counter()
+            handlers.submit(handle, index, room, text, source_lang)
+            time.sleep(1.0 / rate)
+    return deliveries, time.perf_counter() - start, translator.upstream.calls
+
+
+def run_fanout(members, messages, translator, workers, rate):
+    deliveries = Deliveries()
+    fanout = ChatFanout(
+        lambda text, source_lang, target_lang: translator.translate(text, src=source_lang, dest=target_lang).text,
+        deliveries.emit, members, workers=workers)
+
+    start = time.perf_counter()
+    for index, (room, text, source_lang) in enumerate(messages):
+        deliveries.sent_at[index] = time.perf_counter()
+        fanout.publish(room, text, source_lang, {'id': index})
+        time.sleep(1.0 / rate)
+    fanout._executor.shutdown(wait=True)
+    return deliveries, time.perf_counter() - start, fanout.stats()['translations']
+
+
+def report(name, deliveries, elapsed, translations):
+    latencies = deliveries.latencies
+    print(f"{name:>7} {len(latencies):>10} {translations:>12} {len(latencies) / elapsed:>10.1f} "
+          f"{percentile(latencies, 50) * 1000:>8.0f} {percentile(latencies, 95) * 1000:>8.0f} "
+          f"{percentile(latencies, 99) * 1000:>8.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rooms', type=int, default=300)
+    parser.add_argument('--members', type=int, default=6, help='members per room')
+    parser.add_argument('--messages', type=int, default=1500)
+    parser.add_argument('--rate', type=float, default=50, help='messages sent per second')
+    parser.add_argument('--common-ratio', type=float, default=0.4)
+    parser.add_argument('--latency', type=float, default=0.08, help='fake upstream latency (s)')
+    parser.add_argument('--handler-threads', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    members = build_rooms(args.rooms, args.members, args.seed)
+    messages = build_messages(args.rooms, args.messages, args.common_ratio, args.seed)
+    print(f"{args.rooms} rooms x {args.members} members, {args.messages} messages at {args.rate:.0f}/s, "
+          f"upstream {args.latency * 1000:.0f}ms")
+    print(f"{'mode':>7} {'deliveries':>10} {'translations':>12} {'deliv/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+
+    upstream = FakeUpstream(latency=args.latency, jitter=args.latency / 4, seed=args.seed)
+    report('inline', *run_inline(members, messages, FakeGoogleTranslator(upstream), args.handler_threads, args.rate))
+
+    upstream = FakeUpstream(latency=args.latency, jitter=args.latency / 4, seed=args.seed)
+    report('fanout', *run_fanout(members, messages, FakeGoogleTranslator(upstream), args.workers, args.rate))
+
+
+if __name__ == '__main__':
+    main()
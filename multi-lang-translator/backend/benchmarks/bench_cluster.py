@@ -0,0 +1,130 @@
+"""Chat throughput as Socket.IO nodes are added: rooms and fan-out shared through the cluster store.
+
+Starts a LocalBroker (the in-memory stand-in for Redis) and, for each count in
+--workers, that many node processes. Each node runs the app's real
+SharedRoomMembers, Cluster and ChatFanout; its model is a lock around a
+--latency sleep, since one node serves one batch at a time. Emits go back
+through the broker, the way the Socket.IO message queue relays them. Members
+reading --languages languages join each room, messages arrive spread over
+the nodes, and every language pair is translated on the node that owns it.
+Reports deliveries per second and send-to-delivery latency per node count.
+Run from the backend directory:  python benchmarks/bench_cluster.py
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from chat_fanout import ChatFanout  # noqa: E402
+from cluster import Cluster, LocalBroker, LocalStore, SharedRoomMembers  # noqa: E402
+
+LANGUAGES = ['en', 'hi', 'bn', 'ta', 'te', 'ur', 'es', 'fr', 'de', 'ja', 'ko', 'zh', 'ar', 'ru', 'pt', 'it']
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def node_main(args):
+    store = LocalStore(args.url)
+    model = threading.Lock()
+
+    def translate(message, source_lang, target_lang):
+        with model:
+            time.sleep(args.latency)
+        return f"<{target_lang}> {message}"
+
+    def emit(event, data, to=None):
+        store.publish('bench:deliveries', json.dumps([to, data['sent']]))
+
+    cluster = Cluster(store, node_id=args.node, heartbeat=0.2, ttl=5)
+    fanout = ChatFanout(translate, emit, SharedRoomMembers(store, cluster), cluster=cluster)
+    inbox = store.listen([f'bench:send:{args.node}'])
+    cluster.start()
+    store.publish('bench:ready', args.node.encode())
+    for _, data in inbox:
+        room, message, source_lang, sent = json.loads(data)
+        fanout.publish(room, message, source_lang, {'message': message, 'sent': sent})
+
+
+def run(workers, args):
+    broker = LocalBroker().start()
+    store = LocalStore(broker.url)
+    # Members are recorded as node-0's sockets, so they count as long as node-0 heartbeats
+    members = SharedRoomMembers(store, Cluster(store, node_id='node-0'))
+    languages = LANGUAGES[:args.languages]
+    for r in range(args.rooms):
+        for i, lang in enumerate(languages):
+            members.join(f'room-{r}', f'sid-{r}-{i}', lang)
+
+    ready = store.listen(['bench:ready'])
+    deliveries = store.listen(['bench:deliveries'])
+    nodes = [f'node-{i}' for i in range(workers)]
+    procs = [subprocess.Popen([sys.executable, os.path.abspath(__file__), '--node', node, '--url', broker.url,
+                               '--latency', str(args.latency)]) for node in nodes]
+    try:
+        for _ in nodes:
+            next(ready)
+        time.sleep(1.0)  # a few heartbeats, so every node sees all the others
+
+        rng = random.Random(args.seed)
+        expected = args.messages * len(languages)
+        start = time.perf_counter()
+        for m in range(args.messages):
+            room, source_lang = f'room-{m % args.rooms}', rng.choice(languages)
+            store.publish(f'bench:send:{nodes[m % workers]}',
+                          json.dumps([room, f"Message {m} from the benchmark", source_lang, time.time()]))
+        latencies = []
+        for _, data in deliveries:
+            _, sent = json.loads(data)
+            latencies.append(time.time() - sent)
+            if len(latencies) == expected:
+                break
+        elapsed = time.perf_counter() - start
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait()
+        broker.close()
+    return elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', default='1,2,4', help="comma-separated node counts")
+    parser.add_argument('--messages', type=int, default=60)
+    parser.add_argument('--rooms', type=int, default=4)
+    parser.add_argument('--languages', type=int, default=12, help="languages read in every room")
+    parser.add_argument('--latency', type=float, default=0.01, help="model seconds per translation")
+    parser.add_argument('--seed', type=int, default=11)
+    parser.add_argument('--node', help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.node:
+        node_main(args)
+        return
+
+    baseline = None
+    for workers in [int(count) for count in args.workers.split(',')]:
+        elapsed, latencies = run(workers, args)
+        rate = len(latencies) / elapsed
+        baseline = baseline or rate
+        print(f"{workers:2d} node(s): {rate:7.1f} deliveries/s ({rate / baseline:.1f}x)  "
+              f"p50 {percentile(latencies, 50) * 1000:7.1f}ms  p95 {percentile(latencies, 95) * 1000:7.1f}ms  "
+              f"deliveries {len(latencies)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,385 @@
+"""End-to-end benchmark: the real Flask/Socket.IO app against offline fake upstreams.
+
+Each scenario runs in a fresh interpreter that installs the stand-ins from
+fake_upstreams (googletrans, edge_tts, gTTS and, with --model fake, the
+model), imports app, and drives it with --concurrency threads through
+Flask's test client and Flask-SocketIO's test client. Routing, handlers,
+caches, the router, the batcher and the TTS code all run for real; only the
+network and the 2GB model do not. --model tiny-random runs a random-weight
+two-layer M2M100 instead (needs torch, transformers and the tokenizer files).
+
+Scenarios:
+  translate      POST /translate, text only
+  translate_tts  POST /translate with tts=true (Edge TTS, gTTS on failure)
+  batch          POST /translate/batch, --batch-size items per request
+  multi          POST /translate/multi, --targets languages per request
+  chat           send_message into rooms of mixed-language members; latency is
+                 from send to each language channel's delivery
+
+The report is one JSON document: throughput, p50/p95/p99 latency, status
+counts, time per pipeline stage (from translator_stage_seconds) and peak RSS
+for each scenario. All randomness is seeded and every run starts from empty
+caches in a temp directory, so runs of two builds are comparable; with
+--baseline the run exits 1 if any scenario regressed by more than --tolerance.
+Run from the backend directory:  python benchmarks/bench_e2e.py --output report.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SCENARIOS = ('translate', 'translate_tts', 'batch', 'multi', 'chat')
+TARGETS = ['hi', 'bn', 'ta', 'ur', 'es', 'fr', 'de', 'ja']
+WORDS = ('the a my our teacher student lesson book water market friend family today tomorrow good very '
+         'slowly go come read write explain practice where when why how is are was will please').split()
+GENDERS = ('female', 'male')
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def peak_rss_bytes():
+    """High-water resident set size of this process"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak if peak > 1 << 32 else peak * 1024
+
+
+def build_sentences(count, unique_ratio, rng):
+    """count sentences drawn Zipf-like from count * unique_ratio distinct ones, like real traffic"""
+    distinct = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 14))).capitalize() + '.'
+                for _ in range(max(1, int(count * unique_ratio)))]
+    weights = [1 / (rank + 1) for rank in range(len(distinct))]
+    return rng.choices(distinct, weights=weights, k=count)
+
+
+def summarize(latencies, elapsed, outcomes):
+    return {
+        'requests': len(latencies),
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 2),
+            'p95': round(percentile(latencies, 95) * 1000, 2),
+            'p99': round(percentile(latencies, 99) * 1000, 2),
+            'max': round(max(latencies, default=0.0) * 1000, 2),
+        },
+        'outcomes': outcomes,
+    }
+
+
+def run_load(one, items, concurrency):
+    """one(item) -> outcome label, called from concurrency threads; returns the summary"""
+    latencies = []
+    outcomes = {}
+    lock = threading.Lock()
+
+    def timed_one(item):
+        start = time.perf_counter()
+        try:
+            outcome = str(one(item))
+        except Exception as e:
+            outcome = type(e).__name__
+        latency = time.perf_counter() - start
+        with lock:
+            latencies.append(latency)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed_one, items))
+    return summarize(latencies, time.perf_counter() - start, outcomes)
+
+
+def http_client(server, local):
+    """One Flask test client per load thread"""
+    if not hasattr(local, 'client'):
+        local.client = server.app.test_client()
+    return local.client
+
+
+def translate_payload(text, rng, tts):
+    return {'text': text, 'source_lang': 'en', 'target_lang': rng.choice(TARGETS), 'tts': tts,
+            'speaker_gender': rng.choice(GENDERS), 'voice_gender': rng.choice(GENDERS)}
+
+
+def scenario_translate(server, args, tts=False):
+    rng = random.Random(args.seed)
+    payloads = [translate_payload(text, rng, tts) for text in build_sentences(args.requests, args.unique_ratio, rng)]
+    local = threading.local()
+    return run_load(lambda payload: http_client(server, local).post('/translate', json=payload).status_code,
+                    payloads, args.concurrency)
+
+
+def scenario_batch(server, args):
+    rng = random.Random(args.seed)
+    texts = build_sentences(args.requests * args.batch_size, args.unique_ratio, rng)
+    batches = [{'items': [dict(translate_payload(text, rng, False), id=i)
+                          for i, text in enumerate(texts[start:start + args.batch_size])]}
+               for start in range(0, len(texts), args.batch_size)]
+    local = threading.local()
+    result = run_load(lambda batch: http_client(server, local).post('/translate/batch', json=batch).status_code,
+                      batches, args.concurrency)
+    result['items_per_sec'] = round(len(texts) / result['seconds'], 2) if result['seconds'] else 0.0
+    return result
+
+
+def scenario_multi(server, args):
+    rng = random.Random(args.seed)
+    payloads = [{'text': text, 'source_lang': 'en', 'target_langs': rng.sample(TARGETS, min(args.targets, len(TARGETS))),
+                 'speaker_gender': rng.choice(GENDERS)}
+                for text in build_sentences(args.requests, args.unique_ratio, rng)]
+    local = threading.local()
+    return run_load(lambda payload: http_client(server, local).post('/translate/multi', json=payload).status_code,
+                    payloads, args.concurrency)
+
+
+def scenario_chat(server, args):
+    rng = random.Random(args.seed)
+    members = []
+    for room in range(args.rooms):
+        for member in range(args.members):
+            client = server.socketio.test_client(server.app)
+            lang = rng.choice(['en'] + TARGETS)
+            client.emit('join_room', {'room': f'room-{room}', 'username': f'user-{room}-{member}', 'lang': lang})
+            members.append((f'room-{room}', f'user-{room}-{member}', lang, client, threading.Lock()))
+
+    # Deliveries are timed where the app hands them to Socket.IO, one per language channel
+    sent_at = {}
+    delivered = []
+    lock = threading.Lock()
+    emit = server.chat_fanout.emit
+
+    def recording_emit(event, data, to=None):
+        emit(event, data, to=to)
+        if event == 'receive_message' and data.get('timestamp') in sent_at:
+            latency = time.perf_counter() - sent_at[data['timestamp']]
+            with lock:
+                delivered.append(latency)
+    server.chat_fanout.emit = recording_emit
+
+    texts = build_sentences(args.requests, args.unique_ratio, rng)
+    messages = [(str(index), rng.choice(members), text) for index, text in enumerate(texts)]
+    expected = sum(len(server.room_members.languages(member[0])) for _, member, _ in messages)
+
+    def send(message):
+        message_id, (room, username, lang, client, client_lock), text = message
+        sent_at[message_id] = time.perf_counter()
+        with client_lock:
+            client.emit('send_message', {'room': room, 'message': text, 'username': username,
+                                         'user_lang': lang, 'timestamp': message_id})
+        return 'sent'
+
+    start = time.perf_counter()
+    sent = run_load(send, messages, args.concurrency)
+    deadline = time.monotonic() + args.timeout
+    while len(delivered) < expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    result = summarize(list(delivered), elapsed, {'delivered': len(delivered), 'expected': expected})
+    result['requests'] = len(messages)
+    result['throughput_rps'] = round(len(messages) / elapsed, 2)
+    result['send_latency_ms'] = sent['latency_ms']
+    for _, _, _, client, _ in members:
+        client.get_received()
+        client.disconnect()
+    return result
+
+
+def stage_breakdown(before, after, buckets):
+    """Per-stage count, total and mean time, and the histogram bucket holding p95, over one run"""
+    stages = {}
+    for key, (counts, total, count) in sorted(after.items()):
+        old_counts, old_total, old_count = before.get(key, ((0,) * len(counts), 0.0, 0))
+        count -= old_count
+        if not count:
+            continue
+        total -= old_total
+        cumulative, p95 = 0, None
+        for bound, now, then in zip(buckets, counts, old_counts):
+            cumulative += now - then
+            if cumulative >= 0.95 * count:
+                p95 = bound
+                break
+        stages[key[0]] = {
+            'count': count,
+            'total_ms': round(total * 1000, 2),
+            'mean_ms': round(total / count * 1000, 3),
+            'p95_le_ms': p95 * 1000 if p95 is not None else None,
+        }
+    return stages
+
+
+def child_main(args):
+    from benchmarks.fake_upstreams import FakeUpstream, install
+
+    upstreams = {
+        'google': FakeUpstream(args.google_latency, args.google_latency / 4, args.google_failure_rate, seed=args.seed),
+        'edge_tts': FakeUpstream(args.edge_latency, args.edge_latency / 4, args.edge_failure_rate, seed=args.seed + 1),
+        'gtts': FakeUpstream(args.gtts_latency, args.gtts_latency / 4, 0.0, seed=args.seed + 2),
+    }
+    install(upstreams['google'], upstreams['edge_tts'], upstreams['gtts'],
+            model=(args.model_latency, args.model_item_latency) if args.model == 'fake' else None)
+
+    import app as server
+    from metrics import STAGE_SECONDS
+
+    # Measured as a warmed-up deployment: model loaded and exercised before the clock starts
+    server.load_translation_model()
+    server.generate_batch(['Hello'], 'en', 'hi')
+
+    before = STAGE_SECONDS.snapshot()
+    runners = {
+        'translate': scenario_translate,
+        'translate_tts': lambda server, args: scenario_translate(server, args, tts=True),
+        'batch': scenario_batch,
+        'multi': scenario_multi,
+        'chat': scenario_chat,
+    }
+    result = runners[args.child](server, args)
+    result['stages'] = stage_breakdown(before, STAGE_SECONDS.snapshot(), STAGE_SECONDS.buckets)
+    result['upstream_calls'] = {name: upstream.calls for name, upstream in upstreams.items()}
+    result['peak_rss_bytes'] = peak_rss_bytes()
+    print(json.dumps(result))
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scenario(scenario, args):
+    """One scenario in a fresh interpreter with its own empty caches"""
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, **dict(pair.split('=', 1) for pair in args.env))
+        env.update({
+            'INFERENCE_BACKEND': args.model,
+            'PRELOAD_MODEL': '0',
+            'LOG_LEVEL': env.get('LOG_LEVEL', 'WARNING'),
+            'PYTHONHASHSEED': str(args.seed),
+            'TTS_CACHE_DIR': os.path.join(directory, 'audio'),
+            'TRANSLATION_CACHE_PATH': os.path.join(directory, 'translations.sqlite3'),
+            'PHRASEBOOK_INDEX': os.path.join(directory, 'phrasebook.idx'),
+        })
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), *sys.argv[1:], '--child', scenario],
+                              capture_output=True, text=True, cwd=BACKEND_DIR, env=env)
+    if proc.returncode != 0 or not proc.stdout.strip():
+        lines = proc.stderr.strip().splitlines()
+        return {'error': lines[-1] if lines else f'exit status {proc.returncode}'}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def regressions(report, baseline, tolerance):
+    found = []
+    for name, result in report['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(name)
+        if not old or 'error' in result or 'error' in old:
+            continue
+        for quantile in ('p50', 'p95', 'p99'):
+            now, then = result['latency_ms'][quantile], old['latency_ms'][quantile]
+            if then and now > then * (1 + tolerance):
+                found.append(f"{name} {quantile} {then:.1f}ms -> {now:.1f}ms")
+        if result['throughput_rps'] < old['throughput_rps'] * (1 - tolerance):
+            found.append(f"{name} throughput {old['throughput_rps']:.1f} -> {result['throughput_rps']:.1f} req/s")
+        if result['peak_rss_bytes'] > old['peak_rss_bytes'] * (1 + tolerance):
+            found.append(f"{name} peak RSS {old['peak_rss_bytes'] >> 20} -> {result['peak_rss_bytes'] >> 20} MB")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=400, help="requests (chat: messages) per scenario")
+    parser.add_argument('--unique-ratio', type=float, default=0.3, help="distinct texts as a share of requests")
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--targets', type=int, default=4, help="multi: target languages per request")
+    parser.add_argument('--rooms', type=int, default=20)
+    parser.add_argument('--members', type=int, default=5, help="members per chat room")
+    parser.add_argument('--model', default='fake', help="fake, tiny-random or any INFERENCE_BACKEND")
+    parser.add_argument('--model-latency', type=float, default=0.15, help="fake model: seconds per batch")
+    parser.add_argument('--model-item-latency', type=float, default=0.01, help="fake model: seconds per item")
+    parser.add_argument('--google-latency', type=float, default=0.08)
+    parser.add_argument('--google-failure-rate', type=float, default=0.02)
+    parser.add_argument('--edge-latency', type=float, default=0.3)
+    parser.add_argument('--edge-failure-rate', type=float, default=0.05)
+    parser.add_argument('--gtts-latency', type=float, default=0.5)
+    parser.add_argument('--timeout', type=float, default=60, help="chat: seconds to wait for deliveries")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE',
+                        help="extra environment for the app, e.g. --env ROUTER_HEDGE=1")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    parser.add_argument('--baseline', help="earlier report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed regression vs the baseline")
+    parser.add_argument('--child', choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args)
+        return
+
+    config = {key: value for key, value in vars(args).items() if key not in ('output', 'baseline', 'child')}
+    report = {
+        'config': config,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'revision': git_revision(),
+        },
+        'scenarios': {},
+    }
+    for scenario in args.scenarios:
+        print(f"running {scenario}...", file=sys.stderr)
+        report['scenarios'][scenario] = result = run_scenario(scenario, args)
+        if 'error' in result:
+            print(f"  failed: {result['error']}", file=sys.stderr)
+        else:
+            latency = result['latency_ms']
+            print(f"  {result['throughput_rps']:.1f} req/s  p50 {latency['p50']:.1f}ms  p95 {latency['p95']:.1f}ms  "
+                  f"p99 {latency['p99']:.1f}ms  peak RSS {result['peak_rss_bytes'] >> 20} MB", file=sys.stderr)
+
+    document = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(document + '\n')
+    else:
+        print(document)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(report, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""Microbenchmark and golden-corpus check for the compiled gender rewrite engine.
+
+Verifies apply_gender_rules against benchmarks/gender_golden.tsv, checks that
+the old chained str.replace rules agree on every row marked unambiguous, then
+times both implementations on chat-sized sentences, long paragraphs packed
+with rule words ("dense") and long ordinary text ("prose").
+Run from the backend directory:  python benchmarks/bench_gender_rules.py
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gender_rules import apply_gender_rules  # noqa: E402
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gender_golden.tsv')
+
+# Ordinary text where only the odd word is gender-inflected
+PROSE = ('नमस्ते, आप कैसे हैं? मेरा नाम राम है और मैं दिल्ली में रहता हूँ। '
+         'आज मौसम बहुत अच्छा है। कल हम बाज़ार जाएंगे और सब्ज़ियाँ खरीदेंगे। ')
+
+
+def legacy_adjust(text, target_lang, speaker_gender):
+    """The pre-compiled-engine implementation: one str.replace pass per rule"""
+    
+    # Languages that have grammatical gender differences
+    gender_sensitive_langs = ['hi', 'ur', 'ne', 'bn', 'gu', 'mr', 'pa']
+    
+    if target_lang not in gender_sensitive_langs:
+        return text
+    
+    # Enhanced gender-based replacements for Hindi/Urdu
+    if target_lang in ['hi', 'ur']:
+        if speaker_gender == 'male':
+            replacements = {
+                # Present continuous (रहा/रही)
+                'रही': 'रहा', 'रहीं': 'रहे',
+                # Verb endings
+                'करती': 'करता', 'जाती': 'जाता', 'आती': 'आता', 'खाती': 'खाता',
+                'पीती': 'पीता', 'सोती': 'सोता', 'बोलती': 'बोलता', 'देती': 'देता',
+                'लेती': 'लेता', 'चलती': 'चलता', 'पढ़ती': 'पढ़ता', 'लिखती': 'लिखता',
+                'होती': 'होता', 'कहती': 'कहता', 'सुनती': 'सुनता', 'देखती': 'देखता',
+                # Past tense
+                'गई': 'गया', 'आई': 'आया', 'की': 'किया'
+            }
+        else:  # female
+            replacements = {
+                # Present continuous (रहा/रही)
+                'रहा': 'रही', 'रहे': 'रहीं',
+                # Verb endings
+                'करता': 'करती', 'जाता': 'जाती', 'आता': 'आती', 'खाता': 'खाती',
+                'पीता': 'पीती', 'सोता': 'सोती', 'बोलता': 'बोलती', 'देता': 'देती',
+                'लेता': 'लेती', 'चलता': 'चलती', 'पढ़ता': 'पढ़ती', 'लिखता': 'लिखती',
+                'होता': 'होती', 'कहता': 'कहती', 'सुनता': 'सुनती', 'देखता': 'देखती',
+                # Past tense
+                'गया': 'गई', 'आया': 'आई', 'किया': 'की'
+            }
+        
+        for old, new in replacements.items():
+            text = text.replace(old, new)
+    
+    # Enhanced Punjabi gender rules
+    elif target_lang == 'pa':
+        if speaker_gender == 'male':
+            replacements = {
+                'ਕਰਦੀ': 'ਕਰਦਾ', 'ਜਾਂਦੀ': 'ਜਾਂਦਾ', 'ਆਉਂਦੀ': 'ਆਉਂਦਾ',
+                'ਰਹੀ': 'ਰਿਹਾ', 'ਹੈ': 'ਹੈ'
+            }
+        else:  # female
+            replacements = {
+                'ਕਰਦਾ': 'ਕਰਦੀ', 'ਜਾਂਦਾ': 'ਜਾਂਦੀ', 'ਆਉਂਦਾ': 'ਆਉਂਦੀ',
+                'ਰਿਹਾ': 'ਰਹੀ'
+            }
+        
+        for old, new in replacements.items():
+            text = text.replace(old, new)
+    
+    # Enhanced Nepali gender rules
+    elif target_lang == 'ne':
+        if speaker_gender == 'male':
+            replacements = {
+                'छिन्': 'छु', 'छिन्न्': 'छु', 'छी': 'छु',
+                'गर्छिन्': 'गर्छु', 'हुन्छिन्': 'हुन्छु'
+            }
+        else:  # female
+            replacements = {
+                'छु': 'छिन्', 'छ': 'छिन्', 'गर्छु': 'गर्छिन्',
+                'हुन्छु': 'हुन्छिन्'
+            }
+        
+        for old, new in replacements.items():
+            text = text.replace(old, new)
+    
+    # Bengali gender rules
+    elif target_lang == 'bn':
+        if speaker_gender == 'male':
+            replacements = {
+                'করছি': 'করছি', 'যাচ্ছি': 'যাচ্ছি'  # Bengali has less gender distinction
+            }
+        else:
+            replacements = {}
+        
+        for old, new in replacements.items():
+            text = text.replace(old, new)
+    
+    return text
+
+
+def load_golden(path=GOLDEN_PATH):
+    rows = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('#') or not line.strip():
+                continue
+            lang, gender, text, expected, unambiguous = line.rstrip('\n').split('\t')
+            rows.append((lang, gender, text, expected, unambiguous == 'yes'))
+    return rows
+
+
+def check(rows):
+    failures = 0
+    for lang, gender, text, expected, unambiguous in rows:
+        got = apply_gender_rules(text, lang, gender)
+        if got != expected:
+            failures += 1
+            print(f"MISMATCH {lang}/{gender}: {text!r} -> {got!r}, expected {expected!r}")
+        if unambiguous and legacy_adjust(text, lang, gender) != expected:
+            failures += 1
+            print(f"LEGACY DIFFERS on unambiguous {lang}/{gender}: {text!r}")
+    print(f"golden corpus: {len(rows)} rows, {failures} failures")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = load_golden()
+    if check(rows):
+        sys.exit(1)
+
+    def run(fn, workload):
+        for text, lang, gender in workload:
+            fn(text, lang, gender)
+
+    # Chat-sized sentences (the real workload) and long paragraphs per language/gender
+    sentences = [(text, lang, gender) for lang, gender, text, _, _ in rows]
+    grouped = {}
+    for text, lang, gender in sentences:
+        grouped.setdefault((lang, gender), []).append(text)
+    paragraphs = [(' '.join(texts * 20), lang, gender) for (lang, gender), texts in grouped.items()]
+    prose = [(PROSE * 40, 'hi', 'female'), (PROSE * 40, 'hi', 'male')]
+
+    workloads = (
+        ('sentences', sentences, args.repeat),
+        ('dense', paragraphs, args.repeat // 20),
+        ('prose', prose, args.repeat // 4),
+    )
+    for name, workload, number in workloads:
+        legacy = min(timeit.repeat(lambda: run(legacy_adjust, workload), number=number, repeat=5))
+        compiled = min(timeit.repeat(lambda: run(apply_gender_rules, workload), number=number, repeat=5))
+        print(f"{name:>10}: legacy str.replace chain {legacy * 1000:8.1f} ms | "
+              f"compiled engine {compiled * 1000:8.1f} ms | {legacy / compiled:.2f}x")
+
+if __name__ == '__main__':
+    main()
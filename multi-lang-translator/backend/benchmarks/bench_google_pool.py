@@ -0,0 +1,81 @@
+"""Load-test TranslatorPool and its circuit breaker against a fake upstream.
+
+Runs four phases (healthy, outage, half-open recovery, recovered) with concurrent callers and
+reports throughput, latency percentiles and pool/breaker counters.
+Run from the backend directory:  python benchmarks/bench_google_pool.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_upstreams import FakeGoogleTranslator, FakeUpstream  # noqa: E402
+from google_pool import CircuitBreaker, CircuitOpenError, TranslatorPool  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run_phase(pool, concurrency, requests):
+    latencies = []
+    outcomes = {'ok': 0, 'short_circuited': 0, 'failed': 0}
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            pool.translate(f"hello {i}", 'en', 'hi')
+            outcome = 'ok'
+        except CircuitOpenError:
+            outcome = 'short_circuited'
+        except Exception:
+            outcome = 'failed'
+        return outcome, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for outcome, latency in executor.map(one, range(requests)):
+            outcomes[outcome] += 1
+            latencies.append(latency)
+    elapsed = time.perf_counter() - start
+    return {
+        'req_per_sec': requests / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        **outcomes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--pool-size', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+
+    upstream = FakeUpstream(latency=args.latency, seed=1)
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=1.0)
+    pool = TranslatorPool(lambda: FakeGoogleTranslator(upstream), size=args.pool_size,
+                          backoff_base=0.01, backoff_max=0.1, breaker=breaker)
+
+    phases = [('healthy', 0.0), ('outage', 1.0), ('recovery', 0.0), ('recovered', 0.0)]
+    for name, failure_rate in phases:
+        upstream.failure_rate = failure_rate
+        if name == 'recovery':
+            time.sleep(breaker.reset_timeout)
+        result = run_phase(pool, args.concurrency, args.requests)
+        print(f"{name:>9}: " + ', '.join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}"
+                                        for k, v in result.items()))
+    print(f"pool: {pool.stats()}  upstream calls: {upstream.calls}")
+
+
+if __name__ == '__main__':
+    main()
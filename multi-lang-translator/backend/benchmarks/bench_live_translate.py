@@ -0,0 +1,125 @@
+"""Backend work per keystroke: live sessions vs re-translating the whole text.
+
+Simulates a user editing the middle of a long document and then typing a new
+sentence at the end, one revision per keystroke. The fake translator costs a
+fixed overhead plus a per-character delay, roughly like a model call.
+"Full" is what the /translate endpoint does today: every sentence, every time.
+Run from the backend directory:  python benchmarks/bench_live_translate.py
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chunking import sentence_chunks  # noqa: E402
+from live_translate import LiveTranslator  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class FakeTranslator:
+    def __init__(self, overhead, per_char):
+        self.overhead = overhead
+        self.per_char = per_char
+        self.sentences = 0
+        self.chars = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text, source_lang, target_lang, speaker_gender, revision=None):
+        with self._lock:
+            self.sentences += 1
+            self.chars += len(text)
+        time.sleep(self.overhead + self.per_char * len(text))
+        return text.upper()
+
+
+def keystrokes(sentences, edit_at):
+    """Revisions produced by inserting a word into one sentence, then typing a new one"""
+    doc = [f"This is sentence number {i} of a fairly long document about travel." for i in range(sentences)]
+    base = ' '.join(doc)
+    insert_at = len(' '.join(doc[:edit_at])) + len(" This is")
+    for i in range(1, len(" really") + 1):
+        yield base[:insert_at] + " really"[:i] + base[insert_at:]
+    edited = base[:insert_at] + " really" + base[insert_at:]
+    tail = " Thanks for reading!"
+    for i in range(1, len(tail) + 1):
+        yield edited + tail[:i]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sentences', type=int, default=60)
+    parser.add_argument('--typing-ms', type=float, default=150, help='delay between keystrokes')
+    parser.add_argument('--overhead-ms', type=float, default=15)
+    parser.add_argument('--per-char-ms', type=float, default=0.3)
+    args = parser.parse_args()
+
+    revisions = list(keystrokes(args.sentences, args.sentences // 2))
+    split = lambda text, lang: sentence_chunks(text, lang, 100)  # noqa: E731
+
+    # Full re-translation: work per keystroke is the whole document
+    full_sentences = sum(len([c for c in split(text, 'en') if c.text]) for text in revisions)
+    full_chars = sum(len(text) for text in revisions)
+
+    fake = FakeTranslator(args.overhead_ms / 1000, args.per_char_ms / 1000)
+    live = LiveTranslator(fake, split)
+    done = {}
+    sent_at = {}
+    finished = threading.Event()
+
+    def emit(event, payload):
+        if event == 'live_done':
+            done[payload['revision']] = time.perf_counter() - sent_at[payload['revision']]
+            if payload['revision'] == len(revisions):
+                finished.set()
+
+    # Revision 0 is the document as loaded, before the user starts typing
+    sent_at[0] = time.perf_counter()
+    live.update(('bench', 'doc'), 0, revisions[0], 'en', 'hi', 'female', emit)
+    while 0 not in done:
+        time.sleep(0.01)
+    fake.sentences = fake.chars = 0
+
+    for number, text in enumerate(revisions, start=1):
+        sent_at[number] = time.perf_counter()
+        live.update(('bench', 'doc'), number, text, 'en', 'hi', 'female', emit)
+        time.sleep(args.typing_ms / 1000)
+    finished.wait(30)
+
+    latencies = [done[n] for n in done if n > 0]
+    stats = live.stats()
+    print(f"{len(revisions)} keystrokes over a {args.sentences}-sentence document")
+    print(f"{'mode':>5} {'sentences/key':>14} {'chars/key':>10}")
+    print(f"{'full':>5} {full_sentences / len(revisions):>14.1f} {full_chars / len(revisions):>10.0f}")
+    print(f"{'live':>5} {fake.sentences / len(revisions):>14.2f} {fake.chars / len(revisions):>10.0f}")
+    print(f"live: {len(latencies)} revisions completed, {stats['revisions_cancelled']} superseded, "
+          f"p50 {percentile(latencies, 50) * 1000:.0f}ms p95 {percentile(latencies, 95) * 1000:.0f}ms to live_done")
+
+    # Rewrites that land while each revision is half done (one sentence translated, one still
+    # pending) cancel every revision before it finishes; the carried-over map must not grow
+    def half_slow(text, source_lang, target_lang, speaker_gender, revision=None):
+        time.sleep(0.2 if text.startswith('Slow') else 0)
+        return text.upper()
+
+    rewrites = LiveTranslator(half_slow, split)
+    for number in range(50):
+        rewrites.update(('bench', 'doc'), number, f"Quick draft {number}. Slow draft {number}.", 'en', 'hi',
+                        'female', lambda event, payload: None)
+        time.sleep(0.01)
+    kept = len(rewrites._sessions[('bench', 'doc')].translations)
+    print(f"after 50 superseded rewrites: {kept} sentence(s) carried over")
+    if kept > 2:
+        print("FAIL: superseded revisions' sentences are still held")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Request-path cost of memory cleanup: gc.collect() on every request vs the background memory governor.
+
+Builds a heap the size of a loaded server (tokenizer vocabularies, cache
+entries; --heap-objects of them) and serves simulated requests that each
+allocate a little and take --work seconds. The old path ran a full
+collection per request; with the governor, requests do no cleanup and a
+background check collects only past the soft watermark. Reports request
+latency and how many collections each approach ran.
+Run from the backend directory:  python benchmarks/bench_memory.py
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from governor import MemoryGovernor  # noqa: E402
+from inference_backends import current_rss_bytes  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(count, concurrency, work, cleanup):
+    latencies = []
+
+    def one(i):
+        start = time.perf_counter()
+        scratch = [{'text': f"sentence {i} {j}"} for j in range(200)]
+        time.sleep(work)
+        del scratch
+        if cleanup is not None:
+            cleanup()
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(count)))
+    return time.perf_counter() - start, latencies
+
+
+def report(label, elapsed, latencies, collections):
+    print(f"{label:>16}: {len(latencies) / elapsed:7.1f} req/s  p50 {percentile(latencies, 50) * 1000:7.1f}ms  "
+          f"p99 {percentile(latencies, 99) * 1000:7.1f}ms  full collections {collections}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--work', type=float, default=0.01, help="seconds of non-cleanup work per request")
+    parser.add_argument('--heap-objects', type=int, default=2_000_000)
+    parser.add_argument('--interval', type=float, default=0.5, help="governor check interval")
+    args = parser.parse_args()
+
+    heap = [{'token': str(i)} for i in range(args.heap_objects)]
+    print(f"heap: {len(heap)} objects, RSS {current_rss_bytes() / 1e6:.0f} MB")
+
+    collections = []
+
+    def per_request():
+        gc.collect()
+        collections.append(1)
+
+    report('per-request gc', *run(args.requests, args.concurrency, args.work, per_request), len(collections))
+
+    # Soft watermark just above the current RSS: collect only if the run actually grows the process
+    governor = MemoryGovernor(soft_limit=current_rss_bytes() + 64 * 1024 * 1024, interval=args.interval,
+                              idle_unload=0)
+    checks = []
+    original = governor.check
+    governor.check = lambda: checks.extend(original()) or []
+    governor.start()
+    elapsed, latencies = run(args.requests, args.concurrency, args.work, None)
+    governor.stop()
+    report('governor', elapsed, latencies, checks.count('collect'))
+
+
+if __name__ == '__main__':
+    main()
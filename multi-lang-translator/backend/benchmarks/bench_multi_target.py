@@ -0,0 +1,69 @@
+"""Multi-target translation: one encoder pass + one batched decode vs a generate() per target.
+
+For N in --targets, translates each sentence into N languages twice: N
+separate generate() calls (what translate_single_chunk did per target), and
+one generate_targets() call. Reports ms per sentence, the speed-up, and how
+often the two paths produce the same text (greedy decoding, so they should).
+Defaults to the tiny-random backend so it runs without the 2GB download;
+--backend torch measures the real model.
+Run from the backend directory:  python benchmarks/bench_multi_target.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference_backends import create_backend  # noqa: E402
+
+SENTENCES = [
+    "Hello, how are you today?",
+    "The lesson starts at nine tomorrow morning, please bring your notebook.",
+    "Can you explain that again a little more slowly?",
+    "My friend and I went to the market to buy vegetables for dinner.",
+    "Thank you for teaching me how to cook this dish.",
+    "Where is the nearest train station?",
+]
+TARGETS = ['hi', 'bn', 'ta', 'ur', 'es', 'fr', 'de', 'ja', 'zh', 'ar', 'ru', 'pt', 'ko', 'tr', 'mr', 'gu']
+
+
+def timed(fn, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        outputs = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return outputs, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--backend', default='tiny-random')
+    parser.add_argument('--targets', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--repeats', type=int, default=3, help="best of this many runs")
+    args = parser.parse_args()
+
+    backend = create_backend(args.backend)
+    try:
+        backend.load()
+    except ImportError as e:
+        sys.exit(f"{args.backend} backend unavailable: {e}")
+    backend.generate(["Hello"], 'en', 'hi')
+
+    print(f"backend={args.backend}  {len(SENTENCES)} sentences, best of {args.repeats}")
+    print(f"{'targets':>8} {'separate ms':>12} {'multi ms':>10} {'speed-up':>9} {'same output':>12}")
+    for count in args.targets:
+        targets = TARGETS[:count]
+        separate, separate_s = timed(
+            lambda: [[backend.generate([text], 'en', code)[0] for code in targets] for text in SENTENCES], args.repeats)
+        multi, multi_s = timed(
+            lambda: [backend.generate_targets(text, 'en', targets) for text in SENTENCES], args.repeats)
+        same = sum(a == b for row_a, row_b in zip(separate, multi) for a, b in zip(row_a, row_b))
+        print(f"{count:>8} {separate_s / len(SENTENCES) * 1000:>12.1f} {multi_s / len(SENTENCES) * 1000:>10.1f} "
+              f"{separate_s / multi_s:>8.2f}x {same:>6}/{count * len(SENTENCES)}")
+
+
+if __name__ == '__main__':
+    main()
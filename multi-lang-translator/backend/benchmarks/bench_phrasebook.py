@@ -0,0 +1,150 @@
+"""Phrasebook index: build time, exact / fuzzy / miss lookup rates, and what loading it costs.
+
+Builds the index from a TSV (the shipped one by default, optionally padded
+with synthetic rows to a larger size), opens it, and times a reproducible
+query mix for each outcome. RSS is sampled before and after opening the
+index to show the mapping is not copied into Python objects. Before timing
+anything it checks that near misses which are really different sentences
+get no answer, and that typos and chat shorthand do (exit status 1 if not).
+Run from the backend directory:  python benchmarks/bench_phrasebook.py
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phrasebook import PHRASEBOOK_TSV, Phrasebook, build_index, normalize_phrase  # noqa: E402
+
+# Near misses of shipped phrases that mean something else; the phrasebook must not answer them
+DIFFERENT_SENTENCES = ['who are you', 'thank god', 'i am fire', 'how old are you', 'thank you god',
+                       'i am not fine', 'what is my name', 'see you today', 'sorry not sorry']
+# Genuine typos of shipped phrases, which the last-resort lookup should still recognise
+TYPOS = {'good morninf': 'good morning', 'see you tomorow': 'see you tomorrow', 'goodbyee': 'goodbye'}
+# Chat shorthand for shipped phrases, which similar() answers before any translator is asked
+SHORTHAND = {'thank u': 'thank you', 'Thank u!': 'thank you', 'see u tomorrow': 'see you tomorrow'}
+
+
+def rss_kb():
+    """Resident set size of this process, from /proc (Linux only)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def padded_tsv(source, extra_rows, seed, directory):
+    """Copy of source with extra_rows random made-up phrases appended"""
+    with open(source, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    if not extra_rows:
+        return source, lines
+    rng = random.Random(seed)
+    width = len(lines[0].split('\t'))
+    for _ in range(extra_rows):
+        words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))) for _ in range(rng.randint(1, 4))]
+        lines.append('\t'.join(' '.join(words) + (f' {column}' if column else '') for column in range(width)))
+    path = os.path.join(directory, 'phrasebook.tsv')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    return path, lines
+
+
+def typo(text, rng):
+    """One random substitution, deletion or insertion"""
+    position = rng.randrange(len(text))
+    kind = rng.choice(('substitute', 'delete', 'insert'))
+    letter = rng.choice(string.ascii_lowercase)
+    if kind == 'substitute':
+        return text[:position] + letter + text[position + 1:]
+    if kind == 'delete':
+        return text[:position] + text[position + 1:]
+    return text[:position] + letter + text[position:]
+
+
+def check_near_misses(phrasebook):
+    """Names of the checks that failed: a different sentence answered, or a typo not recognised"""
+    failed = []
+    for text in DIFFERENT_SENTENCES:
+        for method in (phrasebook.lookup, phrasebook.similar, phrasebook.closest):
+            answer = method(text, 'en', 'hi')
+            if answer is not None:
+                failed.append(f"{method.__name__}({text!r}) -> {answer!r}")
+    for text, phrase in TYPOS.items():
+        expected = phrasebook.lookup(phrase, 'en', 'hi')
+        if phrasebook.closest(text, 'en', 'hi') != expected:
+            failed.append(f"closest({text!r}) is not the translation of {phrase!r}")
+    for text, phrase in SHORTHAND.items():
+        expected = phrasebook.lookup(phrase, 'en', 'hi')
+        if phrasebook.similar(text, 'en', 'hi') != expected:
+            failed.append(f"similar({text!r}) is not the translation of {phrase!r}")
+    return failed
+
+
+def timed_lookups(label, lookup, queries, source_lang, target_lang):
+    start = time.perf_counter()
+    answered = sum(lookup(query, source_lang, target_lang) is not None for query in queries)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>10} {len(queries) / elapsed:>14.0f} {elapsed / len(queries) * 1e6:>10.1f} "
+          f"{answered:>7}/{len(queries)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tsv', default=PHRASEBOOK_TSV)
+    parser.add_argument('--extra-rows', type=int, default=0, help="synthetic phrases to add to the TSV")
+    parser.add_argument('--queries', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        tsv, lines = padded_tsv(args.tsv, args.extra_rows, args.seed, directory)
+        index = os.path.join(directory, 'phrasebook.idx')
+
+        start = time.perf_counter()
+        build_index(tsv, index)
+        print(f"build: {len(lines) - 1} phrases x {len(lines[0].split())} languages, "
+              f"{os.path.getsize(index)} bytes in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        before = rss_kb()
+        start = time.perf_counter()
+        phrasebook = Phrasebook(index)
+        opened = time.perf_counter() - start
+        failed = check_near_misses(phrasebook)
+        for failure in failed:
+            print(f"FAIL {failure}")
+        if failed:
+            sys.exit(1)
+        print(f"near misses: {len(DIFFERENT_SENTENCES)} different sentences unanswered, {len(TYPOS)} typos "
+              f"and {len(SHORTHAND)} shorthand lines recognised")
+        after = rss_kb()
+        growth = f"{after - before} KB" if before is not None and after is not None else "n/a"
+        print(f"open: {opened * 1e6:.0f} us, RSS growth {growth}")
+
+        english = [line.split('\t')[0] for line in lines[1:]]
+        known = [phrase for phrase in english if len(normalize_phrase(phrase)) >= 4]
+        exact = [rng.choice(english) for _ in range(args.queries)]
+        fuzzy = [typo(normalize_phrase(rng.choice(known)), rng) for _ in range(args.queries)]
+        misses = [' '.join(rng.choice(('translate', 'this', 'whole', 'sentence', 'please', 'model')) for _ in range(6))
+                  for _ in range(args.queries)]
+
+        print(f"{'queries':>10} {'lookups/s':>14} {'us each':>10} {'answered':>15}")
+        timed_lookups('exact', phrasebook.lookup, exact, 'en', 'hi')
+        timed_lookups('typo', phrasebook.closest, fuzzy, 'en', 'hi')
+        timed_lookups('miss', phrasebook.lookup, misses, 'en', 'hi')
+        timed_lookups('miss+short', phrasebook.similar, misses, 'en', 'hi')
+        timed_lookups('miss+fuzzy', phrasebook.closest, misses, 'en', 'hi')
+        print(f"RSS after lookups: {rss_kb()} KB; {phrasebook.stats()}")
+
+
+if __name__ == '__main__':
+    main()
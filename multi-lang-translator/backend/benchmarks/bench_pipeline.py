@@ -0,0 +1,108 @@
+"""Post-translation stages in /translate: one after another vs the concurrent stage pipeline.
+
+Romanization and TTS each only need the translated text, so the pipeline runs
+them side by side and a request costs the slowest stage instead of the sum.
+Stage latencies are simulated with jittered sleeps; a share of TTS calls
+stall past the stage timeout to show the response no longer waits on them.
+Also checks that background (progressive) jobs past a stage's backlog cap are
+dropped rather than queued; exits 1 if not.
+Run from the backend directory:  python benchmarks/bench_pipeline.py
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import Stage, StagePipeline  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def sleeper(mean, stall_ratio, stall, seed):
+    rng = random.Random(seed)
+
+    def stage(translated, context):
+        delay = stall if rng.random() < stall_ratio else rng.uniform(mean * 0.5, mean * 1.5)
+        time.sleep(delay)
+        return translated
+    return stage
+
+
+def run(handler, count, concurrency):
+    latencies = []
+
+    def one(i):
+        start = time.perf_counter()
+        handler(f"Sentence number {i}")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(count)))
+    return time.perf_counter() - start, latencies
+
+
+def report(label, elapsed, latencies):
+    print(f"{label:>12}: {len(latencies) / elapsed:7.1f} req/s  p50 {percentile(latencies, 50) * 1000:7.1f}ms  "
+          f"p95 {percentile(latencies, 95) * 1000:7.1f}ms  p99 {percentile(latencies, 99) * 1000:7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--romanize', type=float, default=0.02, help="mean romanization seconds")
+    parser.add_argument('--tts', type=float, default=0.12, help="mean TTS seconds")
+    parser.add_argument('--stall-ratio', type=float, default=0.02, help="share of TTS calls that stall")
+    parser.add_argument('--stall', type=float, default=2.0, help="seconds a stalled TTS call takes")
+    parser.add_argument('--tts-timeout', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    def stages():
+        workers = args.concurrency * 2
+        return [Stage('romanize', sleeper(args.romanize, 0.0, 0.0, args.seed), 1.0, workers=workers),
+                Stage('tts', sleeper(args.tts, args.stall_ratio, args.stall, args.seed + 1), args.tts_timeout,
+                      workers=workers)]
+
+    sequential = {stage.name: stage for stage in stages()}
+
+    def one_by_one(text):
+        for name in ('romanize', 'tts'):
+            sequential[name].fn(text, {})
+
+    report('sequential', *run(one_by_one, args.requests, args.concurrency))
+
+    pipeline = StagePipeline(stages())
+    timeouts = []
+
+    def concurrent(text):
+        timeouts.extend(pipeline.run(text, {}, ('romanize', 'tts'))[1])
+
+    report('pipeline', *run(concurrent, args.requests, args.concurrency))
+    print(f"pipeline stage timeouts: {len(timeouts)}")
+
+    # One TTS thread with a backlog of two: a burst of five keeps two and drops three
+    bounded = StagePipeline([Stage('tts', sleeper(args.tts, 0.0, 0.0, args.seed), args.tts_timeout, workers=1)],
+                            background_per_worker=2)
+    futures = [bounded.submit_background('tts', f"Sentence number {i}", {}) for i in range(5)]
+    kept = [future for future in futures if future is not None]
+    for future in kept:
+        future.result()
+    print(f"background burst of {len(futures)}: {len(kept)} kept, {len(futures) - len(kept)} dropped")
+    if len(kept) != 2 or bounded.submit_background('tts', "after the burst", {}) is None:
+        print("FAIL: background backlog not bounded, or not freed once jobs finished")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
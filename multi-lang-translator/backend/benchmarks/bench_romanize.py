@@ -0,0 +1,133 @@
+"""Romanization throughput: precompiled Romanizer vs the old per-call indic_transliteration path.
+
+Builds a reproducible 10k-sentence corpus across the Indic target languages
+and times (a) the previous romanize_text implementation, if
+indic_transliteration is installed, (b) Romanizer per sentence with the LRU
+off, (c) romanize_batch per language, (d) a second pass with the LRU warm.
+Also reports how often the two implementations agree on Devanagari.
+Run from the backend directory:  python benchmarks/bench_romanize.py
+"""
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from romanization import Romanizer  # noqa: E402
+
+VOCABULARY = {
+    'hi': 'मैं आप हम वह यह घर किताब पानी खाना स्कूल बाज़ार दोस्त परिवार आज कल अच्छा बहुत '
+          'जाना आना पढ़ना लिखना है हैं था थी रहा रही करता करती क्या कहाँ क्यों नमस्ते धन्यवाद ज़रूर'.split(),
+    'mr': 'मी तुम्ही आम्ही घर पुस्तक पाणी जेवण शाळा मित्र आज उद्या चांगले खूप आहे होते'.split(),
+    'bn': 'আমি তুমি আমরা বাড়ি বই জল খাবার স্কুল বন্ধু আজ কাল ভালো খুব যাচ্ছি আছে ছিল'.split(),
+    'as': 'মই তুমি আমি ঘৰ কিতাপ পানী খাদ্য বিদ্যালয় বন্ধু আজি কালি ভাল বৰ আছে আছিল'.split(),
+    'pa': 'ਮੈਂ ਤੁਸੀਂ ਅਸੀਂ ਘਰ ਕਿਤਾਬ ਪਾਣੀ ਖਾਣਾ ਸਕੂਲ ਦੋਸਤ ਅੱਜ ਕੱਲ੍ਹ ਚੰਗਾ ਬਹੁਤ ਹੈ ਸੀ'.split(),
+    'gu': 'હું તમે અમે ઘર પુસ્તક પાણી ભોજન શાળા મિત્ર આજે કાલે સારું ખૂબ છે હતું'.split(),
+    'ta': 'நான் நீங்கள் நாங்கள் வீடு புத்தகம் தண்ணீர் உணவு பள்ளி நண்பர் இன்று நாளை நல்ல மிகவும்'.split(),
+    'te': 'నేను మీరు మేము ఇల్లు పుస్తకం నీరు ఆహారం పాఠశాల స్నేహితుడు ఈరోజు రేపు మంచి చాలా'.split(),
+    'kn': 'ನಾನು ನೀವು ನಾವು ಮನೆ ಪುಸ್ತಕ ನೀರು ಊಟ ಶಾಲೆ ಸ್ನೇಹಿತ ಇಂದು ನಾಳೆ ಒಳ್ಳೆಯ ತುಂಬಾ'.split(),
+    'ml': 'ഞാൻ നിങ്ങൾ ഞങ്ങൾ വീട് പുസ്തകം വെള്ളം ഭക്ഷണം സ്കൂൾ സുഹൃത്ത് ഇന്ന് നാളെ നല്ല വളരെ'.split(),
+    'ur': 'میں آپ ہم گھر کتاب پانی کھانا اسکول دوست آج کل اچھا بہت ہے تھا کیا کہاں'.split(),
+}
+# Roughly the traffic mix: mostly Hindi, a long tail of other scripts
+WEIGHTS = {'hi': 40, 'mr': 5, 'bn': 12, 'as': 3, 'pa': 8, 'gu': 5, 'ta': 8, 'te': 6, 'kn': 4, 'ml': 4, 'ur': 5}
+TERMINATORS = {'ur': '۔', 'ta': '.', 'te': '.', 'kn': '.', 'ml': '.', 'gu': '.'}
+
+
+def build_corpus(size, seed):
+    rng = random.Random(seed)
+    langs = list(WEIGHTS)
+    corpus = []
+    for _ in range(size):
+        lang = rng.choices(langs, weights=[WEIGHTS[lang] for lang in langs])[0]
+        words = [rng.choice(VOCABULARY[lang]) for _ in range(rng.randint(4, 12))]
+        corpus.append((lang, ' '.join(words) + TERMINATORS.get(lang, '।')))
+    return corpus
+
+
+def legacy_romanize(text, target_lang):
+    """The romanize_text body this module replaced"""
+    try:
+        romanizable_langs = {
+            'hi': 'devanagari', 'bn': 'bengali', 'te': 'telugu', 'ta': 'tamil', 'ml': 'malayalam',
+            'gu': 'gujarati', 'kn': 'kannada', 'mr': 'devanagari', 'pa': 'gurmukhi', 'ur': 'urdu',
+            'ne': 'devanagari', 'or': 'oriya', 'as': 'assamese', 'mai': 'devanagari', 'bho': 'devanagari',
+            'awa': 'devanagari', 'mag': 'devanagari', 'hne': 'devanagari', 'doi': 'devanagari'
+        }
+        if target_lang not in romanizable_langs:
+            return None
+        from indic_transliteration import sanscript
+        from indic_transliteration.sanscript import transliterate
+        return transliterate(text, romanizable_langs[target_lang], sanscript.ITRANS)
+    except Exception:
+        return None
+
+
+def timed_run(label, fn, count):
+    start = time.perf_counter()
+    outputs = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>24} {elapsed * 1000:>10.1f} {count / elapsed:>14.0f}")
+    return outputs, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sentences', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=13)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.sentences, args.seed)
+    by_lang = {}
+    for index, (lang, text) in enumerate(corpus):
+        by_lang.setdefault(lang, []).append(index)
+    print(f"{len(corpus)} sentences, {sum(len(text) for _, text in corpus)} characters")
+
+    start = time.perf_counter()
+    Romanizer()
+    print(f"table compile: {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(f"{'implementation':>24} {'total ms':>10} {'sentences/s':>14}")
+
+    legacy = None
+    if importlib.util.find_spec('indic_transliteration') is None:
+        print(f"{'legacy':>24} {'skipped (indic_transliteration not installed)':>25}")
+    else:
+        legacy, legacy_elapsed = timed_run(
+            'legacy', lambda: [legacy_romanize(text, lang) for lang, text in corpus], len(corpus))
+
+    cold = Romanizer(cache_size=0)
+    engine, engine_elapsed = timed_run(
+        'Romanizer, no LRU', lambda: [cold.romanize(text, lang) for lang, text in corpus], len(corpus))
+
+    def batched():
+        outputs = [None] * len(corpus)
+        for lang, indexes in by_lang.items():
+            for index, out in zip(indexes, cold.romanize_batch([corpus[i][1] for i in indexes], lang)):
+                outputs[index] = out
+        return outputs
+    batch, _ = timed_run('romanize_batch, no LRU', batched, len(corpus))
+    assert batch == engine, "batch and per-sentence output differ"
+    # A NUL inside a text splits the joined batch into extra parts; results must still line up
+    odd = [corpus[0][1] + '\0' + corpus[1][1], corpus[2][1]]
+    assert cold.romanize_batch(odd, corpus[0][0]) == [cold.romanize(text, corpus[0][0]) for text in odd], \
+        "batch output misaligned when a text contains NUL"
+
+    warm = Romanizer()
+    for lang, text in corpus:
+        warm.romanize(text, lang)
+    timed_run('Romanizer, LRU warm', lambda: [warm.romanize(text, lang) for lang, text in corpus], len(corpus))
+
+    if legacy is not None:
+        print(f"speed-up over legacy: {legacy_elapsed / engine_elapsed:.1f}x (no LRU)")
+        failed = sum(out is None for out in legacy)
+        devanagari = [i for i, (lang, _) in enumerate(corpus) if lang in ('hi', 'mr')]
+        same = sum(legacy[i] == engine[i] for i in devanagari)
+        print(f"legacy returned None for {failed} sentences; "
+              f"Devanagari agreement {same}/{len(devanagari)} ({same / len(devanagari):.1%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Drive the translation Router against fake backends with injected latency and failures.
+
+Phases: a healthy Google with a slow tail (hedging off, then on), a Google
+outage, and recovery once the outage's samples age out of the window.
+Each phase reports latency percentiles and which backend answered.
+Run from the backend directory:  python benchmarks/bench_router.py
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_upstreams import FakeGoogleTranslator, FakeUpstream  # noqa: E402
+from router import FunctionBackend, Router  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def build_router(google, model, hedge, window_seconds):
+    google_client = FakeGoogleTranslator(google)
+
+    def model_translate(text, source_lang, target_lang):
+        model.call()
+        return f"<{target_lang}> {text}"
+
+    return Router([
+        FunctionBackend('google', lambda text, src, dest: google_client.translate(text, src=src, dest=dest).text),
+        FunctionBackend('m2m100', model_translate),
+    ], hedge=hedge, hedge_min_ms=20, window_seconds=window_seconds)
+
+
+def run_phase(name, router, requests, concurrency):
+    def one(i):
+        start = time.perf_counter()
+        try:
+            _, backend = router.translate(f"sentence {i}", 'en', 'hi')
+        except Exception:
+            backend = 'failed'
+        return backend, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, range(requests)))
+    latencies = [seconds for _, seconds in results]
+    served = Counter(backend for backend, _ in results)
+    share = ' '.join(f"{backend}={count / requests:.0%}" for backend, count in sorted(served.items()))
+    print(f"{name:>18} {percentile(latencies, 50) * 1000:>7.0f} {percentile(latencies, 95) * 1000:>7.0f} "
+          f"{percentile(latencies, 99) * 1000:>7.0f}  {share}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--google-ms', type=float, default=60)
+    parser.add_argument('--model-ms', type=float, default=150)
+    parser.add_argument('--slow-rate', type=float, default=0.05, help='share of Google calls in the slow tail')
+    parser.add_argument('--slow-ms', type=float, default=1500)
+    parser.add_argument('--window-seconds', type=float, default=3)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'phase':>18} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}  served by")
+    for hedge in (False, True):
+        google = FakeUpstream(args.google_ms / 1000, args.google_ms / 4000, seed=args.seed,
+                              slow_rate=args.slow_rate, slow_latency=args.slow_ms / 1000)
+        model = FakeUpstream(args.model_ms / 1000, args.model_ms / 4000, seed=args.seed + 1)
+        router = build_router(google, model, hedge, args.window_seconds)
+        run_phase('healthy, hedged' if hedge else 'healthy', router, args.requests, args.concurrency)
+
+    # Outage and recovery on the hedged router
+    google.failure_rate = 1.0
+    run_phase('google down', router, args.requests, args.concurrency)
+    google.failure_rate = 0.0
+    run_phase('google back', router, args.requests, args.concurrency)
+    time.sleep(args.window_seconds)
+    run_phase('after window', router, args.requests, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Measure backend startup: import time, and time until /readyz would report the model ready.
+
+Every measurement runs in a fresh interpreter. "eager imports" times the
+heavy modules app.py used to import at the top, for comparison.
+Run from the backend directory:  python benchmarks/bench_startup.py
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EAGER_IMPORTS = '''
+import time
+start = time.perf_counter()
+import torch, gtts, edge_tts, openai, googletrans, indic_transliteration.sanscript
+print(time.perf_counter() - start)
+'''
+
+APP_STARTUP = '''
+import json, os, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter() - start
+app.start_warmup()
+while app.warmup['ready_at'] is None and app.warmup['error'] is None:
+    time.sleep(0.05)
+print(json.dumps({
+    'import_seconds': imported,
+    'time_to_ready_seconds': time.perf_counter() - start,
+    'error': app.warmup['error'],
+}))
+'''
+
+
+def run(code, env=None):
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                          cwd=BACKEND_DIR, env={**os.environ, **(env or {})})
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else 'failed')
+    return proc.stdout.strip().splitlines()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    eager = [float(run(EAGER_IMPORTS)) for _ in range(args.runs)]
+    # PRELOAD_MODEL=0 so the import itself doesn't start the warm-up thread early
+    startups = [json.loads(run(APP_STARTUP, {'PRELOAD_MODEL': '0'})) for _ in range(args.runs)]
+
+    print(f"eager heavy imports:  {min(eager):.2f}s (best of {args.runs})")
+    print(f"import app (lazy):    {min(s['import_seconds'] for s in startups):.2f}s")
+    print(f"time to ready:        {min(s['time_to_ready_seconds'] for s in startups):.2f}s")
+    errors = {s['error'] for s in startups if s['error']}
+    if errors:
+        print(f"warm-up errors: {errors}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Scaling of the pre-fork worker pool: throughput and total memory at 1/2/4/8 workers.
+
+Each worker count runs in its own subprocess. Memory is the summed PSS
+(proportional set size) of the parent and its workers, so pages shared
+between them are counted once, which is the number that matters on the box.
+Run from the backend directory:  python benchmarks/bench_workers.py
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SENTENCES = [
+    "Hello, how are you today?",
+    "I am learning to play the guitar.",
+    "Where is the nearest railway station?",
+    "Thank you very much for your help.",
+    "The weather is very pleasant this evening.",
+    "Can you teach me how to cook rice?",
+    "We will meet again tomorrow morning.",
+    "This book is about the history of music.",
+]
+
+
+def pss_bytes(pid):
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def run_workers(workers, threads, requests, concurrency, max_batch_size):
+    """Child process: start a pool of `workers`, push requests through a batcher, print JSON"""
+    from inference_backends import create_backend
+    from model_batcher import TranslationBatcher
+    from worker_pool import WorkerPool
+
+    pool = WorkerPool(create_backend('torch'), workers=workers, threads_per_worker=threads)
+    start = time.perf_counter()
+    pool.start()
+    pool.wait_ready()
+    startup = time.perf_counter() - start
+
+    batcher = TranslationBatcher(pool.generate, max_batch_size=max_batch_size, max_concurrent_batches=workers)
+    texts = [SENTENCES[i % len(SENTENCES)] for i in range(requests)]
+    latencies = []
+
+    def translate_one(text):
+        begin = time.perf_counter()
+        batcher.translate(text, 'en', 'hi')
+        latencies.append(time.perf_counter() - begin)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(translate_one, texts))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pss = pss_bytes(os.getpid()) + pss_bytes(pool.supervisor.pid) + sum(pss_bytes(pid) for pid in pool.worker_pids.values())
+    pool.stop()
+    print(json.dumps({
+        'workers': workers,
+        'startup_seconds': startup,
+        'requests_per_sec': requests / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'total_pss_bytes': pss,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', default='1,2,4,8')
+    parser.add_argument('--threads-per-worker', type=int, default=1)
+    parser.add_argument('--requests', type=int, default=256)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--max-batch-size', type=int, default=8)
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_workers(args.child, args.threads_per_worker, args.requests, args.concurrency, args.max_batch_size)
+        return
+
+    print(f"{'workers':>8} {'start s':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'PSS MB':>8} {'scaling':>8}")
+    baseline = None
+    for workers in (int(n) for n in args.workers.split(',')):
+        proc = subprocess.run(
+            [sys.executable, __file__, '--child', str(workers),
+             '--threads-per-worker', str(args.threads_per_worker), '--requests', str(args.requests),
+             '--concurrency', str(args.concurrency), '--max-batch-size', str(args.max_batch_size)],
+            capture_output=True, text=True, cwd=BACKEND_DIR)
+        if proc.returncode != 0:
+            print(f"{workers:>8} failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr else ''}")
+            continue
+        report = json.loads(proc.stdout.strip().splitlines()[-1])
+        baseline = baseline or report['requests_per_sec']
+        print(f"{workers:>8} {report['startup_seconds']:>8.1f} {report['requests_per_sec']:>8.2f} "
+              f"{report['p50_ms']:>8.0f} {report['p95_ms']:>8.0f} {report['total_pss_bytes'] / 1e6:>8.0f} "
+              f"{report['requests_per_sec'] / baseline:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
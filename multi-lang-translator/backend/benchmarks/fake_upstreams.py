@@ -0,0 +1,155 @@
+"""Local stand-ins for the network services the backend talks to.
+
+They mimic the small slice of each library's API the app uses, with
+configurable latency and failure rates, so load tests run offline.
+"""
+import asyncio
+import hashlib
+import random
+import sys
+import threading
+import time
+import types
+
+
+class FakeUpstream:
+    """Shared knobs for one fake service; tweak them mid-run to simulate outages"""
+
+    def __init__(self, latency=0.05, jitter=0.01, failure_rate=0.0, seed=None, slow_rate=0.0, slow_latency=1.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        # A slow_rate share of calls take slow_latency instead: the long tail hedging is for
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """(delay, failed) for the next call"""
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            if self._random.random() < self.slow_rate:
+                delay = self.slow_latency
+            failed = self._random.random() < self.failure_rate
+        return delay, failed
+
+    def call(self):
+        delay, failed = self.draw()
+        time.sleep(delay)
+        if failed:
+            raise ConnectionError("fake upstream failure")
+
+    async def acall(self):
+        delay, failed = self.draw()
+        await asyncio.sleep(delay)
+        if failed:
+            raise ConnectionError("fake upstream failure")
+
+
+class _Result:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGoogleTranslator:
+    """googletrans.Translator look-alike: translate(text, src=, dest=).text"""
+
+    def __init__(self, upstream):
+        self.upstream = upstream
+
+    def translate(self, text, src='auto', dest='en'):
+        self.upstream.call()
+        return _Result(f"[{dest}] {text}")
+
+
+def fake_audio(text, voice, size_per_char=160):
+    """Deterministic MP3-sized bytes for a phrase; not playable, but cacheable and comparable"""
+    digest = hashlib.sha256(f'{voice}\x1f{text}'.encode('utf-8')).digest()
+    size = max(1024, len(text) * size_per_char)
+    return b'ID3' + (digest * (size // len(digest) + 1))[:size - 3]
+
+
+class FakeCommunicate:
+    """edge_tts.Communicate look-alike: stream() yields a word boundary and audio chunks"""
+
+    upstream = None  # set by install()
+
+    def __init__(self, text, voice, **kwargs):
+        self.text = text
+        self.voice = voice
+
+    async def stream(self):
+        await self.upstream.acall()
+        audio = fake_audio(self.text, self.voice)
+        yield {'type': 'WordBoundary', 'text': self.text.split()[0] if self.text.split() else '', 'offset': 0}
+        for start in range(0, len(audio), 4096):
+            yield {'type': 'audio', 'data': audio[start:start + 4096]}
+
+
+class FakeGTTS:
+    """gtts.gTTS look-alike: gTTS(text=, lang=, slow=, tld=).write_to_fp(fp)"""
+
+    upstream = None  # set by install()
+
+    def __init__(self, text, lang='en', slow=False, tld='com', **kwargs):
+        self.text = text
+        self.voice = f'gtts-{lang}-{tld}-{slow}'
+
+    def write_to_fp(self, fp):
+        self.upstream.call()
+        fp.write(fake_audio(self.text, self.voice))
+
+
+def fake_inference_backend(latency=0.05, per_item=0.005):
+    """An InferenceBackend subclass whose generate() sleeps instead of running M2M100"""
+    from inference_backends import InferenceBackend
+
+    class FakeTokenizer:
+        def tokenize(self, text):
+            return text.split()
+
+    class FakeInferenceBackend(InferenceBackend):
+        name = 'fake'
+
+        def _load(self):
+            self.model = object()
+            self.tokenizer = FakeTokenizer()
+
+        def generate(self, texts, source_code, target_code):
+            self.load()
+            start = time.perf_counter()
+            time.sleep(latency + per_item * len(texts))
+            self.generate_seconds += time.perf_counter() - start
+            self.generated_tokens += sum(len(text.split()) for text in texts)
+            return [f"<{target_code}> {text}" for text in texts]
+
+        def generate_targets_batch(self, texts, source_code, target_lists):
+            # One shared encode; each (text, target) costs about one more batch row
+            self.load()
+            rows = sum(len(codes) for codes in target_lists)
+            start = time.perf_counter()
+            time.sleep(latency + per_item * rows)
+            self.generate_seconds += time.perf_counter() - start
+            self.generated_tokens += sum(len(text.split()) * len(codes) for text, codes in zip(texts, target_lists))
+            return [[f"<{code}> {text}" for code in codes] for text, codes in zip(texts, target_lists)]
+
+    return FakeInferenceBackend
+
+
+def install(google, edge, gtts, model=None):
+    """Put the fakes where the app's lazy imports look; call before importing app
+
+    google, edge and gtts are FakeUpstreams for googletrans, edge_tts and gTTS.
+    model=(latency, per_item) also registers INFERENCE_BACKEND=fake.
+    """
+    modules = {name: types.ModuleType(name) for name in ('googletrans', 'edge_tts', 'gtts')}
+    modules['googletrans'].Translator = lambda: FakeGoogleTranslator(google)
+    modules['edge_tts'].Communicate = type('Communicate', (FakeCommunicate,), {'upstream': edge})
+    modules['gtts'].gTTS = type('gTTS', (FakeGTTS,), {'upstream': gtts})
+    sys.modules.update(modules)
+    if model is not None:
+        import inference_backends
+        inference_backends.BACKENDS['fake'] = fake_inference_backend(*model)
@@ -0,0 +1,171 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import STAGE_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+# Threads translating chat messages; bounded so a burst can't spawn unbounded upstream calls
+CHAT_TRANSLATE_WORKERS = int(os.getenv('CHAT_TRANSLATE_WORKERS', '16'))
+
+
+def language_channel(room, lang):
+    """Socket.IO room holding the members of `room` who read `lang`"""
+    return f'{room}/lang:{lang}'
+
+
+class RoomMembers:
+    """Which sockets are in which room, and the language each one reads"""
+
+    def __init__(self):
+        self._rooms = {}  # room -> {sid: lang}
+        self._lock = threading.Lock()
+
+    def join(self, room, sid, lang):
+        """Add or update a member; returns their previous language in the room (or None)"""
+        with self._lock:
+            members = self._rooms.setdefault(room, {})
+            previous = members.get(sid)
+            members[sid] = lang
+            return previous
+
+    def leave(self, room, sid):
+        """Remove a member; returns the language they were reading (or None)"""
+        with self._lock:
+            members = self._rooms.get(room, {})
+            lang = members.pop(sid, None)
+            if not members:
+                self._rooms.pop(room, None)
+            return lang
+
+    def leave_all(self, sid):
+        """Drop a disconnected socket everywhere; returns [(room, lang), ...]"""
+        with self._lock:
+            left = []
+            for room, members in list(self._rooms.items()):
+                if sid in members:
+                    left.append((room, members.pop(sid)))
+                    if not members:
+                        del self._rooms[room]
+            return left
+
+    def rooms_of(self, sid):
+        with self._lock:
+            return [(room, members[sid]) for room, members in self._rooms.items() if sid in members]
+
+    def languages(self, room):
+        with self._lock:
+            return set(self._rooms.get(room, {}).values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                'rooms': len(self._rooms),
+                'members': sum(len(members) for members in self._rooms.values()),
+            }
+
+
+class ChatFanout:
+    """Translate each chat message once per language present in the room, off the socket handler
+
+    Deliveries go to one channel per (room, language), so every member only
+    receives their own language. Translations of the same (message, source,
+    target) already in flight are shared, across rooms as well. With a
+    cluster, a language pair owned by another node is sent there to be
+    translated and emitted; if no node receives the job, it is translated here.
+    """
+
+    def __init__(self, translate, emit, members, workers=CHAT_TRANSLATE_WORKERS, cluster=None):
+        # translate(message, source_lang, target_lang) -> str; emit(event, data, to=channel)
+        self.translate = translate
+        self.emit = emit
+        self.members = members
+        self.cluster = cluster
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='chat-fanout')
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.translations = 0
+        self.shared = 0
+        self.deliveries = 0
+        self.forwarded = 0
+        if cluster is not None:
+            cluster.on('chat', self._on_forwarded)
+
+    def publish(self, room, message, source_lang, payload):
+        """Schedule delivery of `message` to every language in `room` and return immediately"""
+        sent_at = time.perf_counter()
+        for lang in self.members.languages(room):
+            if lang == source_lang:
+                self._deliver(room, lang, payload, message, sent_at)
+                continue
+            owner = self.cluster.owner(source_lang, lang) if self.cluster is not None else None
+            if owner is not None and owner != self.cluster.node_id:
+                if self.cluster.send(owner, 'chat', (room, message, source_lang, lang, payload)):
+                    with self._lock:
+                        self.forwarded += 1
+                    continue
+                logger.warning("Node %s didn't take %s->%s for room %s; translating here",
+                               owner, source_lang, lang, room)
+            self._schedule(room, message, source_lang, lang, payload, sent_at)
+
+    def _schedule(self, room, message, source_lang, lang, payload, sent_at):
+        future = self._translation(message, source_lang, lang)
+        future.add_done_callback(lambda f: self._deliver(room, lang, payload, self._result(f, message), sent_at))
+
+    def _on_forwarded(self, job):
+        # Latency on this node starts at arrival; clocks of different nodes aren't comparable
+        room, message, source_lang, lang, payload = job
+        self._schedule(room, message, source_lang, lang, payload, time.perf_counter())
+
+    def _translation(self, message, source_lang, target_lang):
+        key = (message, source_lang, target_lang)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.shared += 1
+                return future
+            future = self._inflight[key] = self._executor.submit(self._translate_shared, key)
+            self.translations += 1
+            return future
+
+    def _translate_shared(self, key):
+        try:
+            return self.translate(*key)
+        finally:
+            # Finished results live in the translation cache; only in-flight work is shared here
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _result(self, future, message):
+        try:
+            return future.result()
+        except Exception as e:
+            logger.warning("Translation failed for chat: %s", e)
+            return message
+
+    def _deliver(self, room, lang, payload, translated, sent_at):
+        data = dict(payload, translated_message=translated, target_lang=lang)
+        try:
+            self.emit('receive_message', data, to=language_channel(room, lang))
+        except Exception as e:
+            logger.error("Chat delivery to %s failed: %s", language_channel(room, lang), e)
+            return
+        with self._lock:
+            self.deliveries += 1
+        STAGE_SECONDS.observe(time.perf_counter() - sent_at, stage='chat_fanout')
+
+    def stats(self):
+        stats = self.members.stats()
+        with self._lock:
+            stats.update({
+                'translations': self.translations,
+                'shared': self.shared,
+                'deliveries': self.deliveries,
+                'forwarded': self.forwarded,
+                'in_flight': len(self._inflight),
+            })
+        return stats
@@ -0,0 +1,152 @@
+import re
+from collections import namedtuple
+
+
+# A piece of the document to translate plus the whitespace that followed it.
+# Joining text + separator over all chunks gives back the original document.
+Chunk = namedtuple('Chunk', ['text', 'separator'])
+
+# Latin-style terminators only end a sentence when followed by whitespace ("3.14", "e.g.x")
+LATIN_TERMINATORS = '.!?'
+# Closing quotes/brackets that belong to the sentence they end
+CLOSERS = '"\'”’)\\]」』'
+
+# Script terminators that end a sentence even with no whitespace after them
+SCRIPT_TERMINATORS = {
+    'devanagari': '।॥',           # danda, double danda
+    'bengali': '।॥',
+    'gurmukhi': '।॥',
+    'cjk': '。！？．',     # 。！？．
+    'arabic': '؟۔',               # ؟ ۔
+}
+
+LANG_SCRIPTS = {
+    'hi': 'devanagari', 'mr': 'devanagari', 'ne': 'devanagari',
+    'bn': 'bengali', 'pa': 'gurmukhi',
+    'zh': 'cjk', 'ja': 'cjk',
+    'ar': 'arabic', 'ur': 'arabic',
+}
+
+_patterns = {}
+
+
+def _sentence_pattern(lang):
+    script = LANG_SCRIPTS.get(lang)
+    if script not in _patterns:
+        latin = re.escape(LATIN_TERMINATORS)
+        closers = re.escape(CLOSERS)
+        alternatives = [rf'[{latin}]+[{closers}]*(?=\s|$)']
+        if script:
+            alternatives.append(rf'[{re.escape(SCRIPT_TERMINATORS[script])}]+[{closers}]*')
+        # A sentence ends at a terminator (plus trailing space) or at a line break
+        _patterns[script] = re.compile(rf'(?:{"|".join(alternatives)})[^\S\n]*\n*\s*|\s*\n\s*')
+    return _patterns[script]
+
+
+def approx_token_count(text):
+    """Cheap token estimate for when no tokenizer is available"""
+    return len(text) // 3 + 1
+
+
+def split_sentences(text, lang):
+    """Split text into Chunk(sentence, separator) pairs using the script's punctuation"""
+    pieces = []
+    stripped = text.lstrip()
+    if len(stripped) != len(text):
+        pieces.append(Chunk('', text[:len(text) - len(stripped)]))
+
+    pos = len(text) - len(stripped)
+    for match in _sentence_pattern(lang).finditer(text, pos):
+        if match.end() == pos:
+            continue
+        segment = text[pos:match.end()]
+        sentence = segment.rstrip()
+        if sentence:
+            pieces.append(Chunk(sentence, segment[len(sentence):]))
+        elif pieces:
+            pieces[-1] = Chunk(pieces[-1].text, pieces[-1].separator + segment)
+        pos = match.end()
+
+    if pos < len(text):
+        segment = text[pos:]
+        sentence = segment.rstrip()
+        pieces.append(Chunk(sentence, segment[len(sentence):]))
+    return pieces
+
+
+def _split_long(sentence, separator, max_tokens, count_tokens):
+    """Break one over-budget sentence at word (or character) boundaries"""
+    if count_tokens(sentence) <= max_tokens:
+        return [Chunk(sentence, separator)]
+
+    parts = []
+    current = ''
+    for word in re.findall(r'\S+\s*', sentence):
+        if count_tokens(word) > max_tokens:
+            # Unspaced scripts (CJK) can have no word breaks at all
+            if current:
+                parts.append(current)
+                current = ''
+            step = max(1, len(word) * max_tokens // count_tokens(word))
+            parts.extend(word[i:i + step] for i in range(0, len(word), step))
+            continue
+        if current and count_tokens(current + word) > max_tokens:
+            parts.append(current)
+            current = ''
+        current += word
+    if current:
+        parts.append(current)
+
+    chunks = []
+    for part in parts:
+        text = part.rstrip()
+        chunks.append(Chunk(text, part[len(text):]))
+    chunks[-1] = Chunk(chunks[-1].text, chunks[-1].separator + separator)
+    return chunks
+
+
+def sentence_chunks(text, lang, max_tokens=100, count_tokens=approx_token_count):
+    """One chunk per sentence (over-budget sentences split), for callers that diff sentences"""
+    chunks = []
+    for sentence, separator in split_sentences(text, lang):
+        if sentence:
+            chunks.extend(_split_long(sentence, separator, max_tokens, count_tokens))
+        else:
+            chunks.append(Chunk('', separator))
+    return chunks
+
+
+def chunk_text(text, lang, max_tokens=100, count_tokens=approx_token_count):
+    """Group sentences into chunks that fit the model's token budget
+
+    Line breaks always end a chunk so paragraphs and lists keep their layout.
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            body = ''.join(piece.text + piece.separator for piece in current[:-1]) + current[-1].text
+            chunks.append(Chunk(body, current[-1].separator))
+        current = []
+        current_tokens = 0
+
+    for sentence, separator in split_sentences(text, lang):
+        if not sentence:
+            flush()
+            chunks.append(Chunk('', separator))
+            continue
+
+        for piece in _split_long(sentence, separator, max_tokens, count_tokens):
+            tokens = count_tokens(piece.text)
+            if current and current_tokens + tokens > max_tokens:
+                flush()
+            current.append(piece)
+            current_tokens += tokens
+            if '\n' in piece.separator:
+                flush()
+
+    flush()
+    return chunks
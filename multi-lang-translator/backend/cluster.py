@@ -0,0 +1,398 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from urllib.parse import urlparse
+
+from chat_fanout import RoomMembers
+
+
+logger = logging.getLogger(__name__)
+
+# Scale-out: unset keeps rooms and chat fan-out inside this process. local://host:port shares them
+# through a LocalBroker (tests, benchmarks, one machine); redis://host:port/db through Redis
+CLUSTER_URL = os.getenv('CLUSTER_URL', '')
+NODE_ID = os.getenv('CLUSTER_NODE_ID', f'{socket.gethostname()}-{os.getpid()}')
+# Nodes announce themselves this often; one silent for NODE_TTL seconds stops owning language pairs
+HEARTBEAT_INTERVAL = float(os.getenv('CLUSTER_HEARTBEAT_INTERVAL', '2'))
+NODE_TTL = float(os.getenv('CLUSTER_NODE_TTL', '10'))
+LOCAL_AUTHKEY = os.getenv('CLUSTER_LOCAL_AUTHKEY', 'translator').encode()
+
+NODES_KEY = 'translator:nodes'
+
+
+def room_key(room):
+    return f'translator:room:{room}'
+
+
+def node_channel(node):
+    return f'translator:node:{node}'
+
+
+class LocalBroker:
+    """Redis stand-in on a local socket: pub/sub channels, hashes and sorted sets, all in memory"""
+
+    def __init__(self, address=('127.0.0.1', 0), authkey=LOCAL_AUTHKEY):
+        self._listener = Listener(address, authkey=authkey)
+        self.address = self._listener.address
+        self._hashes = {}  # key -> {field: value}
+        self._zsets = {}  # key -> {member: score}
+        self._subscribers = {}  # channel -> [(conn, send lock), ...]
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.address
+        return f'local://{host}:{port}'
+
+    def start(self):
+        threading.Thread(target=self._accept, name='local-broker', daemon=True).start()
+        return self
+
+    def _accept(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        try:
+            while True:
+                command, *args = conn.recv()
+                if command == 'subscribe':
+                    # From here on the connection only receives pushed messages
+                    subscriber = (conn, threading.Lock())
+                    with self._lock:
+                        for channel in args[0]:
+                            self._subscribers.setdefault(channel, []).append(subscriber)
+                        with subscriber[1]:
+                            conn.send(('subscribe', None))
+                    return
+                try:
+                    reply = self._execute(command, args)
+                except Exception as e:
+                    reply = e
+                conn.send(reply)
+        except (EOFError, OSError):
+            conn.close()
+
+    def _execute(self, command, args):
+        if command == 'publish':
+            channel, data = args
+            with self._lock:
+                subscribers = list(self._subscribers.get(channel, ()))
+            for subscriber in subscribers:
+                conn, send_lock = subscriber
+                try:
+                    with send_lock:
+                        conn.send((channel, data))
+                except OSError:
+                    with self._lock:
+                        self._subscribers[channel].remove(subscriber)
+            return len(subscribers)
+        with self._lock:
+            if command == 'hset':
+                key, field, value = args
+                self._hashes.setdefault(key, {})[field] = value
+            elif command == 'hdel':
+                key, field = args
+                fields = self._hashes.get(key, {})
+                fields.pop(field, None)
+                if not fields:
+                    self._hashes.pop(key, None)
+            elif command == 'hgetall':
+                return dict(self._hashes.get(args[0], {}))
+            elif command == 'zadd':
+                key, member, score = args
+                self._zsets.setdefault(key, {})[member] = score
+            elif command == 'zrangebyscore':
+                key, low = args
+                members = self._zsets.get(key, {})
+                return sorted((member for member, score in members.items() if score >= low), key=members.get)
+            elif command == 'zremrangebyscore':
+                key, high = args
+                members = self._zsets.get(key, {})
+                for member in [member for member, score in members.items() if score <= high]:
+                    del members[member]
+            else:
+                raise ValueError(f"Unknown command {command}")
+
+    def close(self):
+        self._listener.close()
+
+
+class LocalStore:
+    """Client for a LocalBroker, with the same methods as RedisStore"""
+
+    def __init__(self, url, authkey=LOCAL_AUTHKEY):
+        parsed = urlparse(url)
+        self.address = (parsed.hostname, parsed.port)
+        self.authkey = authkey
+        self._conn = Client(self.address, authkey=authkey)
+        self._lock = threading.Lock()
+
+    def _call(self, *command):
+        with self._lock:
+            self._conn.send(command)
+            reply = self._conn.recv()
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def publish(self, channel, data):
+        return self._call('publish', channel, data)
+
+    def hset(self, key, field, value):
+        self._call('hset', key, field, value)
+
+    def hdel(self, key, field):
+        self._call('hdel', key, field)
+
+    def hgetall(self, key):
+        return self._call('hgetall', key)
+
+    def zadd(self, key, member, score):
+        self._call('zadd', key, member, score)
+
+    def zrangebyscore(self, key, low):
+        return self._call('zrangebyscore', key, low)
+
+    def zremrangebyscore(self, key, high):
+        self._call('zremrangebyscore', key, high)
+
+    def listen(self, channels):
+        """Subscribe now; returns an iterator of (channel, data) that ends when the broker goes away"""
+        conn = Client(self.address, authkey=self.authkey)
+        conn.send(('subscribe', list(channels)))
+        conn.recv()  # acknowledgement: nothing published from here on is missed
+
+        def messages():
+            try:
+                while True:
+                    yield conn.recv()
+            except (EOFError, OSError):
+                return
+            finally:
+                conn.close()
+        return messages()
+
+
+class RedisStore:
+    """The production store: any server speaking the Redis protocol"""
+
+    def __init__(self, url):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+
+    def publish(self, channel, data):
+        return self._redis.publish(channel, data)
+
+    def hset(self, key, field, value):
+        self._redis.hset(key, field, value)
+
+    def hdel(self, key, field):
+        self._redis.hdel(key, field)
+
+    def hgetall(self, key):
+        return {field.decode(): value.decode() for field, value in self._redis.hgetall(key).items()}
+
+    def zadd(self, key, member, score):
+        self._redis.zadd(key, {member: score})
+
+    def zrangebyscore(self, key, low):
+        return [member.decode() for member in self._redis.zrangebyscore(key, low, '+inf')]
+
+    def zremrangebyscore(self, key, high):
+        self._redis.zremrangebyscore(key, '-inf', high)
+
+    def listen(self, channels):
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(*channels)
+
+        def messages():
+            try:
+                for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        yield message['channel'].decode(), message['data']
+            finally:
+                pubsub.close()
+        return messages()
+
+
+def open_store(url):
+    scheme = urlparse(url).scheme
+    if scheme == 'local':
+        return LocalStore(url)
+    if scheme in ('redis', 'rediss'):
+        return RedisStore(url)
+    raise ValueError(f"Unsupported CLUSTER_URL scheme: {scheme}")
+
+
+def socketio_manager(store, channel='flask-socketio'):
+    """python-socketio client manager that relays every emit to all nodes through store"""
+    import socketio
+
+    class StoreManager(socketio.PubSubManager):
+        name = 'translator-store'
+
+        def _publish(self, data):
+            # JSON, not pickle: anything able to publish to the store could otherwise run code on every node
+            store.publish(self.channel, json.dumps(data))
+
+        def _listen(self):
+            for _, message in store.listen([self.channel]):
+                yield message
+
+    return StoreManager(channel=channel)
+
+
+class SharedRoomMembers(RoomMembers):
+    """RoomMembers whose room languages are the union over all live nodes
+
+    Each node still tracks its own sockets (for set_language and disconnect);
+    every join and leave is mirrored into the store, tagged with the node, so
+    a message is translated into a language even when its readers are on
+    another node. A node that dies never sends its leaves: its members are
+    ignored once it stops heartbeating and deleted once the cluster forgets it.
+    """
+
+    def __init__(self, store, cluster):
+        super().__init__()
+        self.store = store
+        self.cluster = cluster
+
+    def join(self, room, sid, lang):
+        previous = super().join(room, sid, lang)
+        self.store.hset(room_key(room), sid, f'{self.cluster.node_id}|{lang}')
+        return previous
+
+    def leave(self, room, sid):
+        lang = super().leave(room, sid)
+        if lang is not None:
+            self.store.hdel(room_key(room), sid)
+        return lang
+
+    def leave_all(self, sid):
+        left = super().leave_all(sid)
+        for room, _ in left:
+            self.store.hdel(room_key(room), sid)
+        return left
+
+    def languages(self, room):
+        live = set(self.cluster.nodes())
+        languages = set()
+        for sid, member in self.store.hgetall(room_key(room)).items():
+            node, _, lang = member.rpartition('|')
+            if node in live:
+                languages.add(lang)
+            elif self.cluster.forgotten(node):
+                self.store.hdel(room_key(room), sid)
+        return languages
+
+
+class Cluster:
+    """This node's view of its peers: who is alive, which language pairs it owns, and jobs between nodes
+
+    Each (source, target) pair belongs to one live node, chosen by rendezvous
+    hashing, so a pair's translations, cache entries and model batches stay on
+    one node. A node joining or leaving only moves the pairs it gains or had.
+    """
+
+    def __init__(self, store, node_id=NODE_ID, heartbeat=HEARTBEAT_INTERVAL, ttl=NODE_TTL):
+        self.store = store
+        self.node_id = node_id
+        self.heartbeat = heartbeat
+        self.ttl = ttl
+        self._nodes = [node_id]
+        self._known = None  # every node heartbeating within the prune horizon; None until the first beat
+        self._handlers = {}
+        self._stop = threading.Event()
+        self.sent = 0
+        self.unrouted = 0
+        self.received = 0
+
+    def start(self):
+        # Subscribed before the first heartbeat, so no peer routes a job here that nobody hears
+        messages = self.store.listen([node_channel(self.node_id)])
+        self._beat()
+        threading.Thread(target=self._heartbeat_loop, name='cluster-heartbeat', daemon=True).start()
+        threading.Thread(target=self._listen, args=(messages,), name='cluster-jobs', daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _beat(self):
+        now = time.time()
+        self.store.zadd(NODES_KEY, self.node_id, now)
+        self.store.zremrangebyscore(NODES_KEY, now - self.ttl * 10)
+        known = set(self.store.zrangebyscore(NODES_KEY, now - self.ttl * 10)) | {self.node_id}
+        self._nodes = sorted(set(self.store.zrangebyscore(NODES_KEY, now - self.ttl)) | {self.node_id})
+        self._known = known
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat):
+            try:
+                self._beat()
+            except Exception as e:
+                logger.warning("Cluster heartbeat failed: %s", e)
+
+    def nodes(self):
+        return list(self._nodes)
+
+    def forgotten(self, node):
+        """True once node has been silent past the prune horizon (ttl * 10), i.e. it is not coming back"""
+        return self._known is not None and node not in self._known
+
+    def owner(self, source_lang, target_lang):
+        """Node responsible for translating source_lang -> target_lang"""
+        def weight(node):
+            return hashlib.sha1(f'{node}\x00{source_lang}\x00{target_lang}'.encode('utf-8')).digest()
+        return max(self._nodes, key=weight)
+
+    def on(self, kind, handler):
+        """Run handler(payload) for each job of this kind sent to this node"""
+        self._handlers[kind] = handler
+
+    def send(self, node, kind, payload):
+        """Hand a job to node; False if nobody received it (node gone, or the store unreachable)"""
+        try:
+            receivers = self.store.publish(node_channel(node), json.dumps([kind, payload]))
+        except Exception as e:
+            logger.warning("Cluster job to %s not sent: %s", node, e)
+            receivers = 0
+        if not receivers:
+            self.unrouted += 1
+            return False
+        self.sent += 1
+        return True
+
+    def _listen(self, messages):
+        while not self._stop.is_set():
+            try:
+                for _, data in messages:
+                    kind, payload = json.loads(data)
+                    self.received += 1
+                    try:
+                        self._handlers[kind](payload)
+                    except Exception:
+                        logger.exception("Cluster job %s failed", kind)
+            except Exception as e:
+                logger.warning("Cluster job listener dropped: %s", e)
+            if self._stop.wait(self.heartbeat):
+                return
+            try:
+                messages = self.store.listen([node_channel(self.node_id)])
+            except Exception as e:
+                logger.warning("Cluster job listener can't resubscribe: %s", e)
+                messages = ()
+
+    def stats(self):
+        return {'node': self.node_id, 'nodes': len(self._nodes), 'sent': self.sent, 'unrouted': self.unrouted,
+                'received': self.received}
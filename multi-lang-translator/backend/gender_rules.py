@@ -0,0 +1,126 @@
+import os
+import re
+
+
+# Speaker-gender rewrites per language: GENDER_RULES[lang][gender] = {word: replacement}
+_HINDI_RULES = {
+    'male': {
+        # Present continuous (रहा/रही)
+        'रही': 'रहा', 'रहीं': 'रहे',
+        # Verb endings
+        'करती': 'करता', 'जाती': 'जाता', 'आती': 'आता', 'खाती': 'खाता',
+        'पीती': 'पीता', 'सोती': 'सोता', 'बोलती': 'बोलता', 'देती': 'देता',
+        'लेती': 'लेता', 'चलती': 'चलता', 'पढ़ती': 'पढ़ता', 'लिखती': 'लिखता',
+        'होती': 'होता', 'कहती': 'कहता', 'सुनती': 'सुनता', 'देखती': 'देखता',
+        # Past tense
+        'गई': 'गया', 'आई': 'आया', 'की': 'किया'
+    },
+    'female': {
+        # Present continuous (रहा/रही)
+        'रहा': 'रही', 'रहे': 'रहीं',
+        # Verb endings
+        'करता': 'करती', 'जाता': 'जाती', 'आता': 'आती', 'खाता': 'खाती',
+        'पीता': 'पीती', 'सोता': 'सोती', 'बोलता': 'बोलती', 'देता': 'देती',
+        'लेता': 'लेती', 'चलता': 'चलती', 'पढ़ता': 'पढ़ती', 'लिखता': 'लिखती',
+        'होता': 'होती', 'कहता': 'कहती', 'सुनता': 'सुनती', 'देखता': 'देखती',
+        # Past tense
+        'गया': 'गई', 'आया': 'आई', 'किया': 'की'
+    },
+}
+
+GENDER_RULES = {
+    'hi': _HINDI_RULES,
+    'ur': _HINDI_RULES,
+    'pa': {
+        'male': {
+            'ਕਰਦੀ': 'ਕਰਦਾ', 'ਜਾਂਦੀ': 'ਜਾਂਦਾ', 'ਆਉਂਦੀ': 'ਆਉਂਦਾ',
+            'ਰਹੀ': 'ਰਿਹਾ'
+        },
+        'female': {
+            'ਕਰਦਾ': 'ਕਰਦੀ', 'ਜਾਂਦਾ': 'ਜਾਂਦੀ', 'ਆਉਂਦਾ': 'ਆਉਂਦੀ',
+            'ਰਿਹਾ': 'ਰਹੀ'
+        },
+    },
+    'ne': {
+        'male': {
+            'छिन्': 'छु', 'छिन्न्': 'छु', 'छी': 'छु',
+            'गर्छिन्': 'गर्छु', 'हुन्छिन्': 'हुन्छु'
+        },
+        'female': {
+            'छु': 'छिन्', 'छ': 'छिन्', 'गर्छु': 'गर्छिन्',
+            'हुन्छु': 'हुन्छिन्'
+        },
+    },
+    # Bengali verbs don't change with the speaker's gender
+    'bn': {'male': {}, 'female': {}},
+}
+
+# Indic vowel signs, viramas and nuktas aren't \w to Python's re, so spell out
+# what counts as "inside a word": Indic blocks minus the danda/double danda,
+# Arabic-script combining marks, and ZWNJ/ZWJ.
+_WORD_CHARS = r'\w\u0900-\u0963\u0966-\u0DFF\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u200C\u200D'
+
+
+def _split_ending(word, replacement):
+    """(stem, old ending, new ending) for a rule; the old ending is never empty"""
+    stem_length = min(len(os.path.commonprefix([word, replacement])), len(word) - 1)
+    return word[:stem_length], word[stem_length:], replacement[stem_length:]
+
+
+def _reversed_stems(stems):
+    """Alternation over the reversed stems, shaped like a trie, each ending on a word boundary"""
+    trie = {}
+    for stem in stems:
+        node = trie
+        for char in reversed(stem):
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def branch(node):
+        options = [re.escape(char) + branch(child) for char, child in sorted(node.items()) if char]
+        if '' in node:
+            options.append(rf'(?![{_WORD_CHARS}])')
+        return options[0] if len(options) == 1 else '(?:' + '|'.join(options) + ')'
+
+    return branch(trie)
+
+
+def _compile(rules):
+    # The rules differ only in a short ending ('करता' -> 'करती' is 'ा' -> 'ी'), so
+    # group them by (old, new) ending and run one re.sub per group with a plain
+    # string replacement. The patterns run over the reversed text so that they
+    # start with the ending as a literal, which re scans for quickly; the stem
+    # and both word boundaries are only checked where that literal occurs, so
+    # the 'की' at the end of 'लड़की' is left alone. Separate passes still rewrite
+    # each word at most once because no replacement is a rule word itself.
+    by_ending = {}
+    for word, replacement in rules.items():
+        stem, old, new = _split_ending(word, replacement)
+        by_ending.setdefault((old, new), []).append(stem)
+    passes = []
+    for (old, new), stems in sorted(by_ending.items()):
+        pattern = re.compile(
+            rf'{re.escape(old[::-1])}(?={_reversed_stems(stems)})(?<![{_WORD_CHARS}].{{{len(old)}}})')
+        passes.append((old, pattern, new[::-1]))
+    return passes
+
+
+# Built once at import: (lang, gender) -> [(old ending, pattern, reversed new ending)]
+_COMPILED = {
+    (lang, gender): _compile(rules)
+    for lang, by_gender in GENDER_RULES.items()
+    for gender, rules in by_gender.items()
+}
+
+
+def apply_gender_rules(text, target_lang, speaker_gender):
+    """Rewrite whole words for the speaker's gender, one pass per shared ending"""
+    gender = 'male' if speaker_gender == 'male' else 'female'
+    reversed_text = None
+    for old, pattern, new in _COMPILED.get((target_lang, gender), ()):
+        if old not in text:
+            continue
+        if reversed_text is None:
+            reversed_text = text[::-1]
+        reversed_text = pattern.sub(new, reversed_text)
+    return text if reversed_text is None else reversed_text[::-1]
@@ -0,0 +1,171 @@
+import os
+import queue
+import random
+import threading
+import time
+
+
+POOL_SIZE = int(os.getenv('GOOGLE_POOL_SIZE', '8'))
+ACQUIRE_TIMEOUT = float(os.getenv('GOOGLE_ACQUIRE_TIMEOUT', '5'))
+RETRIES = int(os.getenv('GOOGLE_RETRIES', '2'))
+BACKOFF_BASE = float(os.getenv('GOOGLE_BACKOFF_BASE', '0.2'))
+BACKOFF_MAX = float(os.getenv('GOOGLE_BACKOFF_MAX', '2'))
+BREAKER_THRESHOLD = int(os.getenv('GOOGLE_BREAKER_THRESHOLD', '5'))
+BREAKER_RESET = float(os.getenv('GOOGLE_BREAKER_RESET', '30'))
+
+
+class CircuitOpenError(Exception):
+    """Upstream is considered down; callers should use their fallback right away"""
+
+
+class PoolExhaustedError(Exception):
+    """No client became free within the acquire timeout"""
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open probe after a cooldown"""
+
+    def __init__(self, failure_threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+            # Only one trial request while half-open
+            if self.state == 'half_open' and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._probing = False
+
+    def cancel(self):
+        """The allowed call never reached the upstream; free the half-open probe for the next caller"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class TranslatorPool:
+    """Warm, reusable translator clients with an in-flight cap, retries and a circuit breaker
+
+    client_factory() must return an object with translate(text, src=, dest=) -> result.text,
+    e.g. googletrans.Translator, which keeps its HTTP session alive between calls.
+    """
+
+    def __init__(self, client_factory, size=POOL_SIZE, acquire_timeout=ACQUIRE_TIMEOUT,
+                 retries=RETRIES, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX, breaker=None):
+        self.client_factory = client_factory
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()  # most recently used first, so warm sessions get reused
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.clients_created = 0
+        self.requests = 0
+        self.failures = 0
+        self.retried = 0
+        self.short_circuited = 0
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise PoolExhaustedError(f"No translator client free after {self.acquire_timeout}s")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                client = self.client_factory()
+            except Exception:
+                self._slots.release()
+                raise
+            with self._lock:
+                self.clients_created += 1
+            return client
+
+    def _release(self, client):
+        if client is not None:
+            self._idle.put(client)
+        self._slots.release()
+
+    def _backoff(self, attempt):
+        # Full jitter keeps retrying callers from hitting the upstream in lockstep
+        time.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt))))
+
+    def translate(self, text, src, dest):
+        """Translate through a pooled client; raises CircuitOpenError when the upstream is down"""
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow():
+                with self._lock:
+                    self.short_circuited += 1
+                raise CircuitOpenError("Google Translate circuit is open") from last_error
+            if attempt:
+                with self._lock:
+                    self.retried += 1
+
+            try:
+                client = self._acquire()
+            except BaseException:
+                # Says nothing about the upstream, but must not leave a half-open probe outstanding
+                self.breaker.cancel()
+                raise
+            with self._lock:
+                self.in_flight += 1
+                self.requests += 1
+            try:
+                translated = client.translate(text, src=src, dest=dest).text
+            except Exception as e:
+                last_error = e
+                self.breaker.record_failure()
+                with self._lock:
+                    self.failures += 1
+                # Don't hand a client with broken session/token state to the next caller
+                client = None
+            else:
+                self.breaker.record_success()
+                return translated
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                self._release(client)
+
+            if attempt < self.retries:
+                self._backoff(attempt)
+        raise last_error
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.breaker.state,
+                'in_flight': self.in_flight,
+                'clients_created': self.clients_created,
+                'requests': self.requests,
+                'failures': self.failures,
+                'retries': self.retried,
+                'short_circuited': self.short_circuited,
+            }
@@ -0,0 +1,207 @@
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from inference_backends import current_rss_bytes
+from metrics import GOVERNOR_ACTIONS
+
+
+logger = logging.getLogger(__name__)
+
+# Process RSS watermarks: above soft, collect garbage; above hard, also shrink caches and drop an idle model
+MEMORY_SOFT_LIMIT_BYTES = int(os.getenv('MEMORY_SOFT_LIMIT_BYTES', str(3 * 1024 * 1024 * 1024)))
+MEMORY_HARD_LIMIT_BYTES = int(os.getenv('MEMORY_HARD_LIMIT_BYTES', str(4 * 1024 * 1024 * 1024)))
+# How often the governor samples memory, off the request path
+MEMORY_CHECK_INTERVAL = float(os.getenv('MEMORY_CHECK_INTERVAL', '5'))
+# Share of each in-process cache dropped when the hard watermark is crossed
+MEMORY_SHRINK_FRACTION = float(os.getenv('MEMORY_SHRINK_FRACTION', '0.5'))
+# Minimum seconds between two collections (or two cache shrinks) while RSS stays above the watermark
+MEMORY_ACTION_COOLDOWN = float(os.getenv('MEMORY_ACTION_COOLDOWN', '60'))
+# Unload the model after this many seconds without a generate call (0, the default, keeps it loaded)
+MODEL_IDLE_UNLOAD_SECONDS = float(os.getenv('MODEL_IDLE_UNLOAD_SECONDS', '0'))
+# Total MP3 bytes that streaming TTS may hold in memory for the audio cache
+AUDIO_BUFFER_MAX_BYTES = int(os.getenv('AUDIO_BUFFER_MAX_BYTES', str(64 * 1024 * 1024)))
+
+
+def allocator_stats():
+    """Bytes held by the CUDA caching allocator ({} until torch is imported or without CUDA)"""
+    # Only touch CUDA if something already imported torch (i.e. the model is loaded)
+    torch = sys.modules.get('torch')
+    if torch is None or not torch.cuda.is_available():
+        return {}
+    return {'allocated': torch.cuda.memory_allocated(), 'reserved': torch.cuda.memory_reserved()}
+
+
+def release_allocator():
+    torch = sys.modules.get('torch')
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+class BufferBudget:
+    """Shared byte allowance for in-memory buffers; a reservation that doesn't fit is refused, not waited for"""
+
+    def __init__(self, max_bytes=AUDIO_BUFFER_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self.refused = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, size):
+        with self._lock:
+            if self.used + size > self.max_bytes:
+                self.refused += 1
+                return False
+            self.used += size
+            return True
+
+    def release(self, size):
+        with self._lock:
+            self.used -= size
+
+
+class MemoryGovernor:
+    """Watches process memory from a background thread and acts only when it has to
+
+    Garbage collection runs when RSS crosses the soft watermark instead of on
+    every request. Past the hard watermark the registered caches are shrunk
+    and an idle model is unloaded. Each action then waits out cooldown seconds
+    before repeating, so a process that stays above a watermark (e.g. because
+    its working set is just that big) isn't collected on every pass and its
+    caches aren't drained; RSS falling back under the soft watermark re-arms
+    both. Optionally, a model nobody has used for idle_unload seconds is
+    unloaded; the next generate loads it again.
+    """
+
+    def __init__(self, soft_limit=MEMORY_SOFT_LIMIT_BYTES, hard_limit=MEMORY_HARD_LIMIT_BYTES,
+                 interval=MEMORY_CHECK_INTERVAL, shrink_fraction=MEMORY_SHRINK_FRACTION,
+                 idle_unload=MODEL_IDLE_UNLOAD_SECONDS, cooldown=MEMORY_ACTION_COOLDOWN):
+        self.soft_limit = soft_limit
+        self.hard_limit = max(hard_limit, soft_limit)
+        self.interval = interval
+        self.shrink_fraction = shrink_fraction
+        self.idle_unload = idle_unload
+        self.cooldown = cooldown
+        self._acted_at = {}  # 'collect' / 'shrink' -> monotonic time it last ran above a watermark
+        self._caches = {}  # name -> shrink(fraction) returning entries dropped
+        self._model = None
+        self._active = 0
+        self._last_used = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.rss_bytes = current_rss_bytes()
+        self.last_check = None
+
+    def register_cache(self, name, shrink):
+        self._caches[name] = shrink
+
+    def manage_model(self, backend):
+        """Let the governor unload backend when idle or under pressure (in-process serving only)"""
+        self._model = backend
+
+    @contextmanager
+    def model_session(self):
+        """Wrap every use of the model so it is never unloaded underneath a generate call"""
+        with self._lock:
+            self._active += 1
+            self._last_used = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._last_used = time.monotonic()
+
+    def idle_seconds(self):
+        with self._lock:
+            return 0.0 if self._active else time.monotonic() - self._last_used
+
+    def _unload_model(self, reason):
+        # Held across the unload so no model_session can start until it is done
+        with self._lock:
+            if self._model is None or self._active or not self._model.loaded:
+                return False
+            self._model.unload()
+        GOVERNOR_ACTIONS.inc(action='unload', reason=reason)
+        logger.info("Model unloaded (%s)", reason)
+        return True
+
+    def _collect(self, reason):
+        start = time.perf_counter()
+        collected = gc.collect()
+        release_allocator()
+        GOVERNOR_ACTIONS.inc(action='collect', reason=reason)
+        logger.debug("gc (%s) freed %d objects in %.1fms", reason, collected, (time.perf_counter() - start) * 1000)
+
+    def check(self):
+        """One governor pass; returns the actions taken"""
+        actions = []
+        self.last_check = time.time()
+        if self.idle_unload > 0 and self.idle_seconds() > self.idle_unload and self._unload_model('idle'):
+            self._collect('idle')
+            actions += ['unload', 'collect']
+
+        self.rss_bytes = current_rss_bytes()
+        if self.rss_bytes < self.soft_limit:
+            self._acted_at.clear()
+            return actions
+
+        if self._cooled_down('collect'):
+            self._collect('soft_watermark')
+            actions.append('collect')
+            self.rss_bytes = current_rss_bytes()
+        if self.rss_bytes < self.hard_limit or not self._cooled_down('shrink'):
+            return actions
+
+        logger.warning("RSS %.0f MB above hard watermark %.0f MB", self.rss_bytes / 1e6, self.hard_limit / 1e6)
+        for name, shrink in self._caches.items():
+            dropped = shrink(self.shrink_fraction)
+            GOVERNOR_ACTIONS.inc(action='shrink', reason='hard_watermark')
+            logger.info("Shrank %s cache by %d entries", name, dropped)
+        actions.append('shrink')
+        if self._unload_model('hard_watermark'):
+            actions.append('unload')
+        self._collect('hard_watermark')
+        actions.append('collect')
+        self.rss_bytes = current_rss_bytes()
+        return actions
+
+    def _cooled_down(self, action):
+        """True, and starts a new cooldown, if action hasn't run above a watermark within the last cooldown seconds"""
+        now = time.monotonic()
+        last = self._acted_at.get(action)
+        if last is not None and now - last < self.cooldown:
+            return False
+        self._acted_at[action] = now
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Memory governor check failed")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='memory-governor', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        return {
+            'rss_bytes': self.rss_bytes,
+            'soft_limit_bytes': self.soft_limit,
+            'hard_limit_bytes': self.hard_limit,
+            'model_idle_seconds': self.idle_seconds(),
+            'model_sessions': self._active,
+            'allocator': allocator_stats(),
+            'last_check': self.last_check,
+        }
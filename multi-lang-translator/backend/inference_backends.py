@@ -0,0 +1,268 @@
+import logging
+import os
+import resource
+import threading
+import time
+
+from metrics import timed
+
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = os.getenv('TRANSLATION_MODEL', 'facebook/m2m100_418M')
+# Where the ONNX export is kept so it only happens once per machine
+ONNX_EXPORT_DIR = os.getenv('ONNX_EXPORT_DIR', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'cache', 'onnx', MODEL_NAME.replace('/', '--')))
+# Weight initialisation seed for INFERENCE_BACKEND=tiny-random
+TINY_MODEL_SEED = int(os.getenv('TINY_MODEL_SEED', '0'))
+
+
+def current_rss_bytes():
+    """Resident set size of this process (peak RSS where /proc isn't available)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        return peak if peak > 1 << 32 else peak * 1024
+
+
+class InferenceBackend:
+    """M2M100 behind one interface: load() once, then generate(texts, source_code, target_code)"""
+
+    name = 'base'
+
+    def __init__(self, model_name=MODEL_NAME):
+        self.model_name = model_name
+        self.model = None
+        self.tokenizer = None
+        self.device = 'cpu'
+        self.load_seconds = None
+        self.load_rss_bytes = None
+        self.generated_tokens = 0
+        self.generate_seconds = 0.0
+        self.loads = 0
+        self.unloads = 0
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self.model is not None
+
+    def load(self):
+        with self._lock:
+            if self.model is not None:
+                return
+            logger.info("Loading M2M100 model (%s backend)...", self.name)
+            rss_before = current_rss_bytes()
+            start = time.perf_counter()
+            with timed('model_load'):
+                self._load()
+            self.load_seconds = time.perf_counter() - start
+            self.load_rss_bytes = current_rss_bytes() - rss_before
+            self.loads += 1
+            logger.info("%s backend loaded in %.1fs (+%.0f MB RSS)",
+                        self.name, self.load_seconds, self.load_rss_bytes / 1e6)
+
+    def unload(self):
+        """Drop the weights, keeping the tokenizer; the next load() reads them back"""
+        with self._lock:
+            if self.model is None:
+                return
+            self.model = None
+            self.unloads += 1
+            logger.info("%s backend unloaded", self.name)
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _load_tokenizer(self):
+        from transformers import M2M100Tokenizer
+        self.tokenizer = M2M100Tokenizer.from_pretrained(self.model_name)
+
+    def generate(self, texts, source_code, target_code):
+        """Run one padded generate over texts that share a language pair"""
+        self.load()
+        import torch
+
+        # OPTIMIZED: Faster tokenization and generation
+        self.tokenizer.src_lang = source_code
+        with timed('tokenize'):
+            encoded = self.tokenizer(texts, return_tensors="pt", max_length=128, truncation=True, padding=True)
+        if self.device != 'cpu':
+            encoded = {k: v.to(self.device) for k, v in encoded.items()}
+
+        start = time.perf_counter()
+        # MUCH FASTER generation parameters
+        with torch.no_grad(), timed('generate'):  # Disable gradient computation for speed
+            generated_tokens = self.model.generate(
+                **encoded,
+                forced_bos_token_id=self.tokenizer.get_lang_id(target_code),
+                max_length=150,      # Reduced from 300
+                num_beams=1,         # Reduced from 3 (greedy search - fastest)
+                do_sample=False,     # No sampling for speed
+                early_stopping=True,
+                pad_token_id=self.tokenizer.pad_token_id,
+                use_cache=True       # Reuse decoder key/values between steps
+            )
+        self.generate_seconds += time.perf_counter() - start
+        self.generated_tokens += int((generated_tokens != self.tokenizer.pad_token_id).sum())
+
+        return self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+
+    def generate_targets(self, text, source_code, target_codes):
+        """Translate one text into several languages: one encoder pass, one batched decode"""
+        return self.generate_targets_batch([text], source_code, [target_codes])[0]
+
+    def generate_targets_batch(self, texts, source_code, target_lists):
+        """Each text into its own list of languages, all in one encoder pass and one batched decode
+
+        Returns one list of translations per text, in the order of its target_lists entry.
+        """
+        self.load()
+        import torch
+        from transformers.modeling_outputs import BaseModelOutput
+
+        self.tokenizer.src_lang = source_code
+        with timed('tokenize'):
+            encoded = self.tokenizer(texts, return_tensors="pt", max_length=128, truncation=True, padding=True)
+        if self.device != 'cpu':
+            encoded = {k: v.to(self.device) for k, v in encoded.items()}
+
+        start = time.perf_counter()
+        with torch.no_grad():
+            with timed('encode'):
+                hidden = self.model.get_encoder()(**encoded).last_hidden_state
+            # One decoder row per (text, target); every row of a text reads that text's encoder states
+            rows = torch.tensor([i for i, codes in enumerate(target_lists) for _ in codes], device=hidden.device)
+            encoder_outputs = BaseModelOutput(last_hidden_state=hidden.index_select(0, rows))
+            # Each row starts </s> <target lang>: forced_bos_token_id, but per row
+            decoder_input_ids = torch.tensor(
+                [[self.model.config.decoder_start_token_id, self.tokenizer.get_lang_id(code)]
+                 for codes in target_lists for code in codes], device=hidden.device)
+            with timed('generate'):
+                generated_tokens = self.model.generate(
+                    encoder_outputs=encoder_outputs,
+                    attention_mask=encoded['attention_mask'].index_select(0, rows),
+                    decoder_input_ids=decoder_input_ids,
+                    max_length=150,
+                    num_beams=1,
+                    do_sample=False,
+                    pad_token_id=self.tokenizer.pad_token_id,
+                    use_cache=True
+                )
+        self.generate_seconds += time.perf_counter() - start
+        self.generated_tokens += int((generated_tokens != self.tokenizer.pad_token_id).sum())
+
+        decoded = iter(self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True))
+        return [[next(decoded) for _ in codes] for codes in target_lists]
+
+    def stats(self):
+        return {
+            'backend': self.name,
+            'loaded': self.loaded,
+            'load_seconds': self.load_seconds,
+            'load_rss_bytes': self.load_rss_bytes,
+            'loads': self.loads,
+            'unloads': self.unloads,
+            'rss_bytes': current_rss_bytes(),
+            'tokens_per_sec': self.generated_tokens / self.generate_seconds if self.generate_seconds else None,
+        }
+
+
+class TorchBackend(InferenceBackend):
+    """The original fp32 PyTorch model (on GPU when one is available)"""
+
+    name = 'torch'
+
+    def _load(self):
+        import torch
+        from transformers import M2M100ForConditionalGeneration
+        self.model = M2M100ForConditionalGeneration.from_pretrained(self.model_name)
+        self._load_tokenizer()
+        self.model.eval()
+
+        if torch.cuda.is_available():
+            logger.info("CUDA available - using GPU")
+            self.device = 'cuda'
+            self.model = self.model.to('cuda')
+        else:
+            logger.info("Using CPU - consider using smaller text chunks")
+
+
+class QuantizedTorchBackend(InferenceBackend):
+    """fp32 weights loaded, then every nn.Linear dynamically quantized to int8 (CPU only)"""
+
+    name = 'torch-int8'
+
+    def _load(self):
+        import torch
+        from transformers import M2M100ForConditionalGeneration
+        model = M2M100ForConditionalGeneration.from_pretrained(self.model_name)
+        model.eval()
+        self.model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self._load_tokenizer()
+
+
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime encoder + decoder-with-past graphs via optimum (CPU execution provider)"""
+
+    name = 'onnx'
+
+    def _load(self):
+        # Optional dependency: pip install "optimum[onnxruntime]"
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+        if os.path.isdir(ONNX_EXPORT_DIR) and os.listdir(ONNX_EXPORT_DIR):
+            self.model = ORTModelForSeq2SeqLM.from_pretrained(ONNX_EXPORT_DIR, use_cache=True)
+        else:
+            logger.info("Exporting %s to ONNX in %s (one-time)", self.model_name, ONNX_EXPORT_DIR)
+            self.model = ORTModelForSeq2SeqLM.from_pretrained(self.model_name, export=True, use_cache=True)
+            self.model.save_pretrained(ONNX_EXPORT_DIR)
+        self._load_tokenizer()
+
+    def generate_targets_batch(self, texts, source_code, target_lists):
+        # The exported encoder and decoder are separate sessions that optimum wires together
+        # inside generate(), so there are no encoder outputs to share: one generate per target
+        return [[self.generate([text], source_code, code)[0] for code in codes]
+                for text, codes in zip(texts, target_lists)]
+
+
+class TinyRandomBackend(InferenceBackend):
+    """A two-layer M2M100 with random weights and the real tokenizer, for benchmarks
+
+    Output is gibberish, but tokenization, batching and generate() run the real
+    code paths at a fraction of the cost, and TINY_MODEL_SEED makes it repeatable.
+    """
+
+    name = 'tiny-random'
+
+    def _load(self):
+        import torch
+        from transformers import M2M100Config, M2M100ForConditionalGeneration
+        self._load_tokenizer()
+        torch.manual_seed(TINY_MODEL_SEED)
+        config = M2M100Config(
+            vocab_size=max(len(self.tokenizer), max(self.tokenizer.get_vocab().values()) + 1),
+            d_model=64, encoder_layers=2, decoder_layers=2, encoder_attention_heads=4,
+            decoder_attention_heads=4, encoder_ffn_dim=128, decoder_ffn_dim=128,
+            pad_token_id=self.tokenizer.pad_token_id, eos_token_id=self.tokenizer.eos_token_id,
+            decoder_start_token_id=self.tokenizer.eos_token_id,
+        )
+        self.model = M2M100ForConditionalGeneration(config)
+        self.model.eval()
+
+
+BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    QuantizedTorchBackend.name: QuantizedTorchBackend,
+    OnnxBackend.name: OnnxBackend,
+    TinyRandomBackend.name: TinyRandomBackend,
+}
+
+
+def create_backend(name, model_name=MODEL_NAME):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {name!r}; choose from {', '.join(BACKENDS)}")
+    return BACKENDS[name](model_name)
@@ -0,0 +1,201 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+
+logger = logging.getLogger(__name__)
+
+# Sentence translations running at once across all live sessions
+LIVE_TRANSLATE_WORKERS = int(os.getenv('LIVE_TRANSLATE_WORKERS', '8'))
+
+
+class Revision:
+    """One version of a live session's text; cancel() aborts whatever it still has queued"""
+
+    def __init__(self, number):
+        self.number = number
+        self.cancelled = False
+        self.finished = False
+        self._futures = []
+        self._lock = threading.Lock()
+
+    def track(self, future):
+        """Tie a future (executor job, batcher request) to this revision's lifetime"""
+        with self._lock:
+            if self.cancelled:
+                future.cancel()
+            else:
+                self._futures.append(future)
+        return future
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            futures, self._futures = self._futures, []
+        for future in futures:
+            future.cancel()
+
+    def check(self):
+        """Raise CancelledError once a newer revision has replaced this one"""
+        if self.cancelled:
+            raise CancelledError()
+
+
+class LiveSession:
+    def __init__(self, source_lang, target_lang, speaker_gender):
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.speaker_gender = speaker_gender
+        self.translations = {}  # sentence -> translation, carried over between revisions
+        self.revision = None
+        self.lock = threading.Lock()
+
+
+class LiveTranslator:
+    """Translate-as-you-type: each revision only re-translates the sentences that changed
+
+    Events sent through emit(event, data):
+      live_revision  every segment of the new revision, null where a translation is pending
+      live_segment   one pending segment filled in
+      live_done      the whole translation, once nothing is pending
+    Events for a revision stop as soon as a newer one arrives.
+    """
+
+    def __init__(self, translate_sentence, split, workers=LIVE_TRANSLATE_WORKERS):
+        # translate_sentence(text, source_lang, target_lang, speaker_gender, revision) -> str
+        # split(text, source_lang) -> [Chunk(text, separator), ...]
+        self.translate_sentence = translate_sentence
+        self.split = split
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='live-translate')
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.sentences_translated = 0
+        self.sentences_reused = 0
+        self.revisions_cancelled = 0
+
+    def update(self, key, number, text, source_lang, target_lang, speaker_gender, emit):
+        """Start translating revision `number`; returns False if a newer one was already seen"""
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = LiveSession(source_lang, target_lang, speaker_gender)
+
+        start = time.perf_counter()
+        chunks = self.split(text, source_lang)
+        with session.lock:
+            previous = session.revision
+            if previous is not None and number <= previous.number:
+                return False
+            if previous is not None and not previous.finished:
+                previous.cancel()
+                with self._lock:
+                    self.revisions_cancelled += 1
+            if (source_lang, target_lang, speaker_gender) != (
+                    session.source_lang, session.target_lang, session.speaker_gender):
+                session.source_lang, session.target_lang, session.speaker_gender = source_lang, target_lang, speaker_gender
+                session.translations.clear()
+            # Only sentences still in the text are worth keeping; dropping the rest here, not when a
+            # revision finishes, keeps the map bounded while fast typing cancels revision after revision
+            sentences = {chunk.text for chunk in chunks if chunk.text}
+            session.translations = {sentence: translated for sentence, translated in session.translations.items()
+                                    if sentence in sentences}
+            revision = session.revision = Revision(number)
+            known = dict(session.translations)
+
+        results = [chunk.separator if not chunk.text else None for chunk in chunks]
+        pending = {}
+        for index, chunk in enumerate(chunks):
+            if not chunk.text:
+                continue
+            if chunk.text in known:
+                results[index] = known[chunk.text] + chunk.separator
+            else:
+                # The same sentence twice in a document is translated once
+                pending.setdefault(chunk.text, []).append(index)
+        with self._lock:
+            self.sentences_translated += len(pending)
+            self.sentences_reused += sum(1 for chunk in chunks if chunk.text) - sum(map(len, pending.values()))
+
+        session_id = key[-1]
+        emit('live_revision', {'session_id': session_id, 'revision': number, 'segments': list(results)})
+        if not pending:
+            self._finish(session, revision, chunks, results, emit, session_id, start)
+            return True
+
+        remaining = [len(pending)]
+        lock = threading.Lock()
+
+        def on_done(future, sentence):
+            if future.cancelled() or revision.cancelled:
+                return
+            failed = False
+            try:
+                translated = future.result()
+            except CancelledError:
+                return
+            except Exception as e:
+                logger.error("Live translation failed: %s", e)
+                translated = f"[Translation unavailable] {sentence}"
+                failed = True
+            with session.lock:
+                if revision.cancelled:
+                    return
+                # A failure is shown for this revision only; the next one translates the sentence again
+                if not failed:
+                    session.translations[sentence] = translated
+            for index in pending[sentence]:
+                results[index] = translated + chunks[index].separator
+                emit('live_segment', {'session_id': session_id, 'revision': number,
+                                      'index': index, 'text': results[index]})
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                self._finish(session, revision, chunks, results, emit, session_id, start)
+
+        for sentence in pending:
+            future = revision.track(self._executor.submit(
+                self._translate, sentence, source_lang, target_lang, speaker_gender, revision))
+            future.add_done_callback(lambda f, sentence=sentence: on_done(f, sentence))
+        return True
+
+    def _translate(self, sentence, source_lang, target_lang, speaker_gender, revision):
+        revision.check()
+        return self.translate_sentence(sentence, source_lang, target_lang, speaker_gender, revision)
+
+    def _finish(self, session, revision, chunks, results, emit, session_id, start):
+        with session.lock:
+            if revision.cancelled:
+                return
+            revision.finished = True
+        emit('live_done', {
+            'session_id': session_id,
+            'revision': revision.number,
+            'text': ''.join(results),
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+        })
+
+    def close(self, key):
+        with self._lock:
+            session = self._sessions.pop(key, None)
+        if session is not None and session.revision is not None:
+            session.revision.cancel()
+
+    def close_all(self, owner):
+        """Drop every session whose key starts with owner (a socket id)"""
+        with self._lock:
+            keys = [key for key in self._sessions if key[0] == owner]
+        for key in keys:
+            self.close(key)
+
+    def stats(self):
+        with self._lock:
+            sessions = len(self._sessions)
+        return {
+            'sessions': sessions,
+            'sentences_translated': self.sentences_translated,
+            'sentences_reused': self.sentences_reused,
+            'revisions_cancelled': self.revisions_cancelled,
+        }
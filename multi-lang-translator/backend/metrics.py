@@ -0,0 +1,179 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Seconds; covers a cache hit (~0.1ms) up to a cold model load
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """collector() -> iterable of (name, help, type, [(labels_dict, value), ...])"""
+        self._collectors.append(collector)
+
+    def render(self):
+        """Everything registered, in Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                continue
+            for name, help_text, kind, samples in families:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_format_labels(labels.keys(), labels.values())} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self):
+        """{label values: (bucket counts, sum, count)}, e.g. to diff two points in a benchmark"""
+        with self._lock:
+            return {key: (tuple(series[:-2]), series[-2], series[-1]) for key, series in self._series.items()}
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    labels = _format_labels(self.labelnames, key, [('le', bound)])
+                    lines.append(f'{self.name}_bucket{labels} {cumulative}')
+                labels = _format_labels(self.labelnames, key, [('le', '+Inf')])
+                lines.append(f'{self.name}_bucket{labels} {series[-1]}')
+                lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {series[-2]}')
+                lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {series[-1]}')
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    'translator_stage_seconds',
+    'Latency of each translation/TTS pipeline stage',
+    ['stage'],
+)
+TRANSLATIONS = Counter(
+    'translator_translations_total',
+    'Translations served, by backend and language pair',
+    ['backend', 'source_lang', 'target_lang'],
+)
+TTS_REQUESTS = Counter(
+    'translator_tts_total',
+    'TTS clips produced, by engine and outcome',
+    ['engine', 'outcome'],
+)
+
+ROUTER_DECISIONS = Counter(
+    'translator_router_decisions_total',
+    'Translation router attempts, by backend, role (lookup/primary/fallback/hedge) and outcome',
+    ['backend', 'role', 'outcome'],
+)
+ROUTER_HEDGES = Counter(
+    'translator_router_hedges_total',
+    'Hedged requests, by whether the hedge answered first',
+    ['outcome'],
+)
+ADMISSION_REJECTIONS = Counter(
+    'translator_admission_rejections_total',
+    '/translate requests turned away, by HTTP status (429 per-client limit, 503 capacity or deadline)',
+    ['status'],
+)
+STAGE_TIMEOUTS = Counter(
+    'translator_stage_timeouts_total',
+    'Post-translation stages that ran past their timeout, by stage',
+    ['stage'],
+)
+STAGE_DROPS = Counter(
+    'translator_stage_drops_total',
+    'Background stage jobs refused because the stage backlog was full, by stage',
+    ['stage'],
+)
+GOVERNOR_ACTIONS = Counter(
+    'translator_memory_governor_actions_total',
+    'Memory governor decisions, by action (collect/shrink/unload) and what triggered them',
+    ['action', 'reason'],
+)
+
+
+def timed(stage):
+    """Context manager recording the block's latency under stage"""
+    return STAGE_SECONDS.time(stage=stage)
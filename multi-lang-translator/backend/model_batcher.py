@@ -0,0 +1,141 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+# Tunable from the environment so deployments can trade latency for throughput
+MAX_BATCH_SIZE = int(os.getenv('TRANSLATION_MAX_BATCH_SIZE', '16'))
+MAX_WAIT_MS = float(os.getenv('TRANSLATION_MAX_WAIT_MS', '8'))
+# Multi-target requests in one batch share an encoder pass; this caps the decoder rows per call
+MAX_TARGET_ROWS = int(os.getenv('TRANSLATION_MAX_TARGET_ROWS', '64'))
+
+
+def _resolve(futures, results):
+    """Hand each future its result; every future is resolved, even when results is short or an exception"""
+    if not isinstance(results, Exception) and len(results) != len(futures):
+        results = RuntimeError(f"Model returned {len(results)} outputs for {len(futures)} inputs")
+    if isinstance(results, Exception):
+        for future in futures:
+            future.set_exception(results)
+        return
+    for future, result in zip(futures, results):
+        future.set_result(result)
+
+
+class TranslationBatcher:
+    """Collect concurrent model requests for a few ms and run them as one batch"""
+
+    def __init__(self, generate_batch, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS,
+                 max_concurrent_batches=1, generate_targets_batch=None, max_target_rows=MAX_TARGET_ROWS):
+        # generate_batch(texts, source_code, target_code) -> list of translations
+        # generate_targets_batch(texts, source_code, target_lists) -> per text, one translation per target
+        self.generate_batch = generate_batch
+        self.generate_targets_batch = generate_targets_batch
+        self.max_target_rows = max(1, int(max_target_rows))
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        # >1 when generate_batch fans out to several model workers; a new batch is only
+        # collected once one of them is free, so requests pile up into bigger batches
+        self.max_concurrent_batches = max(1, int(max_concurrent_batches))
+        self._slots = threading.BoundedSemaphore(self.max_concurrent_batches)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='translation-batcher', daemon=True)
+                self._thread.start()
+
+    def submit(self, text, source_code, target_code):
+        """Queue one text and return a Future resolving to its translation"""
+        self.start()
+        future = Future()
+        self._queue.put((text, source_code, target_code, future))
+        return future
+
+    def translate(self, text, source_code, target_code, timeout=None):
+        return self.submit(text, source_code, target_code).result(timeout=timeout)
+
+    def submit_targets(self, text, source_code, target_codes):
+        """Queue one text for several target languages; the Future resolves to a list in that order"""
+        if self.generate_targets_batch is None:
+            raise ValueError("This batcher has no generate_targets_batch")
+        self.start()
+        future = Future()
+        self._queue.put((text, source_code, tuple(target_codes), future))
+        return future
+
+    def _collect(self):
+        """Block for the first request, then gather more until size or time runs out"""
+        pending = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(pending) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return pending
+
+    def _run(self):
+        while True:
+            self._slots.acquire()
+            pending = self._collect()
+            if self.max_concurrent_batches == 1:
+                self._process(pending)
+            else:
+                threading.Thread(target=self._process, args=(pending,), daemon=True).start()
+
+    def _process(self, pending):
+        try:
+            # forced_bos_token_id is per batch, so only one language pair per generate call
+            groups = {}
+            multi = {}
+            for text, source_code, target_code, future in pending:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if isinstance(target_code, tuple):
+                    multi.setdefault(source_code, []).append((text, list(target_code), future))
+                else:
+                    groups.setdefault((source_code, target_code), []).append((text, future))
+
+            for (source_code, target_code), items in groups.items():
+                texts = [text for text, _ in items]
+                try:
+                    results = self.generate_batch(texts, source_code, target_code)
+                except Exception as e:
+                    results = e
+                _resolve([future for _, future in items], results)
+
+            # Concurrent multi-target requests with one source language share the encoder pass
+            for source_code, items in multi.items():
+                for chunk in self._row_chunks(items):
+                    self._process_targets(source_code, chunk)
+        finally:
+            self._slots.release()
+
+    def _row_chunks(self, items):
+        """Split multi-target items so no call decodes more than max_target_rows rows (one item always fits)"""
+        chunk, rows = [], 0
+        for item in items:
+            if chunk and rows + len(item[1]) > self.max_target_rows:
+                yield chunk
+                chunk, rows = [], 0
+            chunk.append(item)
+            rows += len(item[1])
+        if chunk:
+            yield chunk
+
+    def _process_targets(self, source_code, items):
+        try:
+            results = self.generate_targets_batch([text for text, _, _ in items], source_code,
+                                                  [codes for _, codes, _ in items])
+        except Exception as e:
+            results = e
+        _resolve([future for _, _, future in items], results)
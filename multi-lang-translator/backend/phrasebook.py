@@ -0,0 +1,372 @@
+import argparse
+import hashlib
+import heapq
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import unicodedata
+
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+# One row per phrase, one column per language code; any two filled cells form a pair
+PHRASEBOOK_TSV = os.getenv('PHRASEBOOK_TSV', os.path.join(BACKEND_DIR, 'data', 'phrasebook.tsv'))
+PHRASEBOOK_INDEX = os.getenv('PHRASEBOOK_INDEX', os.path.join(BACKEND_DIR, 'cache', 'phrasebook.idx'))
+# Fuzzy lookup is for chat-sized lines; anything shorter is too ambiguous, longer isn't a phrase
+FUZZY_MIN_CHARS = 4
+FUZZY_MAX_CHARS = 60
+# A near miss may differ from a phrase by one character edit, inside one word at least this long:
+# shorter words have too many real neighbours ("fine"/"fire", "how"/"who")
+FUZZY_MIN_WORD_CHARS = 5
+# Chat shorthand ("thank u") is matched before any translator, but only on short lines, and only
+# against a phrase sharing at least this share of trigrams (Dice coefficient)
+SIMILAR_MAX_CHARS = 30
+SIMILAR_MIN_SCORE = 0.6
+
+# File layout (little-endian), all sections addressed by offset from the start:
+#   header | languages (8 bytes each) | cells | phrase hash table | trigram hash table | postings | strings
+# A cell is (text offset, text length, normalized offset, normalized length) for one row and language.
+MAGIC = b'PBK1'
+HEADER = struct.Struct('<4sIIIIIIQQQQQQ')
+CELL = struct.Struct('<IIII')
+SLOT = struct.Struct('<QII')  # hash, value, count (phrase table: cell id, 1; trigram table: postings start, count)
+POSTING = struct.Struct('<I')
+LANG = struct.Struct('<8s')
+EMPTY = 0xFFFFFFFF
+
+_PUNCTUATION = re.compile(r'[\s.,!?;:"\'“”‘’«»()\[\]{}¿¡…\-–—।॥،؟۔。、！？，]+')
+
+
+def normalize_phrase(text):
+    """Lookup form: NFC, case-folded, punctuation dropped, whitespace collapsed"""
+    return _PUNCTUATION.sub(' ', unicodedata.normalize('NFC', text).casefold()).strip()
+
+
+def _hash(lang, text):
+    digest = int.from_bytes(hashlib.blake2b(f'{lang}\x1f{text}'.encode('utf-8'), digest_size=8).digest(), 'little')
+    return digest or 1  # 0 marks an empty slot
+
+
+def trigrams(normalized):
+    padded = f' {normalized} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _table_size(entries):
+    size = 8
+    while size < entries * 2:
+        size *= 2
+    return size
+
+
+def _fill_table(entries, size):
+    """Open addressing with linear probing; entries are (hash, value, count)"""
+    slots = [(0, 0, 0)] * size
+    for entry in entries:
+        slot = entry[0] & (size - 1)
+        while slots[slot][0]:
+            slot = (slot + 1) & (size - 1)
+        slots[slot] = entry
+    return slots
+
+
+def build_index(tsv_path=PHRASEBOOK_TSV, index_path=PHRASEBOOK_INDEX):
+    """Compile the phrasebook TSV into the binary index read by Phrasebook"""
+    with open(tsv_path, encoding='utf-8') as f:
+        langs = f.readline().rstrip('\n').split('\t')
+        rows = [line.rstrip('\n').split('\t') for line in f if line.strip()]
+
+    blob = bytearray()
+    interned = {}
+
+    def intern(text):
+        if text not in interned:
+            data = text.encode('utf-8')
+            interned[text] = (len(blob), len(data))
+            blob.extend(data)
+        return interned[text]
+
+    cells = []
+    phrase_entries = {}
+    grams = {}
+    for row_index, row in enumerate(rows):
+        row = row + [''] * (len(langs) - len(row))
+        for lang_index, lang in enumerate(langs):
+            cell_id = row_index * len(langs) + lang_index
+            text = row[lang_index].strip()
+            normalized = normalize_phrase(text) if text else ''
+            if not normalized:
+                cells.append((EMPTY, 0, EMPTY, 0))
+                continue
+            cells.append(intern(text) + intern(normalized))
+            key = _hash(lang, normalized)
+            if key in phrase_entries:
+                # e.g. French "bonjour" is both "hello" and "good morning"
+                logger.debug("Duplicate %s phrase %r in row %d; keeping the first", lang, text, row_index + 1)
+                continue
+            phrase_entries[key] = cell_id
+            for gram in trigrams(normalized):
+                grams.setdefault(_hash(lang, gram), []).append(cell_id)
+
+    phrase_size = _table_size(len(phrase_entries))
+    phrase_slots = _fill_table([(key, cell_id, 1) for key, cell_id in phrase_entries.items()], phrase_size)
+    postings = []
+    gram_entries = []
+    for key, cell_ids in grams.items():
+        gram_entries.append((key, len(postings), len(cell_ids)))
+        postings.extend(cell_ids)
+    gram_size = _table_size(len(gram_entries))
+    gram_slots = _fill_table(gram_entries, gram_size)
+
+    offset_langs = HEADER.size
+    offset_cells = offset_langs + LANG.size * len(langs)
+    offset_phrases = offset_cells + CELL.size * len(cells)
+    offset_grams = offset_phrases + SLOT.size * phrase_size
+    offset_postings = offset_grams + SLOT.size * gram_size
+    offset_strings = offset_postings + POSTING.size * len(postings)
+
+    out = bytearray(HEADER.pack(MAGIC, 1, len(langs), len(rows), phrase_size, gram_size, len(postings),
+                                offset_langs, offset_cells, offset_phrases, offset_grams, offset_postings,
+                                offset_strings))
+    for lang in langs:
+        out += LANG.pack(lang.encode('ascii'))
+    for cell in cells:
+        out += CELL.pack(*cell)
+    for slot in phrase_slots:
+        out += SLOT.pack(*slot)
+    for slot in gram_slots:
+        out += SLOT.pack(*slot)
+    out += struct.pack(f'<{len(postings)}I', *postings)
+    out += blob
+
+    os.makedirs(os.path.dirname(index_path) or '.', exist_ok=True)
+    tmp_path = f'{index_path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(out)
+    os.replace(tmp_path, index_path)
+    logger.info("Phrasebook index: %d phrases x %d languages, %d bytes -> %s", len(rows), len(langs), len(out), index_path)
+    return index_path
+
+
+def bounded_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 as soon as it must exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        best = i
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            best = min(best, current[j])
+        if best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def one_word_typo(query, phrase):
+    """True when query is phrase with one character edit inside a single long-enough word"""
+    query_words, phrase_words = query.split(), phrase.split()
+    if len(query_words) != len(phrase_words):
+        return False
+    differing = [(q, p) for q, p in zip(query_words, phrase_words) if q != p]
+    if len(differing) != 1:
+        return False
+    query_word, phrase_word = differing[0]
+    return len(phrase_word) >= FUZZY_MIN_WORD_CHARS and bounded_distance(query_word, phrase_word, 1) <= 1
+
+
+def is_subsequence(short, long):
+    remaining = iter(long)
+    return all(char in remaining for char in short)
+
+
+def shortened_words(query, phrase):
+    """True when query is phrase with some words abbreviated, like 'thank u' for 'thank you'"""
+    query_words, phrase_words = query.split(), phrase.split()
+    if len(query_words) != len(phrase_words):
+        return False
+    differing = [(q, p) for q, p in zip(query_words, phrase_words) if q != p]
+    return bool(differing) and all(len(q) < len(p) and is_subsequence(q, p) for q, p in differing)
+
+
+class Phrasebook:
+    """Read-only view over a phrasebook index; the file stays in the page cache, not in Python objects"""
+
+    def __init__(self, path=PHRASEBOOK_INDEX):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.n_langs, self.n_rows, self._phrase_size, self._gram_size, _,
+         self._langs_at, self._cells_at, self._phrases_at, self._grams_at, self._postings_at,
+         self._strings_at) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != 1:
+            raise ValueError(f"{path} is not a phrasebook index")
+        self.languages = {
+            LANG.unpack_from(self._mmap, self._langs_at + i * LANG.size)[0].rstrip(b'\0').decode('ascii'): i
+            for i in range(self.n_langs)
+        }
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def supports(self, source_lang, target_lang):
+        return source_lang in self.languages and target_lang in self.languages
+
+    def _string(self, offset, length):
+        start = self._strings_at + offset
+        return self._mmap[start:start + length].decode('utf-8')
+
+    def _cell(self, cell_id):
+        return CELL.unpack_from(self._mmap, self._cells_at + cell_id * CELL.size)
+
+    def _probe(self, table_at, size, key):
+        slot = key & (size - 1)
+        while True:
+            stored, value, count = SLOT.unpack_from(self._mmap, table_at + slot * SLOT.size)
+            if stored == key:
+                return value, count
+            if not stored:
+                return None
+            slot = (slot + 1) & (size - 1)
+
+    def _translation(self, cell_id, target_lang):
+        row = cell_id // self.n_langs
+        text_at, text_len, _, _ = self._cell(row * self.n_langs + self.languages[target_lang])
+        if text_at == EMPTY:
+            return None
+        return self._string(text_at, text_len)
+
+    def _shared_trigrams(self, grams, source_lang):
+        """{cell id: trigrams it shares with grams} for the source-language phrases"""
+        shared = {}
+        for gram in grams:
+            found = self._probe(self._grams_at, self._gram_size, _hash(source_lang, gram))
+            if found is None:
+                continue
+            start, count = found
+            for cell_id in struct.unpack_from(f'<{count}I', self._mmap, self._postings_at + start * POSTING.size):
+                shared[cell_id] = shared.get(cell_id, 0) + 1
+        return shared
+
+    def _fuzzy(self, normalized, source_lang, target_lang):
+        grams = trigrams(normalized)
+        shared = self._shared_trigrams(grams, source_lang)
+
+        # One edit changes at most three trigrams, so fewer shared ones rules a phrase out
+        needed = len(grams) - 3
+        for cell_id, count in heapq.nlargest(32, shared.items(), key=lambda item: item[1]):
+            if count < needed:
+                break
+            _, _, norm_at, norm_len = self._cell(cell_id)
+            if one_word_typo(normalized, self._string(norm_at, norm_len)):
+                translated = self._translation(cell_id, target_lang)
+                if translated is not None:
+                    return translated
+        return None
+
+    def lookup(self, text, source_lang, target_lang):
+        """Translation of exactly this phrase (after normalization), else None"""
+        if not self.supports(source_lang, target_lang):
+            return None
+        normalized = normalize_phrase(text)
+        if not normalized:
+            return None
+        translated = None
+        found = self._probe(self._phrases_at, self._phrase_size, _hash(source_lang, normalized))
+        if found is not None:
+            translated = self._translation(found[0], target_lang)
+        with self._lock:
+            if translated is not None:
+                self.exact_hits += 1
+            else:
+                self.misses += 1
+        return translated
+
+    def similar(self, text, source_lang, target_lang):
+        """Translation of the phrase a short line abbreviates ('thank u'), else None
+
+        Cheap enough to run before the network: the line must be short, every
+        differing word a shortening of the phrase's word, and the two must
+        share at least SIMILAR_MIN_SCORE of their trigrams.
+        """
+        if not self.supports(source_lang, target_lang):
+            return None
+        normalized = normalize_phrase(text)
+        if not FUZZY_MIN_CHARS <= len(normalized) <= SIMILAR_MAX_CHARS:
+            return None
+        grams = trigrams(normalized)
+        best, best_score = None, SIMILAR_MIN_SCORE
+        for cell_id, count in heapq.nlargest(32, self._shared_trigrams(grams, source_lang).items(),
+                                             key=lambda item: item[1]):
+            _, _, norm_at, norm_len = self._cell(cell_id)
+            phrase = self._string(norm_at, norm_len)
+            score = 2 * count / (len(grams) + len(trigrams(phrase)))
+            if score >= best_score and shortened_words(normalized, phrase):
+                best, best_score = cell_id, score
+        translated = self._translation(best, target_lang) if best is not None else None
+        if translated is not None:
+            with self._lock:
+                self.similar_hits += 1
+        return translated
+
+    def closest(self, text, source_lang, target_lang):
+        """Translation of a phrase one typo away from text, else None
+
+        Only a last resort once every real translator has failed: a near
+        miss can still be a different sentence.
+        """
+        if not self.supports(source_lang, target_lang):
+            return None
+        normalized = normalize_phrase(text)
+        if not FUZZY_MIN_CHARS <= len(normalized) <= FUZZY_MAX_CHARS:
+            return None
+        translated = self._fuzzy(normalized, source_lang, target_lang)
+        if translated is not None:
+            with self._lock:
+                self.fuzzy_hits += 1
+        return translated
+
+    def stats(self):
+        with self._lock:
+            return {
+                'phrases': self.n_rows,
+                'languages': self.n_langs,
+                'index_bytes': len(self._mmap),
+                'exact_hits': self.exact_hits,
+                'similar_hits': self.similar_hits,
+                'fuzzy_hits': self.fuzzy_hits,
+                'misses': self.misses,
+            }
+
+
+def load_phrasebook(tsv_path=PHRASEBOOK_TSV, index_path=PHRASEBOOK_INDEX):
+    """Open the index, (re)building it first if the TSV is newer; None if there is no phrasebook"""
+    try:
+        if os.path.exists(tsv_path) and (
+                not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(tsv_path)):
+            build_index(tsv_path, index_path)
+        return Phrasebook(index_path)
+    except (OSError, ValueError) as e:
+        logger.warning("Phrasebook unavailable: %s", e)
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the phrasebook index from its TSV")
+    parser.add_argument('tsv', nargs='?', default=PHRASEBOOK_TSV)
+    parser.add_argument('index', nargs='?', default=PHRASEBOOK_INDEX)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    build_index(args.tsv, args.index)
+
+
+if __name__ == '__main__':
+    main()
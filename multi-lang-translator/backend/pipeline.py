@@ -0,0 +1,110 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from metrics import STAGE_DROPS, STAGE_TIMEOUTS
+
+
+logger = logging.getLogger(__name__)
+
+# Threads per post-translation stage, unless the stage sets its own
+PIPELINE_WORKERS = int(os.getenv('PIPELINE_WORKERS', '16'))
+# Background jobs (submitted after the response) a stage may have queued or running, per worker
+PIPELINE_BACKGROUND_PER_WORKER = int(os.getenv('PIPELINE_BACKGROUND_PER_WORKER', '4'))
+
+
+class Stage:
+    """One step that only needs the translated text: fn(translated, context) -> result"""
+
+    def __init__(self, name, fn, timeout, workers=PIPELINE_WORKERS):
+        self.name = name
+        self.fn = fn
+        self.timeout = timeout
+        self.workers = workers
+
+
+class StagePipeline:
+    """Run the stages that follow translation side by side, each under its own timeout
+
+    Latency is the slowest stage rather than the sum of all of them. A stage
+    that runs past its timeout is reported as None but keeps running, so its
+    side effects (a TTS clip landing in the audio cache) still happen. Each
+    stage has its own threads, so slow TTS calls can't starve romanization.
+    """
+
+    def __init__(self, stages, background_per_worker=PIPELINE_BACKGROUND_PER_WORKER):
+        self.stages = {stage.name: stage for stage in stages}
+        self._executors = {
+            stage.name: ThreadPoolExecutor(max_workers=stage.workers, thread_name_prefix=f'pipeline-{stage.name}')
+            for stage in stages
+        }
+        self._background = {
+            stage.name: threading.BoundedSemaphore(max(1, stage.workers * background_per_worker))
+            for stage in stages
+        }
+
+    def submit(self, name, translated, context):
+        """Start one stage on its own; returns its Future"""
+        return self._executors[name].submit(self.stages[name].fn, translated, context)
+
+    def submit_background(self, name, translated, context):
+        """Start a stage that finishes after the response; None (and nothing runs) when its backlog is full
+
+        Background jobs aren't covered by admission control, so this cap is
+        what keeps a burst of them from queueing without limit.
+        """
+        slots = self._background[name]
+        if not slots.acquire(blocking=False):
+            STAGE_DROPS.inc(stage=name)
+            logger.warning("Stage %s backlog full; dropping a background job", name)
+            return None
+        fn = self.stages[name].fn
+
+        def job():
+            try:
+                return fn(translated, context)
+            finally:
+                slots.release()
+        try:
+            return self._executors[name].submit(job)
+        except BaseException:
+            slots.release()
+            raise
+
+    def _result(self, name, future, start):
+        """(result or None, timed out?) for a stage started at start, waiting no longer than its timeout"""
+        remaining = self.stages[name].timeout - (time.monotonic() - start)
+        try:
+            return future.result(timeout=max(0.0, remaining)), False
+        except FutureTimeout:
+            STAGE_TIMEOUTS.inc(stage=name)
+            logger.warning("Stage %s timed out after %.1fs", name, self.stages[name].timeout)
+            return None, True
+        except Exception as e:
+            logger.error("Stage %s failed: %s", name, e)
+            return None, False
+
+    def run(self, translated, context, names):
+        """Run the named stages concurrently; returns ({name: result or None}, [names that timed out])"""
+        start = time.monotonic()
+        futures = {name: self.submit(name, translated, context) for name in names}
+        results, timed_out = {}, []
+        for name, future in futures.items():
+            results[name], late = self._result(name, future, start)
+            if late:
+                timed_out.append(name)
+        return results, timed_out
+
+    def map(self, name, jobs):
+        """Run one stage over many (translated, context) jobs at once; returns ([result or None], [indexes that timed out])"""
+        start = time.monotonic()
+        futures = [self.submit(name, translated, context) for translated, context in jobs]
+        results, timed_out = [], []
+        for index, future in enumerate(futures):
+            result, late = self._result(name, future, start)
+            results.append(result)
+            if late:
+                timed_out.append(index)
+        return results, timed_out
@@ -0,0 +1,238 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+
+# Recent romanizations kept in memory; responses repeat a lot (cache hits, phrasebook, chat)
+CACHE_SIZE = int(os.getenv('ROMANIZE_CACHE_SIZE', '20000'))
+
+# The Brahmic Unicode blocks share one layout (inherited from ISCII), so a single table
+# of offsets from the block start, in ITRANS, covers every Indic script below.
+VOWELS = {
+    0x05: 'a', 0x06: 'A', 0x07: 'i', 0x08: 'I', 0x09: 'u', 0x0A: 'U', 0x0B: 'RRi', 0x0C: 'LLi',
+    0x0D: 'e', 0x0E: 'e', 0x0F: 'e', 0x10: 'ai', 0x11: 'o', 0x12: 'o', 0x13: 'o', 0x14: 'au',
+    0x60: 'RRI', 0x61: 'LLI',
+}
+VOWEL_SIGNS = {
+    0x3E: 'A', 0x3F: 'i', 0x40: 'I', 0x41: 'u', 0x42: 'U', 0x43: 'RRi', 0x44: 'RRI',
+    0x45: 'e', 0x46: 'e', 0x47: 'e', 0x48: 'ai', 0x49: 'o', 0x4A: 'o', 0x4B: 'o', 0x4C: 'au',
+    0x62: 'LLi', 0x63: 'LLI',
+}
+CONSONANTS = {
+    0x15: 'k', 0x16: 'kh', 0x17: 'g', 0x18: 'gh', 0x19: '~N',
+    0x1A: 'ch', 0x1B: 'Ch', 0x1C: 'j', 0x1D: 'jh', 0x1E: '~n',
+    0x1F: 'T', 0x20: 'Th', 0x21: 'D', 0x22: 'Dh', 0x23: 'N',
+    0x24: 't', 0x25: 'th', 0x26: 'd', 0x27: 'dh', 0x28: 'n', 0x29: 'n',
+    0x2A: 'p', 0x2B: 'ph', 0x2C: 'b', 0x2D: 'bh', 0x2E: 'm',
+    0x2F: 'y', 0x30: 'r', 0x31: 'R', 0x32: 'l', 0x33: 'L', 0x34: 'zh', 0x35: 'v',
+    0x36: 'sh', 0x37: 'Sh', 0x38: 's', 0x39: 'h',
+}
+# Consonant + nukta, written either precomposed or as two code points
+NUKTA_FORMS = {0x15: 'q', 0x16: 'K', 0x17: 'G', 0x1C: 'z', 0x21: '.D', 0x22: '.Dh', 0x2B: 'f', 0x2F: 'Y'}
+SIGNS = {0x01: '.N', 0x02: 'M', 0x03: 'H', 0x3D: '.a', 0x50: 'OM'}
+VIRAMA = 0x4D
+NUKTA = 0x3C
+DIGITS = 0x66
+
+# Block start and script-specific letters (precomposed nukta forms, extra consonants) per script
+SCRIPTS = {
+    'devanagari': (0x0900, {0x58: 'q', 0x59: 'K', 0x5A: 'G', 0x5B: 'z', 0x5C: '.D', 0x5D: '.Dh', 0x5E: 'f', 0x5F: 'Y'}),
+    'bengali': (0x0980, {0x5C: '.D', 0x5D: '.Dh', 0x5F: 'Y'}),
+    # Assamese is Bengali script plus its own ra and wa
+    'assamese': (0x0980, {0x5C: '.D', 0x5D: '.Dh', 0x5F: 'Y', 0x70: 'r', 0x71: 'w'}),
+    'gurmukhi': (0x0A00, {0x59: 'K', 0x5A: 'G', 0x5B: 'z', 0x5C: 'R', 0x5E: 'f'}),
+    'gujarati': (0x0A80, {}),
+    'oriya': (0x0B00, {0x5C: '.D', 0x5D: '.Dh', 0x5F: 'Y', 0x71: 'w'}),
+    'tamil': (0x0B80, {}),
+    'telugu': (0x0C00, {}),
+    'kannada': (0x0C80, {}),
+    'malayalam': (0x0D00, {}),
+}
+# Standalone letters that carry no inherent vowel (Gurmukhi addak doubles the next
+# consonant; dropping it reads better than leaving a stray mark)
+FINAL_LETTERS = {
+    'bengali': {0x4E: 't'},
+    'assamese': {0x4E: 't'},
+    'malayalam': {0x7A: 'N', 0x7B: 'n', 0x7C: 'r', 0x7D: 'l', 0x7E: 'L', 0x7F: 'k'},
+    'gurmukhi': {0x70: 'M', 0x71: ''},
+}
+# Devanagari danda/double danda are used by all these scripts
+PUNCTUATION = {'।': '|', '॥': '||'}
+
+# Perso-Arabic script: short vowels are rarely written, so this is a phonetic approximation
+URDU_LETTERS = {
+    'ا': 'a', 'آ': 'aa', 'أ': 'a', 'ب': 'b', 'پ': 'p', 'ت': 't', 'ٹ': 'T', 'ث': 's', 'ج': 'j',
+    'چ': 'ch', 'ح': 'h', 'خ': 'kh', 'د': 'd', 'ڈ': 'D', 'ذ': 'z', 'ر': 'r', 'ڑ': 'R', 'ز': 'z',
+    'ژ': 'zh', 'س': 's', 'ش': 'sh', 'ص': 's', 'ض': 'z', 'ط': 't', 'ظ': 'z', 'ع': "'", 'غ': 'gh',
+    'ف': 'f', 'ق': 'q', 'ک': 'k', 'ك': 'k', 'گ': 'g', 'ل': 'l', 'م': 'm', 'ن': 'n', 'ں': 'N',
+    'ہ': 'h', 'ه': 'h', 'ۃ': 'h', 'ة': 'h', 'ھ': 'h', 'ء': "'", 'ئ': "'", 'ے': 'e', 'ۓ': 'e',
+    'َ': 'a', 'ِ': 'i', 'ُ': 'u', 'ْ': '', 'ّ': '', 'ٰ': 'a',
+    'ً': 'an', 'ٍ': 'in', 'ٌ': 'un',
+    '،': ',', '؟': '?', '۔': '.', '؛': ';',
+}
+URDU_LETTERS.update({chr(0x06F0 + d): str(d) for d in range(10)})
+URDU_LETTERS.update({chr(0x0660 + d): str(d) for d in range(10)})
+# vav and ye are consonants at the start of a word, long vowels elsewhere
+URDU_CONTEXT = {'و': ('v', 'o'), 'ی': ('y', 'i'), 'ي': ('y', 'i'), 'ى': ('y', 'i'), 'ۆ': ('v', 'o')}
+
+LANG_SCRIPTS = {
+    'hi': 'devanagari', 'mr': 'devanagari', 'ne': 'devanagari', 'mai': 'devanagari',
+    'bho': 'devanagari', 'awa': 'devanagari', 'mag': 'devanagari', 'hne': 'devanagari',
+    'doi': 'devanagari',
+    'bn': 'bengali', 'as': 'assamese', 'pa': 'gurmukhi', 'gu': 'gujarati', 'or': 'oriya',
+    'ta': 'tamil', 'te': 'telugu', 'kn': 'kannada', 'ml': 'malayalam',
+    'ur': 'urdu',
+}
+
+
+def _char_class(chars):
+    return '[' + ''.join(re.escape(c) for c in sorted(set(chars))) + ']'
+
+
+def _compile_brahmic(script):
+    """(pattern, table): the pattern matches one consonant cluster or one other mapped character"""
+    base, extras = SCRIPTS[script]
+    nukta = chr(base + NUKTA)
+    virama = chr(base + VIRAMA)
+
+    letters = dict(CONSONANTS)
+    letters.update(extras)
+    consonants = {}
+    for offset, latin in letters.items():
+        consonants[chr(base + offset)] = latin
+        consonants[chr(base + offset) + nukta] = NUKTA_FORMS.get(offset, latin)
+    signs = {chr(base + offset): latin for offset, latin in VOWEL_SIGNS.items()}
+
+    # Every consonant alone, with virama and with each vowel sign, so a cluster is one lookup
+    table = {}
+    for letter, latin in consonants.items():
+        table[letter] = latin + 'a'
+        table[letter + virama] = latin
+        for sign, vowel in signs.items():
+            table[letter + sign] = latin + vowel
+
+    singles = {chr(base + offset): latin for offset, latin in VOWELS.items()}
+    singles.update({chr(base + offset): latin for offset, latin in SIGNS.items()})
+    singles.update({chr(base + DIGITS + d): str(d) for d in range(10)})
+    singles.update({chr(base + offset): latin for offset, latin in FINAL_LETTERS.get(script, {}).items()})
+    singles.update(PUNCTUATION)
+    # Orphan signs (after a vowel, or a stray nukta/virama)
+    for sign, vowel in signs.items():
+        singles.setdefault(sign, vowel)
+    singles.setdefault(nukta, '')
+    singles.setdefault(virama, '')
+    table.update(singles)
+
+    starts = _char_class(chr(base + offset) for offset in letters)
+    pattern = re.compile(
+        f'(?:{starts}{re.escape(nukta)}?(?:{_char_class(list(signs) + [virama])})?)|{_char_class(singles)}')
+    return pattern, table
+
+
+def _compile_urdu():
+    initial, medial = {}, {}
+    for letter, (start, middle) in URDU_CONTEXT.items():
+        initial[letter] = start
+        medial[letter] = middle
+    pattern = re.compile(_char_class(list(URDU_LETTERS) + list(URDU_CONTEXT)))
+    table = dict(URDU_LETTERS)
+    table.update(initial)
+    return pattern, table, medial
+
+
+class Romanizer:
+    """Precompiled per-script transliteration to ITRANS-style Latin, with an LRU over outputs"""
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.cache_size = cache_size
+        self._compiled = {script: _compile_brahmic(script) for script in SCRIPTS}
+        urdu_pattern, urdu_table, self._urdu_medial = _compile_urdu()
+        self._compiled['urdu'] = (urdu_pattern, urdu_table)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def supports(self, lang):
+        return lang in LANG_SCRIPTS
+
+    def _transliterate(self, text, script):
+        pattern, table = self._compiled[script]
+        if script == 'urdu':
+            medial = self._urdu_medial
+
+            def replace(match):
+                char = match.group()
+                # vav/ye after another Arabic-script letter is medial
+                if match.start() > 0 and char in medial and 'ء' <= text[match.start() - 1] <= 'ۿ':
+                    return medial[char]
+                return table[char]
+            return pattern.sub(replace, text)
+        return pattern.sub(lambda match: table[match.group()], text)
+
+    def romanize(self, text, lang):
+        """Latin rendering of text in lang's script, or None if lang has no table"""
+        script = LANG_SCRIPTS.get(lang)
+        if script is None:
+            return None
+        key = (text, script)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        romanized = self._transliterate(text, script)
+        self._remember(key, romanized)
+        return romanized
+
+    def romanize_batch(self, texts, lang):
+        """romanize() over many strings; cache misses go through the engine in a single pass"""
+        script = LANG_SCRIPTS.get(lang)
+        if script is None:
+            return [None] * len(texts)
+        results = [None] * len(texts)
+        missing = {}
+        with self._lock:
+            for index, text in enumerate(texts):
+                cached = self._cache.get((text, script))
+                if cached is not None:
+                    self._cache.move_to_end((text, script))
+                    self.hits += 1
+                    results[index] = cached
+                else:
+                    self.misses += 1
+                    missing.setdefault(text, []).append(index)
+        if missing:
+            unique = list(missing)
+            romanized_all = self._transliterate('\0'.join(unique), script).split('\0')
+            if len(romanized_all) != len(unique):
+                # A NUL inside a text, or an engine that dropped or added one, would shift every
+                # later result onto the wrong text; pay for one engine call per text instead
+                romanized_all = [self._transliterate(text, script) for text in unique]
+            for text, romanized in zip(unique, romanized_all):
+                self._remember((text, script), romanized)
+                for index in missing[text]:
+                    results[index] = romanized
+        return results
+
+    def _remember(self, key, romanized):
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = romanized
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._cache),
+            }
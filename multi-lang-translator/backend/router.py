@@ -0,0 +1,248 @@
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+
+from metrics import ROUTER_DECISIONS, ROUTER_HEDGES
+
+
+logger = logging.getLogger(__name__)
+
+# Samples kept per (backend, language pair), and how long before a sample stops counting;
+# the age limit is what lets a backend that had an outage win traffic back
+WINDOW_SIZE = int(os.getenv('ROUTER_WINDOW_SIZE', '200'))
+WINDOW_SECONDS = float(os.getenv('ROUTER_WINDOW_SECONDS', '300'))
+# Below MIN_SAMPLES a backend keeps its configured position; above it, latency decides
+MIN_SAMPLES = int(os.getenv('ROUTER_MIN_SAMPLES', '5'))
+MAX_ERROR_RATE = float(os.getenv('ROUTER_MAX_ERROR_RATE', '0.5'))
+# Hedging: if the first backend runs past its p95, ask the next one too and take whichever answers
+HEDGE = os.getenv('ROUTER_HEDGE', '0') == '1'
+HEDGE_MIN_MS = float(os.getenv('ROUTER_HEDGE_MIN_MS', '50'))
+
+
+class NoBackendError(Exception):
+    pass
+
+
+class Backend:
+    """A translation source the router can use
+
+    Lookup backends (cache, phrasebook) either answer at once or return None
+    and are always tried first, in order; the rest are ranked by latency.
+    """
+
+    name = 'backend'
+    lookup = False
+
+    def supports(self, source_lang, target_lang):
+        return True
+
+    def translate(self, text, source_lang, target_lang):
+        raise NotImplementedError
+
+    def remember(self, text, source_lang, target_lang, translated):
+        """Called on lookup backends with every translation another backend produced"""
+
+
+class FunctionBackend(Backend):
+    """Backend around plain callables, for the app's services and for fakes in benchmarks"""
+
+    def __init__(self, name, translate, supports=None, lookup=False, remember=None):
+        self.name = name
+        self.lookup = lookup
+        self._translate = translate
+        self._supports = supports
+        self._remember = remember
+
+    def supports(self, source_lang, target_lang):
+        return self._supports is None or self._supports(source_lang, target_lang)
+
+    def translate(self, text, source_lang, target_lang):
+        return self._translate(text, source_lang, target_lang)
+
+    def remember(self, text, source_lang, target_lang, translated):
+        if self._remember is not None:
+            self._remember(text, source_lang, target_lang, translated)
+
+
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+class RollingStats:
+    """Latency and outcome of the recent calls to one backend for one language pair"""
+
+    def __init__(self, size=WINDOW_SIZE, max_age=WINDOW_SECONDS):
+        self.max_age = max_age
+        self._samples = deque(maxlen=size)  # (timestamp, seconds, ok)
+        self._lock = threading.Lock()
+
+    def record(self, seconds, ok):
+        with self._lock:
+            self._samples.append((time.monotonic(), seconds, ok))
+
+    def snapshot(self):
+        cutoff = time.monotonic() - self.max_age
+        with self._lock:
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+            samples = list(self._samples)
+        latencies = sorted(seconds for _, seconds, ok in samples if ok)
+        return {
+            'count': len(samples),
+            'error_rate': 1 - len(latencies) / len(samples) if samples else 0.0,
+            'p50': _quantile(latencies, 0.5),
+            'p95': _quantile(latencies, 0.95),
+        }
+
+
+class Router:
+    """Send each translation to the fastest healthy backend for its language pair"""
+
+    def __init__(self, backends, hedge=HEDGE, hedge_min_ms=HEDGE_MIN_MS, min_samples=MIN_SAMPLES,
+                 max_error_rate=MAX_ERROR_RATE, window_size=WINDOW_SIZE, window_seconds=WINDOW_SECONDS):
+        self.backends = list(backends)
+        self.hedge = hedge
+        self.hedge_min = hedge_min_ms / 1000.0
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.window_size = window_size
+        self.window_seconds = window_seconds
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='router-hedge') if hedge else None
+
+    def stats_for(self, backend, source_lang, target_lang):
+        key = (backend.name, source_lang, target_lang)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = RollingStats(self.window_size, self.window_seconds)
+            return stats
+
+    def _healthy(self, snapshot):
+        return snapshot['count'] < self.min_samples or snapshot['error_rate'] < self.max_error_rate
+
+    def rank(self, source_lang, target_lang):
+        """Non-lookup backends, healthy ones first, each group fastest first
+
+        A backend without enough samples ranks behind measured ones (in its configured
+        order), so nothing cold gets promoted onto the request path on a guess.
+        """
+        ranked = []
+        for index, backend in enumerate(self.backends):
+            if backend.lookup or not backend.supports(source_lang, target_lang):
+                continue
+            snapshot = self.stats_for(backend, source_lang, target_lang).snapshot()
+            known = snapshot['count'] >= self.min_samples and snapshot['p50'] is not None
+            ranked.append(((not self._healthy(snapshot), snapshot['p50'] if known else math.inf, index),
+                           backend, snapshot))
+        ranked.sort(key=lambda item: item[0])
+        return [(backend, snapshot) for _, backend, snapshot in ranked]
+
+    def translate(self, text, source_lang, target_lang):
+        """Return (translation, backend name); raises the last error if every backend failed"""
+        for backend in self.backends:
+            if not backend.lookup or not backend.supports(source_lang, target_lang):
+                continue
+            try:
+                translated = backend.translate(text, source_lang, target_lang)
+            except Exception as e:
+                logger.warning("%s lookup failed: %s", backend.name, e)
+                translated = None
+            ROUTER_DECISIONS.inc(backend=backend.name, role='lookup', outcome='hit' if translated is not None else 'miss')
+            if translated is not None:
+                return translated, backend.name
+
+        ranked = self.rank(source_lang, target_lang)
+        if not ranked:
+            raise NoBackendError(f"No translation backend for {source_lang}->{target_lang}")
+
+        error = None
+        position = 0
+        while position < len(ranked):
+            backend, snapshot = ranked[position]
+            role = 'primary' if position == 0 else 'fallback'
+            hedge_with = None
+            if self.hedge and position + 1 < len(ranked) and snapshot['count'] >= self.min_samples \
+                    and snapshot['p95'] is not None and self._healthy(ranked[position + 1][1]):
+                hedge_with = ranked[position + 1][0]
+            try:
+                if hedge_with is None:
+                    result = self._call(backend, role, text, source_lang, target_lang), backend.name
+                else:
+                    result = self._hedged(backend, hedge_with, max(self.hedge_min, snapshot['p95']),
+                                          role, text, source_lang, target_lang)
+                self._remember(text, source_lang, target_lang, result[0])
+                return result
+            except Exception as e:
+                error = e
+                position += 2 if hedge_with is not None else 1
+        raise error
+
+    def _call(self, backend, role, text, source_lang, target_lang):
+        stats = self.stats_for(backend, source_lang, target_lang)
+        start = time.perf_counter()
+        try:
+            translated = backend.translate(text, source_lang, target_lang)
+        except Exception:
+            stats.record(time.perf_counter() - start, False)
+            ROUTER_DECISIONS.inc(backend=backend.name, role=role, outcome='error')
+            raise
+        stats.record(time.perf_counter() - start, True)
+        ROUTER_DECISIONS.inc(backend=backend.name, role=role, outcome='ok')
+        return translated
+
+    def _hedged(self, primary, secondary, delay, role, text, source_lang, target_lang):
+        first = self._executor.submit(self._call, primary, role, text, source_lang, target_lang)
+        try:
+            return first.result(timeout=delay), primary.name
+        except FutureTimeout:
+            pass
+        except Exception:
+            # Failed fast: a plain fallback, not a hedge
+            return self._call(secondary, 'fallback', text, source_lang, target_lang), secondary.name
+
+        # The slower call keeps running; its latency still feeds the stats
+        second = self._executor.submit(self._call, secondary, 'hedge', text, source_lang, target_lang)
+        pending = {first: primary, second: secondary}
+        error = None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                backend = pending.pop(future)
+                if future.exception() is None:
+                    ROUTER_HEDGES.inc(outcome='won' if future is second else 'lost')
+                    return future.result(), backend.name
+                error = future.exception()
+        raise error
+
+    def _remember(self, text, source_lang, target_lang, translated):
+        for backend in self.backends:
+            if backend.lookup:
+                try:
+                    backend.remember(text, source_lang, target_lang, translated)
+                except Exception as e:
+                    logger.warning("%s could not store a translation: %s", backend.name, e)
+
+    def collect(self):
+        """Metrics collector: rolling latency quantiles and error rate per backend and pair"""
+        with self._lock:
+            items = list(self._stats.items())
+        latency, errors = [], []
+        for (backend, source_lang, target_lang), stats in items:
+            snapshot = stats.snapshot()
+            if not snapshot['count']:
+                continue
+            labels = {'backend': backend, 'source_lang': source_lang, 'target_lang': target_lang}
+            for name, quantile in (('p50', '0.5'), ('p95', '0.95')):
+                if snapshot[name] is not None:
+                    latency.append((dict(labels, quantile=quantile), snapshot[name]))
+            errors.append((labels, snapshot['error_rate']))
+        yield ('translator_router_latency_seconds', 'Rolling backend latency by language pair', 'gauge', latency)
+        yield ('translator_router_error_ratio', 'Rolling backend error rate by language pair', 'gauge', errors)
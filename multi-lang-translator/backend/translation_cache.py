@@ -0,0 +1,195 @@
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+# Memory tier bounds and disk location, overridable per deployment
+MEMORY_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '10000'))
+MEMORY_TTL = float(os.getenv('TRANSLATION_CACHE_TTL', '3600'))
+MEMORY_MAX_BYTES = int(os.getenv('TRANSLATION_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+DISK_TTL = float(os.getenv('TRANSLATION_CACHE_DISK_TTL', str(30 * 24 * 3600)))
+DISK_PATH = os.getenv('TRANSLATION_CACHE_PATH', os.path.join(CACHE_DIR, 'translations.sqlite3'))
+# Most rows the background writer commits in one transaction
+WRITE_BATCH = int(os.getenv('TRANSLATION_CACHE_WRITE_BATCH', '256'))
+
+
+def normalize_text(text):
+    """Cache key form of text: NFC, trimmed, inner whitespace collapsed"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def _entry_bytes(key, translated):
+    """Rough in-memory footprint of one entry: both strings plus tuple/dict overhead"""
+    return len(key[0].encode('utf-8')) + len(translated.encode('utf-8')) + 256
+
+
+class TranslationCache:
+    """In-process LRU in front of a SQLite store that survives restarts
+
+    Entries hold the raw translation, before any gender adjustment, so male
+    and female speakers share one entry per (text, source, target). The
+    memory tier has its own lock and never waits on SQLite: disk reads take
+    only the connection lock, and writes are queued for a background thread
+    that commits them in batches.
+    """
+
+    def __init__(self, path=DISK_PATH, max_size=MEMORY_SIZE, ttl=MEMORY_TTL, disk_ttl=DISK_TTL,
+                 max_bytes=MEMORY_MAX_BYTES):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.memory_bytes = 0
+        self.ttl = ttl
+        self.disk_ttl = disk_ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._writes = queue.Queue()
+        if path:
+            try:
+                if path != ':memory:':
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute('PRAGMA journal_mode=WAL')
+                self._db.execute(
+                    'CREATE TABLE IF NOT EXISTS translations ('
+                    'text TEXT, source_lang TEXT, target_lang TEXT, translated TEXT, created REAL, '
+                    'PRIMARY KEY (text, source_lang, target_lang))'
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning("Translation cache running memory-only: %s", e)
+                self._db = None
+        if self._db is not None:
+            threading.Thread(target=self._write_loop, name='translation-cache-writer', daemon=True).start()
+            # The writer is a daemon thread; give queued rows a moment to land on the way out
+            atexit.register(self.flush, 5)
+
+    def _write_loop(self):
+        while True:
+            batch = [self._writes.get()]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [item for item in batch if isinstance(item, tuple)]
+            if rows:
+                try:
+                    with self._db_lock:
+                        self._db.executemany('INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)', rows)
+                        self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning("Translation cache dropped %d disk writes: %s", len(rows), e)
+            # flush() markers queued behind these rows
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def flush(self, timeout=None):
+        """Wait until every put so far is on disk; False if that took longer than timeout"""
+        if self._db is None:
+            return True
+        done = threading.Event()
+        self._writes.put(done)
+        return done.wait(timeout)
+
+    def _forget(self, key):
+        translated, _ = self._memory.pop(key)
+        self.memory_bytes -= _entry_bytes(key, translated)
+
+    def _remember(self, key, translated, created):
+        if key in self._memory:
+            self._forget(key)
+        self._memory[key] = (translated, created)
+        self.memory_bytes += _entry_bytes(key, translated)
+        while len(self._memory) > self.max_size or (self.memory_bytes > self.max_bytes and len(self._memory) > 1):
+            self._forget(next(iter(self._memory)))
+            self.evictions += 1
+
+    def shrink(self, fraction):
+        """Drop the least recently used fraction of the memory tier (the disk tier keeps them)"""
+        with self._lock:
+            count = int(len(self._memory) * fraction)
+            for _ in range(count):
+                self._forget(next(iter(self._memory)))
+            self.evictions += count
+            return count
+
+    def get(self, text, source_lang, target_lang):
+        """Return the cached raw translation or None"""
+        key = (normalize_text(text), source_lang, target_lang)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[1] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._forget(key)
+                self.evictions += 1
+
+        row = None
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    row = self._db.execute(
+                        'SELECT translated, created FROM translations '
+                        'WHERE text = ? AND source_lang = ? AND target_lang = ?', key
+                    ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("Translation cache disk read failed: %s", e)
+
+        with self._lock:
+            if row is not None and now - row[1] <= self.disk_ttl:
+                # Promote with a fresh memory TTL
+                self._remember(key, row[0], now)
+                self.disk_hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, text, source_lang, target_lang, translated):
+        key = (normalize_text(text), source_lang, target_lang)
+        now = time.time()
+        with self._lock:
+            self._remember(key, translated, now)
+        if self._db is not None:
+            self._writes.put(key + (translated, now))
+
+    def warm(self, phrases, source_lang, target_lang):
+        """Pre-load a {text: translation} phrase list"""
+        for text, translated in phrases.items():
+            self.put(text, source_lang, target_lang, translated)
+        logger.info("Translation cache warmed with %d %s->%s phrases", len(phrases), source_lang, target_lang)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self.memory_bytes,
+                'pending_writes': self._writes.qsize(),
+            }
@@ -0,0 +1,295 @@
+import atexit
+import collections
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+
+
+logger = logging.getLogger(__name__)
+
+WORKERS = int(os.getenv('TRANSLATION_WORKERS', str(max(1, (os.cpu_count() or 2) // 2))))
+# Each worker gets its own slice of the cores for torch's intra-op parallelism
+THREADS_PER_WORKER = int(os.getenv('TORCH_THREADS_PER_WORKER', '1'))
+
+
+def _worker_main(backend, conn, threads, index, inherited):
+    """Child process loop: take (job_id, texts, src, tgt) from conn, send back (job_id, ok, payload)
+
+    A list of target lists means each text into its own languages (generate_targets_batch).
+    """
+    # Other workers' pipes came along with the fork; holding them would keep those open
+    for other in inherited:
+        other.close()
+    import torch
+    torch.set_num_threads(threads)
+    try:
+        # Warm up here rather than in the parent: OpenMP thread pools don't survive fork
+        backend.generate(["Hello"], 'en', 'hi')
+        conn.send(('ready', index, None))
+    except Exception as e:
+        conn.send(('ready', index, repr(e)))
+        return
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        job_id, texts, source_code, target_code = job
+        try:
+            if isinstance(target_code, list):
+                result = (job_id, True, backend.generate_targets_batch(texts, source_code, target_code))
+            else:
+                result = (job_id, True, backend.generate(texts, source_code, target_code))
+        except Exception as e:
+            result = (job_id, False, repr(e))
+        try:
+            conn.send(result)
+        except OSError:
+            return  # the supervisor is gone
+
+
+def _supervise(backend, conn, parent_end, workers, threads):
+    """Supervisor process: fork the workers, hand each one job at a time, replace the dead ones
+
+    It never starts a thread, so a replacement can't be forked while some other
+    thread holds a lock (logging, malloc, a queue's feeder) that the child
+    would then wait on forever. Each worker has its own pipe and the job it
+    was given is recorded here, so a death fails exactly that job.
+    """
+    parent_end.close()
+    ctx = multiprocessing.get_context('fork')
+    processes, pipes, busy = {}, {}, {}  # index -> Process, our end of its pipe, job id it is on
+    idle = []
+    queue = collections.deque()
+
+    def spawn(index):
+        ours, theirs = ctx.Pipe()
+        process = ctx.Process(
+            target=_worker_main,
+            args=(backend, theirs, threads, index, [conn, ours, *pipes.values()]),
+            name=f'translation-worker-{index}',
+            daemon=True,
+        )
+        process.start()
+        theirs.close()
+        processes[index] = process
+        pipes[index] = ours
+        conn.send(('started', index, process.pid))
+
+    for index in range(workers):
+        spawn(index)
+
+    while processes:
+        ready = wait([conn, *pipes.values(), *(process.sentinel for process in processes.values())])
+        if conn in ready:
+            try:
+                job = conn.recv()
+            except EOFError:
+                job = None  # the parent is gone
+            if job is None:
+                break
+            queue.append(job)
+        for index, pipe in list(pipes.items()):
+            if pipe not in ready:
+                continue
+            try:
+                message = pipe.recv()
+            except (EOFError, OSError):
+                continue  # it died; its sentinel is ready too
+            conn.send(message)
+            if message[0] == 'ready':
+                if message[2] is None:
+                    idle.append(index)
+            else:
+                busy.pop(index, None)
+                idle.append(index)
+        for index, process in list(processes.items()):
+            if process.sentinel not in ready:
+                continue
+            process.join()
+            pipes.pop(index).close()
+            if index in idle:
+                idle.remove(index)
+            job_id = busy.pop(index, None)
+            if job_id is not None:
+                conn.send((job_id, False, f"Translation worker {index} died (exit code {process.exitcode})"))
+            if process.exitcode == 0:
+                # It returned on its own (a failed warm-up, already reported); forking again won't help
+                del processes[index]
+                continue
+            conn.send(('restart', index, process.exitcode))
+            spawn(index)
+        while queue and idle:
+            job = queue.popleft()
+            index = idle.pop()
+            pipes[index].send(job)
+            busy[index] = job[0]
+
+    if not processes:
+        for job in queue:
+            conn.send((job[0], False, "No translation worker left"))
+        conn.send(('down', None, "No translation worker left"))
+    for pipe in pipes.values():
+        pipe.send(None)
+    for process in processes.values():
+        process.join(timeout=5)
+
+
+class WorkerPool:
+    """Pre-forked model workers sharing one copy of the weights
+
+    The parent loads the model and moves its tensors into shared memory, then
+    forks a single-threaded supervisor which forks the N workers, so N workers
+    cost roughly one model's worth of RAM. Jobs go to the supervisor over a
+    pipe; it hands each one to an idle worker and sends the result back, which
+    a dispatcher thread here resolves. A worker that dies (OOM kill, segfault)
+    fails its job and is replaced; when none is left, every pending and
+    future job fails instead of waiting.
+    """
+
+    def __init__(self, backend, workers=WORKERS, threads_per_worker=THREADS_PER_WORKER):
+        self.backend = backend
+        self.workers = max(1, int(workers))
+        self.threads_per_worker = max(1, int(threads_per_worker))
+        self.supervisor = None
+        self.worker_pids = {}
+        self.ready_workers = 0
+        self.restarts = 0
+        self.errors = []
+        self.down = None
+        self._ready = threading.Event()
+        self._ready_indexes = set()
+        self._pending = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        # A Connection isn't safe to send on from two threads at once
+        self._send_lock = threading.Lock()
+        self._conn = None
+
+    def start(self):
+        """Load in the parent, then fork; call from the main thread before any other thread starts"""
+        if self.supervisor is not None:
+            return
+        if not hasattr(self.backend, 'model') or self.backend.name == 'onnx':
+            raise ValueError("Pre-fork workers need a PyTorch inference backend")
+
+        self.backend.load()
+        # Shared memory rather than plain copy-on-write: refcount and GC writes to
+        # Python objects would otherwise slowly un-share the pages around tensors
+        self.backend.model.share_memory()
+
+        ctx = multiprocessing.get_context('fork')
+        self._conn, theirs = ctx.Pipe()
+        # Not a daemon: daemonic processes may not have children
+        self.supervisor = ctx.Process(
+            target=_supervise,
+            args=(self.backend, theirs, self._conn, self.workers, self.threads_per_worker),
+            name='translation-supervisor',
+        )
+        self.supervisor.start()
+        theirs.close()
+        # multiprocessing joins non-daemon children at exit; tell it to wind down first
+        atexit.register(self.stop)
+        threading.Thread(target=self._dispatch_results, name='worker-results', daemon=True).start()
+        logger.info("Started %d translation workers x %d torch threads", self.workers, self.threads_per_worker)
+
+    def _dispatch_results(self):
+        while True:
+            try:
+                job_id, ok, payload = self._conn.recv()
+            except (EOFError, OSError):
+                self._fail_all("Translation worker supervisor exited")
+                return
+            if job_id == 'started':
+                self.worker_pids[ok] = payload
+            elif job_id == 'restart':
+                logger.error("Translation worker %d died (exit code %s); starting a new one", ok, payload)
+                self.restarts += 1
+            elif job_id == 'down':
+                self._fail_all(payload)
+            elif job_id == 'ready':
+                if payload:
+                    self.errors.append(payload)
+                    logger.error("Translation worker %s failed to start: %s", ok, payload)
+                # A replacement worker reports again; count each slot once
+                self._ready_indexes.add(ok)
+                self.ready_workers = len(self._ready_indexes)
+                if self.ready_workers == self.workers:
+                    self._ready.set()
+            else:
+                with self._lock:
+                    future = self._pending.pop(job_id, None)
+                if future is None:
+                    continue
+                if ok:
+                    future.set_result(payload)
+                else:
+                    future.set_exception(RuntimeError(payload))
+
+    def _fail_all(self, reason):
+        """No worker will answer any more: fail what is waiting and refuse new jobs"""
+        with self._lock:
+            self.down = self.down or reason
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError(reason))
+        self._ready.set()
+
+    def wait_ready(self, timeout=None):
+        """Block until every worker has run its warm-up generate"""
+        self._ready.wait(timeout)
+        if self.errors:
+            raise RuntimeError(f"{len(self.errors)} translation workers failed: {self.errors[0]}")
+        if self.down:
+            raise RuntimeError(self.down)
+        return self._ready.is_set()
+
+    def submit(self, texts, source_code, target_code):
+        future = Future()
+        with self._lock:
+            if self.down:
+                future.set_exception(RuntimeError(self.down))
+                return future
+            job_id = next(self._ids)
+            self._pending[job_id] = future
+        try:
+            with self._send_lock:
+                self._conn.send((job_id, list(texts), source_code, target_code))
+        except OSError as e:
+            with self._lock:
+                future = self._pending.pop(job_id, future)
+            if not future.done():
+                future.set_exception(RuntimeError(f"Translation worker supervisor unreachable: {e!r}"))
+        return future
+
+    def generate(self, texts, source_code, target_code):
+        """Same contract as InferenceBackend.generate, run in whichever worker is free"""
+        return self.submit(texts, source_code, target_code).result()
+
+    def generate_targets(self, text, source_code, target_codes):
+        """Same contract as InferenceBackend.generate_targets"""
+        return self.generate_targets_batch([text], source_code, [target_codes])[0]
+
+    def generate_targets_batch(self, texts, source_code, target_lists):
+        """Same contract as InferenceBackend.generate_targets_batch"""
+        return self.submit(texts, source_code, [list(codes) for codes in target_lists]).result()
+
+    def stop(self):
+        if self.supervisor is None:
+            return
+        try:
+            with self._send_lock:
+                self._conn.send(None)
+        except OSError:
+            pass
+        self.supervisor.join(timeout=10)
+        if self.supervisor.is_alive():
+            self.supervisor.terminate()
+        self.supervisor = None
@@ -1,6 +1,6 @@
 /* eslint-disable no-unused-vars */
 // src/Translator.jsx
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import io from "socket.io-client";
 import ReactAudioPlayer from "react-audio-player";
 import { languages } from "./languages";
@@ -17,6 +17,8 @@ export default function Translator() {
   const [gender, setGender] = useState("female");
   const [voiceGender, setVoiceGender] = useState("female");
   const [isTranslating, setIsTranslating] = useState(false);
+  // Id of the latest /translate call, so late audio from an older one is ignored
+  const latestRequest = useRef(null);
 
   // Chat and teaching states
   const [socket, setSocket] = useState(null);
@@ -60,6 +62,13 @@ export default function Translator() {
       }]);
     });
 
+    // Progressive /translate: the text came back already, the audio follows when TTS finishes
+    newSocket.on('translation_audio', (data) => {
+      if (data.request_id === latestRequest.current && data.audio_url) {
+        setAudioUrl(data.audio_url);
+      }
+    });
+
     newSocket.on('ai_message', (data) => {
       setChatMessages(prev => [...prev, {
         type: 'ai',
@@ -81,7 +90,7 @@ export default function Translator() {
   // Join room
   const joinRoom = () => {
     if (socket && username.trim()) {
-      socket.emit('join_room', { room, username });
+      socket.emit('join_room', { room, username, lang: targetLang });
       setIsJoined(true);
       setChatMessages(prev => [...prev, {
         type: 'system',
@@ -90,6 +99,13 @@ export default function Translator() {
     }
   };
 
+  // Receive chat messages in the currently selected target language
+  useEffect(() => {
+    if (socket && isJoined) {
+      socket.emit('set_language', { room, lang: targetLang });
+    }
+  }, [targetLang]);
+
   // Send chat message
   const sendMessage = () => {
     if (socket && chatInput.trim() && isJoined) {
@@ -130,6 +146,8 @@ export default function Translator() {
     setTranslatedText("");
     setRomanizedText("");
     setAudioUrl("");
+    const requestId = `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    latestRequest.current = requestId;
 
     try {
       const response = await fetch("http://localhost:5000/translate", {
@@ -144,9 +162,19 @@ export default function Translator() {
           tts: true, // Always request TTS - let backend decide
           speaker_gender: gender,
           voice_gender: voiceGender,
+          // With a live socket, show the text straight away and let the audio arrive later
+          progressive: Boolean(socket && socket.connected),
+          socket_id: socket && socket.connected ? socket.id : undefined,
+          request_id: requestId,
         }),
       });
 
+      // 429/503: the server is shedding load and says when to come back
+      if (response.status === 429 || response.status === 503) {
+        const retryAfter = response.headers.get("Retry-After") || "a few";
+        throw new Error(`Server is busy, please try again in ${retryAfter} seconds`);
+      }
+
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }